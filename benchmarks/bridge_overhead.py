@@ -0,0 +1,63 @@
+"""Server-side cost per message of the bridge event channel.
+
+Covers what runs in-process: decoding the websocket event payload and
+applying it in LiveKitRosterState. The browser side (``livekitBridge.send``
+versus the old hidden-input dispatch) is not measured here, so the numbers
+say nothing about how the two client paths compare.
+
+    poetry run python benchmarks/bridge_overhead.py [--messages N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+import reflex as rx
+
+from reflex_livekit_audio_chat.livekit_bridge import LiveKitRosterState
+
+
+def _bridge_state() -> LiveKitRosterState:
+    root = rx.State(_reflex_internal_init=True)
+    return root.get_substate(LiveKitRosterState.get_full_name().split(".")[1:])
+
+
+def _messages(count: int) -> list[dict]:
+    roster = [{"identity": f"user-{i}", "is_local": i == 0} for i in range(50)]
+    messages: list[dict] = [{"status": "Connected", "roster": roster, "speaking": []}]
+    for i in range(count - 1):
+        identity = f"user-{i % 50}"
+        messages.append(
+            {"patches": [{"op": "speaking", "identity": identity, "is_speaking": i % 2 == 0}]}
+        )
+    return messages
+
+
+async def _run(messages: list[dict]) -> tuple[float, int]:
+    state = _bridge_state()
+    wire_bytes = 0
+    started = time.perf_counter()
+    for data in messages:
+        wire = json.dumps({"payload": data})
+        wire_bytes += len(wire)
+        await LiveKitRosterState.handle_bridge_event.fn(state, json.loads(wire)["payload"])
+        state.parent_state._clean()
+    return time.perf_counter() - started, wire_bytes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20_000)
+    args = parser.parse_args()
+
+    messages = _messages(args.messages)
+    elapsed, wire_bytes = asyncio.run(_run(messages))
+    print(f"{'us/msg':>10}{'bytes/msg':>12}")
+    print(f"{elapsed / len(messages) * 1e6:>10.2f}{wire_bytes / len(messages):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
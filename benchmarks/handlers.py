@@ -0,0 +1,317 @@
+"""Headless benchmarks for the LiveKit bridge and SettingsState event handlers.
+
+Handlers run in-process against a throwaway working directory whose ``.env``
+holds fake LiveKit credentials, so tokens are really signed but no LiveKit
+server or browser is involved. For every case the suite reports:
+
+- per-call latency (median and p95),
+- peak bytes allocated during a call (tracemalloc, separate pass),
+- size of the serialized state delta the call would send to the browser.
+
+Iteration counts and inputs are fixed, so runs are comparable across
+commits. Save a run with ``--json`` and diff a later one with ``--compare``:
+
+    poetry run python benchmarks/handlers.py --json before.json
+    poetry run python benchmarks/handlers.py --compare before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+import reflex as rx
+
+from reflex_livekit_audio_chat.livekit_bridge import (
+    LiveKitConnectionState,
+    LiveKitRosterState,
+    LiveKitSessionState,
+)
+from reflex_livekit_audio_chat.states.settings_state import SettingsState
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ROSTER_SIZES = (10, 100, 1000)
+FAKE_ENV = (
+    "LIVEKIT_API_KEY=bench-key\n"
+    "LIVEKIT_API_SECRET=bench-secret-bench-secret-bench-secret\n"
+    "LIVEKIT_URL=ws://localhost:7880\n"
+    "ADMIN_PASSCODE=bench\n"
+)
+
+
+@dataclass
+class CaseResult:
+    name: str
+    calls: int
+    median_us: float
+    p95_us: float
+    peak_alloc_bytes: int
+    delta_bytes: float
+
+
+class Bridge(NamedTuple):
+    session: LiveKitSessionState
+    connection: LiveKitConnectionState
+    roster: LiveKitRosterState
+
+
+def _substate(root: rx.State, cls: type[rx.State]) -> Any:
+    return root.get_substate(cls.get_full_name().split(".")[1:])
+
+
+def _states() -> tuple[rx.State, Bridge, SettingsState]:
+    root = rx.State(_reflex_internal_init=True)
+    bridge = Bridge(
+        session=_substate(root, LiveKitSessionState),
+        connection=_substate(root, LiveKitConnectionState),
+        roster=_substate(root, LiveKitRosterState),
+    )
+    return root, bridge, _substate(root, SettingsState)
+
+
+async def _drive(result: Any) -> None:
+    """Run a handler's return value to completion, discarding emitted events."""
+    if inspect.isasyncgen(result):
+        async for _ in result:
+            pass
+    elif inspect.isgenerator(result):
+        for _ in result:
+            pass
+    elif inspect.isawaitable(result):
+        await result
+
+
+def _roster_message(size: int, churn: int = 0) -> dict:
+    roster = [{"identity": f"user-{i}", "is_local": i == 0} for i in range(size)]
+    speaking = [f"user-{(churn + i) % size}" for i in range(min(3, size))]
+    return {"status": "Connected", "roster": roster, "speaking": speaking}
+
+
+def _speaker_patch(size: int, i: int) -> dict:
+    # Alternately start and stop speaking, walking through the roster.
+    return {
+        "patches": [
+            {"op": "speaking", "identity": f"user-{i // 2 % size}", "is_speaking": i % 2 == 0}
+        ]
+    }
+
+
+async def _measure(
+    name: str,
+    calls: int,
+    setup: Callable[[Bridge, SettingsState], Any],
+    call: Callable[[Bridge, SettingsState, int], Any],
+) -> CaseResult:
+    root, bridge, settings = _states()
+    await _drive(setup(bridge, settings))
+    root._clean()
+
+    timings = []
+    delta_bytes = 0
+    for i in range(calls):
+        started = time.perf_counter()
+        await _drive(call(bridge, settings, i))
+        timings.append(time.perf_counter() - started)
+        delta_bytes += len(json.dumps(root.get_delta(), default=str))
+        root._clean()
+
+    # Allocation pass: tracemalloc distorts timings, so it runs separately.
+    peak = 0
+    tracemalloc.start()
+    for i in range(min(calls, 50)):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        await _drive(call(bridge, settings, calls + i))
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+        root._clean()
+    tracemalloc.stop()
+
+    timings.sort()
+    return CaseResult(
+        name=name,
+        calls=calls,
+        median_us=statistics.median(timings) * 1e6,
+        p95_us=timings[int(len(timings) * 0.95)] * 1e6,
+        peak_alloc_bytes=peak,
+        delta_bytes=delta_bytes / calls,
+    )
+
+
+def _noop(bridge: Bridge, settings: SettingsState) -> None:
+    pass
+
+
+async def run_suite(scale: int) -> list[CaseResult]:
+    results = [
+        # Unique identities: every join signs a fresh token.
+        await _measure(
+            "join_room (token mint)",
+            200 * scale,
+            _noop,
+            lambda bridge, _, i: LiveKitSessionState.join_room.fn(
+                bridge.session, {"username": f"bench-{i}", "room_name": "bench"}
+            ),
+        ),
+        # Same identity and room: served from the token cache.
+        await _measure(
+            "join_room (cached token)",
+            500 * scale,
+            _noop,
+            lambda bridge, _, i: LiveKitSessionState.join_room.fn(
+                bridge.session, {"username": "bench", "room_name": "bench"}
+            ),
+        ),
+        await _measure(
+            "toggle_mute",
+            2000 * scale,
+            _noop,
+            lambda bridge, _, i: LiveKitConnectionState.toggle_mute.fn(bridge.connection),
+        ),
+    ]
+
+    # Browsers send through window.livekitBridge, so messages arrive as dicts.
+    for size in ROSTER_SIZES:
+        results.append(
+            await _measure(
+                f"handle_bridge_event roster sync n={size}",
+                max(20, 20_000 // size) * scale,
+                _noop,
+                lambda bridge, _, i, size=size: LiveKitRosterState.handle_bridge_event.fn(
+                    bridge.roster, _roster_message(size, churn=i)
+                ),
+            )
+        )
+        results.append(
+            await _measure(
+                f"handle_bridge_event speaker patch n={size}",
+                2000 * scale,
+                lambda bridge, _, size=size: LiveKitRosterState.handle_bridge_event.fn(
+                    bridge.roster, _roster_message(size)
+                ),
+                lambda bridge, _, i, size=size: LiveKitRosterState.handle_bridge_event.fn(
+                    bridge.roster, _speaker_patch(size, i)
+                ),
+            )
+        )
+
+    # The legacy JSON-string entry point, for comparison: same messages plus json.loads.
+    results.append(
+        await _measure(
+            "handle_js_message speaker patch n=100",
+            2000 * scale,
+            lambda bridge, _: LiveKitRosterState.handle_bridge_event.fn(
+                bridge.roster, _roster_message(100)
+            ),
+            lambda bridge, _, i: LiveKitRosterState.handle_js_message.fn(
+                bridge.roster, json.dumps(_speaker_patch(100, i))
+            ),
+        )
+    )
+
+    def _admin(bridge: Bridge, settings: SettingsState) -> None:
+        settings.is_admin_authenticated = True
+
+    results.append(
+        await _measure(
+            "SettingsState.save_config",
+            100 * scale,
+            _admin,
+            lambda _, settings, i: SettingsState.save_config.fn(
+                settings,
+                {
+                    "livekit_api_key": "bench-key",
+                    "livekit_api_secret": f"bench-secret-{i % 2}",
+                    "livekit_url": "ws://localhost:7880",
+                },
+            ),
+        )
+    )
+    return results
+
+
+def _metadata() -> dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "reflex": rx.constants.Reflex.VERSION,
+        "machine": platform.machine(),
+    }
+
+
+def _print(results: list[CaseResult], baseline: dict[str, dict] | None) -> None:
+    header = f"{'case':<42}{'calls':>7}{'median us':>12}{'p95 us':>11}{'peak alloc':>12}{'delta B':>10}"
+    if baseline:
+        header += f"{'median vs base':>16}"
+    print(header)
+    for result in results:
+        line = (
+            f"{result.name:<42}{result.calls:>7}{result.median_us:>12.1f}"
+            f"{result.p95_us:>11.1f}{result.peak_alloc_bytes:>12}{result.delta_bytes:>10.0f}"
+        )
+        if baseline:
+            before = baseline.get(result.name)
+            if before:
+                change = result.median_us / before["median_us"] - 1
+                line += f"{change:>+15.1%} "
+            else:
+                line += f"{'new':>16}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1, help="multiply iteration counts")
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    parser.add_argument("--compare", type=Path, help="results file from an earlier run")
+    args = parser.parse_args()
+    json_path = args.json.resolve() if args.json else None
+    baseline = None
+    if args.compare:
+        previous = json.loads(args.compare.read_text())
+        baseline = {case["name"]: case for case in previous["results"]}
+        print(f"baseline: commit {previous['meta']['commit']}")
+
+    # Settings are saved to (and credentials read from) .env in the working directory.
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            Path(".env").write_text(FAKE_ENV)
+            results = asyncio.run(run_suite(args.scale))
+        finally:
+            os.chdir(cwd)
+
+    _print(results, baseline)
+    if json_path:
+        json_path.write_text(
+            json.dumps(
+                {"meta": _metadata(), "results": [asdict(r) for r in results]}, indent=2
+            )
+            + "\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
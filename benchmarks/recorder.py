@@ -0,0 +1,87 @@
+"""Recorder pipeline throughput and memory, fed by a synthetic frame source.
+
+Runs ``RecordingPipeline`` (mix -> ring buffer -> streaming WAV writer)
+over synthetic tracks as fast as possible, with the same tick size and
+flush cadence as a live ``RoomRecorder``, for two recording lengths. The
+peak traced memory should be the same for both: it is bounded by the ring
+buffer, not the meeting length. The written WAV is checked for length.
+
+    poetry run python benchmarks/recorder.py
+    poetry run python benchmarks/recorder.py --tracks 50 --minutes 1 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from reflex_livekit_audio_chat.services.recorder import (
+    DEFAULT_FLUSH_INTERVAL,
+    DEFAULT_TICK,
+    RecordingPipeline,
+)
+from reflex_livekit_audio_chat.services.room_audio import FRAME_MS, SAMPLE_RATE
+from reflex_livekit_audio_chat.services.speaker_detection import synthetic_frames
+
+# Synthetic audio is generated once and looped, so the source costs no memory over time.
+LOOP_SECONDS = 10
+
+
+async def record(pcm: np.ndarray, minutes: float, path: Path) -> tuple[float, int, int]:
+    """Return (cpu seconds, peak traced bytes, samples dropped)."""
+    frames_per_tick = max(1, round(DEFAULT_TICK * 1000 / FRAME_MS))
+    ticks = int(minutes * 60 / DEFAULT_TICK)
+    ticks_per_flush = max(1, round(DEFAULT_FLUSH_INTERVAL / DEFAULT_TICK))
+    loop_ticks = pcm.shape[1] // frames_per_tick
+
+    tracemalloc.start()
+    pipeline = RecordingPipeline(path)
+    started = time.process_time()
+    for tick in range(ticks):
+        start = (tick % loop_ticks) * frames_per_tick
+        pipeline.push(pcm[:, start : start + frames_per_tick])
+        if (tick + 1) % ticks_per_flush == 0:
+            await pipeline.flush()
+    await pipeline.flush()
+    await asyncio.to_thread(pipeline.writer.close)
+    cpu = time.process_time() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return cpu, peak, pipeline.ring.dropped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=20)
+    parser.add_argument(
+        "--minutes", type=float, nargs="+", default=[1.0, 5.0], help="recording lengths"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pcm, _ = synthetic_frames(
+        np.random.default_rng(args.seed), args.tracks, LOOP_SECONDS * 1000 // FRAME_MS
+    )
+    print(f"{args.tracks} synthetic tracks, {DEFAULT_TICK * 1000:.0f} ms ticks")
+    print(f"{'minutes':>8}{'cpu s':>9}{'x realtime':>12}{'peak traced':>14}{'wav s':>9}{'dropped':>9}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for minutes in args.minutes:
+            path = Path(workdir) / f"bench-{minutes}.wav"
+            cpu, peak, dropped = asyncio.run(record(pcm, minutes, path))
+            with wave.open(str(path), "rb") as wav:
+                seconds = wav.getnframes() / SAMPLE_RATE
+            print(
+                f"{minutes:>8.1f}{cpu:>9.2f}{minutes * 60 / cpu:>12.0f}"
+                f"{peak / 2**20:>12.2f} M{seconds:>9.1f}{dropped:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""Redis round-trips and bytes per bridge event, as a Redis-backed backend handles them.
+
+Each event goes through Reflex's ``StateManagerRedis`` the way a
+multi-worker deployment processes it. The manager takes the per-token
+lock and loads the handler's state, its parents and its substates. It
+runs the handler, then checks the lock and writes back every state it
+loaded. The redis connection is instrumented, so the numbers include
+locking as well as state traffic. Opportunistic locking is turned off;
+with it on, one worker caches the states and the traffic is not
+representative.
+
+Handlers are located by name, so the same script runs against older
+trees. ``--baseline REF`` checks REF out into a temporary git worktree,
+runs there first and prints both sides:
+
+    poetry run python benchmarks/state_sync.py --redis-url redis://localhost:6379
+    poetry run python benchmarks/state_sync.py --redis-url redis://localhost:6379 --baseline HEAD~1
+
+Point it at a scratch Redis: each run writes states under fresh tokens.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FAKE_ENV = (
+    "LIVEKIT_API_KEY=bench-key\n"
+    "LIVEKIT_API_SECRET=bench-secret-bench-secret-bench-secret\n"
+    "LIVEKIT_URL=ws://localhost:7880\n"
+)
+
+
+@dataclass
+class EventResult:
+    name: str
+    round_trips: float
+    bytes_sent: float
+    bytes_received: float
+    states_written: float
+    delta_bytes: float
+
+
+class RedisCounter:
+    """Counts commands sent (one per round-trip; a pipeline is one) and bytes on the wire."""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.state_writes = 0
+
+    def install(self) -> None:
+        from redis.asyncio.connection import AbstractConnection
+
+        counter = self
+        send = AbstractConnection.send_packed_command
+        read = AbstractConnection.read_response
+
+        async def send_packed_command(self, command, check_health=True):
+            chunks = [command] if isinstance(command, (bytes, str, memoryview)) else command
+            data = b"".join(bytes(c) if not isinstance(c, str) else c.encode() for c in chunks)
+            counter.round_trips += 1
+            counter.bytes_sent += len(data)
+            counter.state_writes += sum(
+                1 for name, key in _commands(data) if name == b"SET" and not key.endswith(b"_lock")
+            )
+            if os.environ.get("STATE_SYNC_TRACE"):
+                print([(name.decode(), key[-60:].decode()) for name, key in _commands(data)], len(data))
+            return await send(self, command, check_health)
+
+        async def read_response(self, *args, **kwargs):
+            response = await read(self, *args, **kwargs)
+            counter.bytes_received += _response_size(response)
+            return response
+
+        AbstractConnection.send_packed_command = send_packed_command
+        AbstractConnection.read_response = read_response
+
+    def snapshot(self) -> tuple[int, int, int, int]:
+        return self.round_trips, self.bytes_sent, self.bytes_received, self.state_writes
+
+
+def _commands(data: bytes) -> list[tuple[bytes, bytes]]:
+    """(COMMAND, first argument) for each RESP array in ``data``."""
+    commands = []
+    position = 0
+    while position < len(data) and data[position : position + 1] == b"*":
+        end = data.index(b"\r\n", position)
+        count = int(data[position + 1 : end])
+        position = end + 2
+        parts = []
+        for _ in range(count):
+            end = data.index(b"\r\n", position)
+            length = int(data[position + 1 : end])
+            parts.append(data[end + 2 : end + 2 + length])
+            position = end + 4 + length
+        commands.append((parts[0].upper(), parts[1] if len(parts) > 1 else b""))
+    return commands
+
+
+def _response_size(response: Any) -> int:
+    if isinstance(response, (bytes, bytearray)):
+        return len(response)
+    if isinstance(response, (list, tuple)):
+        return sum(_response_size(item) for item in response)
+    return 0
+
+
+def _handler_owners() -> dict[str, type]:
+    """Map bridge handler names to the state class that defines them, whatever the layout."""
+    import reflex as rx
+
+    from reflex_livekit_audio_chat import livekit_bridge
+
+    owners: dict[str, type] = {}
+    pending = list(rx.State.get_substates())
+    while pending:
+        cls = pending.pop()
+        if cls.__module__ == livekit_bridge.__name__:
+            for name in cls.event_handlers:
+                if name in vars(cls):
+                    owners[name] = cls
+        pending.extend(cls.get_substates())
+    return owners
+
+
+async def _drive(result: Any) -> None:
+    if inspect.isasyncgen(result):
+        async for _ in result:
+            pass
+    elif inspect.isgenerator(result):
+        for _ in result:
+            pass
+    elif inspect.isawaitable(result):
+        await result
+
+
+def _events(participants: int) -> list[tuple[str, str, dict]]:
+    """(name, handler, kwargs), in the order a call produces them."""
+    roster = [{"identity": f"user-{i}", "is_local": i == 0} for i in range(participants)]
+    status = lambda s: {"payload": {"status": s}}  # noqa: E731
+    events = [
+        ("join_room", "join_room", {"form_data": {"username": "user-0", "room_name": "bench"}}),
+        ("status Connected", "handle_bridge_event", status("Connected")),
+        (
+            f"roster sync n={participants}",
+            "handle_bridge_event",
+            {"payload": {"roster": roster, "speaking": []}},
+        ),
+    ]
+    for i in range(1, 4):
+        for on in (True, False):
+            events.append(
+                (
+                    "speaking patch",
+                    "handle_bridge_event",
+                    {"payload": {"patches": [{"op": "speaking", "identity": f"user-{i}", "is_speaking": on}]}},
+                )
+            )
+    events += [
+        ("viewport scroll", "handle_bridge_event", {"payload": {"viewport": {"start": 5, "rows": 20}}}),
+        ("telemetry upload", "handle_bridge_event", {"payload": {"telemetry": {"tracks": []}}}),
+        ("toggle_mute", "toggle_mute", {}),
+        ("status Reconnecting", "handle_bridge_event", status("Reconnecting")),
+    ]
+    return events
+
+
+async def run(redis_url: str, participants: int, sessions: int) -> list[EventResult]:
+    import reflex as rx
+    from redis.asyncio import Redis
+    from reflex.istate.data import RouterData
+    from reflex.state import _substate_key
+    from reflex.utils.prerequisites import get_and_validate_app
+
+    # Only importable once reflex.state is (circular import).
+    from reflex.istate.manager.redis import StateManagerRedis
+
+    counter = RedisCounter()
+    counter.install()
+    manager = StateManagerRedis(state=rx.State, redis=Redis.from_url(redis_url))
+    manager._oplock_enabled = False
+    # States fetched lazily from inside a handler go through the app's manager.
+    get_and_validate_app().app._state_manager = manager
+
+    owners = _handler_owners()
+    events = _events(participants)
+    totals: dict[str, list[float]] = {}
+    for _ in range(sessions):
+        token = str(uuid.uuid4())
+        async with manager.modify_state(_substate_key(token, rx.State)) as root:
+            root.router_data = {"token": token, "sid": "bench", "headers": {}, "pathname": "/"}
+            root.router = RouterData.from_router_data(root.router_data)
+        for name, handler, kwargs in events:
+            cls = owners[handler]
+            before = counter.snapshot()
+            async with manager.modify_state(_substate_key(token, cls)) as root:
+                state = root.get_substate(cls.get_full_name().split(".")[1:])
+                await _drive(getattr(cls, handler).fn(state, **kwargs))
+                delta = await root._get_resolved_delta()
+                root._clean()
+            after = counter.snapshot()
+            sums = totals.setdefault(name, [0, 0, 0, 0, 0, 0])
+            sums[0] += 1
+            for i in range(4):
+                sums[i + 1] += after[i] - before[i]
+            sums[5] += len(json.dumps(delta, default=str)) if delta else 0
+    await manager.close()
+
+    return [
+        EventResult(name, *(value / sums[0] for value in sums[1:]))
+        for name, sums in totals.items()
+    ]
+
+
+def _in_worktree(ref: str, argv: list[str]) -> list[dict]:
+    """Run this script against ``ref`` checked out into a temporary worktree."""
+    worktree = Path(tempfile.mkdtemp(prefix="state-sync-"))
+    subprocess.run(
+        ["git", "worktree", "add", "--detach", str(worktree), ref],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+    )
+    try:
+        out = worktree / "result.json"
+        subprocess.run(
+            [sys.executable, __file__, *argv, "--json", str(out), "--quiet", "--tree", str(worktree)],
+            check=True,
+            env={**os.environ, "PYTHONPATH": str(worktree)},
+        )
+        return json.loads(out.read_text())
+    finally:
+        subprocess.run(
+            ["git", "worktree", "remove", "--force", str(worktree)],
+            cwd=REPO_ROOT,
+            capture_output=True,
+        )
+        shutil.rmtree(worktree, ignore_errors=True)
+
+
+def _print(results: list[dict], baseline: list[dict] | None) -> None:
+    header = f"{'event':<22}{'round-trips':>12}{'sent B':>9}{'recv B':>9}{'states set':>11}{'delta B':>9}"
+    if baseline:
+        header += f"{'trips before':>14}{'bytes before':>14}"
+    print(header)
+    before = {r["name"]: r for r in baseline or []}
+    for r in results:
+        line = (
+            f"{r['name']:<22}{r['round_trips']:>12.1f}{r['bytes_sent']:>9.0f}"
+            f"{r['bytes_received']:>9.0f}{r['states_written']:>11.1f}{r['delta_bytes']:>9.0f}"
+        )
+        if baseline:
+            old = before.get(r["name"])
+            if old:
+                line += (
+                    f"{old['round_trips']:>14.1f}"
+                    f"{old['bytes_sent'] + old['bytes_received']:>14.0f}"
+                )
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--redis-url", default=os.environ.get("REDIS_URL", "redis://localhost:6379"))
+    parser.add_argument("--participants", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=20, help="fresh tokens to average over")
+    parser.add_argument("--baseline", metavar="REF", help="git ref to measure first, for comparison")
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    parser.add_argument("--quiet", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--tree", type=Path, default=REPO_ROOT, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        baseline = _in_worktree(
+            args.baseline,
+            [
+                "--redis-url", args.redis_url,
+                "--participants", str(args.participants),
+                "--sessions", str(args.sessions),
+            ],
+        )
+        print(f"baseline: {args.baseline}")
+
+    # Credentials are read from .env in the working directory, the app from its rxconfig.
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copy(args.tree / "rxconfig.py", workdir)
+        Path(workdir, ".env").write_text(FAKE_ENV)
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        sys.path.insert(0, str(args.tree))
+        try:
+            results = [asdict(r) for r in asyncio.run(run(args.redis_url, args.participants, args.sessions))]
+        finally:
+            os.chdir(cwd)
+
+    if not args.quiet:
+        _print(results, baseline)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
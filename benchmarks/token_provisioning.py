@@ -0,0 +1,142 @@
+"""Bulk token signing throughput and event-loop stalls, by signing strategy.
+
+Signs synthetic batches with ``sign_chunk`` (the code behind
+``/livekit/tokens``) four ways: inline on the event loop, on the default
+thread pool, and through ``TokenProvisioner`` with a process pool of one
+worker and of ``--workers`` workers. While each batch signs, a ticker
+coroutine measures the longest gap it sees on the loop; inline signing
+stalls the loop for the whole batch. Credentials are fake; no LiveKit
+server is involved.
+
+    poetry run python benchmarks/token_provisioning.py
+    poetry run python benchmarks/token_provisioning.py --batch 1000 10000 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable
+
+from reflex_livekit_audio_chat.services.config_service import LiveKitCredentials
+from reflex_livekit_audio_chat.services.token_provisioning import (
+    DEFAULT_CHUNK_SIZE,
+    TokenProvisioner,
+    TokenRequest,
+    sign_chunk,
+)
+
+CREDENTIALS = LiveKitCredentials(
+    api_key="bench-key",
+    api_secret="bench-secret-bench-secret-bench-secret",
+    url="ws://localhost:7880",
+)
+TICK = 0.005
+
+
+def _requests(count: int) -> list[TokenRequest]:
+    return [
+        TokenRequest(
+            identity=f"user-{i}",
+            room=f"room-{i % 40}",
+            grants=(("can_publish", i % 5 == 0),),
+        )
+        for i in range(count)
+    ]
+
+
+async def _timed(sign: Callable[[], Awaitable[int]]) -> tuple[float, float]:
+    """(seconds, longest event-loop gap in seconds) for one batch."""
+    done = asyncio.Event()
+    longest = 0.0
+
+    async def ticker() -> None:
+        nonlocal longest
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(TICK)
+            now = time.perf_counter()
+            longest = max(longest, now - last - TICK)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    signed = await sign()
+    elapsed = time.perf_counter() - started
+    done.set()
+    await task
+    assert signed, "nothing signed"
+    return elapsed, longest
+
+
+async def _inline(requests: list[TokenRequest]) -> int:
+    return len(sign_chunk(CREDENTIALS, requests))
+
+
+async def _threads(requests: list[TokenRequest], chunk_size: int) -> int:
+    loop = asyncio.get_running_loop()
+    chunks = [requests[i : i + chunk_size] for i in range(0, len(requests), chunk_size)]
+    results = await asyncio.gather(
+        *(loop.run_in_executor(None, sign_chunk, CREDENTIALS, chunk) for chunk in chunks)
+    )
+    return sum(len(tokens) for tokens in results)
+
+
+async def _provisioner(provisioner: TokenProvisioner, requests: list[TokenRequest]) -> int:
+    signed = 0
+    async for chunk in provisioner.sign(requests):
+        assert not chunk.error, chunk.error
+        signed += len(chunk.tokens)
+    return signed
+
+
+async def run(batches: list[int], workers: int, chunk_size: int, repeat: int) -> None:
+    provisioners = {
+        count: TokenProvisioner(CREDENTIALS, workers=count, chunk_size=chunk_size)
+        for count in sorted({1, workers})
+    }
+    strategies: list[tuple[str, Callable[[list[TokenRequest]], Awaitable[int]]]] = [
+        ("inline", _inline),
+        ("threads", lambda r: _threads(r, chunk_size)),
+        *(
+            (f"processes x{count}", lambda r, p=p: _provisioner(p, r))
+            for count, p in provisioners.items()
+        ),
+    ]
+    try:
+        # Start the workers (spawn + imports) outside the measurements.
+        for provisioner in provisioners.values():
+            await _provisioner(provisioner, _requests(chunk_size * 2 * workers))
+
+        print(f"chunk {chunk_size}, best of {repeat}, {os.cpu_count()} CPUs")
+        print(f"{'batch':>7}  {'strategy':<15}{'tokens/s':>10}{'batch ms':>10}{'max loop stall ms':>19}")
+        for count in batches:
+            requests = _requests(count)
+            for name, sign in strategies:
+                runs = [await _timed(lambda: sign(requests)) for _ in range(repeat)]
+                elapsed = min(seconds for seconds, _ in runs)
+                stall = min(gap for _, gap in runs)
+                print(
+                    f"{count:>7}  {name:<15}{count / elapsed:>10.0f}"
+                    f"{elapsed * 1000:>10.1f}{stall * 1000:>19.1f}"
+                )
+    finally:
+        for provisioner in provisioners.values():
+            provisioner.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--workers", type=int, default=min(os.cpu_count() or 1, 8))
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch, args.workers, args.chunk_size, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
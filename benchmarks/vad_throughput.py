@@ -0,0 +1,107 @@
+"""Throughput of the server-side speaker detector, in tracks per CPU core.
+
+Synthetic tracks (noise with talk spurts of voiced, syllable-modulated
+tones) are pre-generated, then fed to ``SpeakerDetector.process`` in
+blocks of one publish interval, as ``RoomSpeakerMonitor`` does. CPU time
+is measured with ``time.process_time``, so the result is the number of
+live 48 kHz tracks one core could keep up with. Agreement with the
+synthetic ground truth is printed as a sanity check on the decisions.
+
+    poetry run python benchmarks/vad_throughput.py
+    poetry run python benchmarks/vad_throughput.py --tracks 1000 --baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from reflex_livekit_audio_chat.services.speaker_detection import (
+    DEFAULT_INTERVAL,
+    FRAME_MS,
+    FRAME_SAMPLES,
+    SpeakerDetector,
+    VadConfig,
+    synthetic_frames,
+)
+
+TRACK_COUNTS = (8, 64, 512)
+
+
+def _run_vectorized(pcm: np.ndarray, frames_per_tick: int) -> tuple[float, list[float], np.ndarray]:
+    detector = SpeakerDetector(capacity=pcm.shape[0])
+    keys = [f"track-{i}" for i in range(pcm.shape[0])]
+    decisions = []
+    ticks = []
+    started = time.process_time()
+    for start in range(0, pcm.shape[1], frames_per_tick):
+        tick_started = time.perf_counter()
+        batch = detector.process(keys, pcm[:, start : start + frames_per_tick])
+        ticks.append(time.perf_counter() - tick_started)
+        decisions.append(batch.speaking)
+    return time.process_time() - started, ticks, np.stack(decisions, axis=1)
+
+
+def _run_per_sample(pcm: np.ndarray, config: VadConfig) -> float:
+    """The same RMS/peak/VAD with plain Python loops, for comparison."""
+    started = time.process_time()
+    for track in pcm.tolist():
+        floor, run, hang, speaking, peak = config.initial_floor_db, 0, 0, False, 0
+        for frame in track:
+            energy = 0.0
+            for sample in frame:
+                energy += sample * sample
+                peak = max(peak, abs(sample))
+            level = 10 * math.log10(max(energy / len(frame), 1e-10) / 32768.0**2)
+            floor = min(level, floor + config.floor_rise_db)
+            voiced = level > floor + config.margin_db and level > config.min_level_db
+            run = run + 1 if voiced else 0
+            hang = config.hangover_frames if voiced else max(hang - 1, 0)
+            speaking = (speaking or run >= config.attack_frames) and hang > 0
+    return time.process_time() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--tracks", type=int, action="append", help=f"track counts (default {TRACK_COUNTS})"
+    )
+    parser.add_argument("--seconds", type=float, default=10.0, help="audio per track")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="publish interval")
+    parser.add_argument(
+        "--baseline", action="store_true", help="also time a per-sample Python loop on 2 tracks"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    frames = int(args.seconds * 1000 / FRAME_MS)
+    frames_per_tick = max(1, round(args.interval * 1000 / FRAME_MS))
+    rng = np.random.default_rng(args.seed)
+    print(
+        f"{args.seconds:.0f}s of 48 kHz mono per track, {FRAME_SAMPLES}-sample frames, "
+        f"{frames_per_tick} frames per tick"
+    )
+    print(f"{'tracks':>8}{'cpu s':>9}{'tick p50 ms':>13}{'tick max ms':>13}{'tracks/core':>13}{'agree':>8}")
+    for tracks in args.tracks or TRACK_COUNTS:
+        pcm, talking = synthetic_frames(rng, tracks, frames)
+        cpu, ticks, decisions = _run_vectorized(pcm, frames_per_tick)
+        ticks.sort()
+        # Compare the decision published at each tick with the truth at that instant.
+        truth = talking[:, frames_per_tick - 1 :: frames_per_tick][:, : decisions.shape[1]]
+        agree = (truth == decisions[:, : truth.shape[1]]).mean()
+        print(
+            f"{tracks:>8}{cpu:>9.2f}{ticks[len(ticks) // 2] * 1e3:>13.2f}{ticks[-1] * 1e3:>13.2f}"
+            f"{tracks * args.seconds / cpu:>13.0f}{agree:>8.1%}"
+        )
+
+    if args.baseline:
+        pcm, _ = synthetic_frames(rng, 2, frames)
+        cpu = _run_per_sample(pcm, VadConfig())
+        print(f"\nper-sample Python loop: {2 * args.seconds / cpu:.1f} tracks/core")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Load generator for a running app's Reflex event websocket.
+
+Simulates N browser tabs spread over R rooms. Each session hydrates, joins
+its room through ``join_room``, syncs a roster and then replays the status
+traffic the LiveKit client sends through the bridge: speaker churn plus
+remote participants joining and leaving. Like the Reflex frontend, a session
+waits for an event to finish before sending its next one.
+
+Reports p50/p95/p99 latency and throughput per event type and, when
+``--backend-pid`` is given, backend RSS per session (Linux only).
+
+Run the backend locally with any LiveKit credentials (tokens are signed
+locally; no LiveKit server is contacted), then point the generator at it:
+
+    LIVEKIT_API_KEY=k LIVEKIT_API_SECRET=secret LIVEKIT_URL=ws://localhost:7880 \\
+        poetry run reflex run --backend-only
+    poetry run python benchmarks/ws_load.py --sessions 200 --rooms 10 --backend-pid <worker pid>
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import reflex as rx
+import socketio
+
+from reflex_livekit_audio_chat.livekit_bridge import (
+    LiveKitRosterState,
+    LiveKitSessionState,
+)
+
+EVENT_NAMESPACE = "/_event"
+RESPONSE_TIMEOUT = 10.0
+
+HYDRATE = f"{rx.State.get_full_name()}.hydrate"
+JOIN_ROOM = f"{LiveKitSessionState.get_full_name()}.join_room"
+BRIDGE_EVENT = f"{LiveKitRosterState.get_full_name()}.handle_bridge_event"
+LEGACY_MESSAGE = f"{LiveKitRosterState.get_full_name()}.handle_js_message"
+
+
+def _rss_bytes(pid: int) -> int:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) * 1024
+    raise ValueError(f"No VmRSS for pid {pid}")
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.timeouts: dict[str, int] = defaultdict(int)
+        self.errors = 0
+
+
+class Session:
+    """One simulated browser tab with its own client token and socket."""
+
+    def __init__(self, args: argparse.Namespace, index: int, stats: Stats):
+        self._args = args
+        self._stats = stats
+        self._rng = random.Random(args.seed + index)
+        self._token = str(uuid.uuid4())
+        self._identity = f"load-{index}"
+        self._room = f"load-room-{index % args.rooms}"
+        self._pending: asyncio.Future | None = None
+        self._remote = [f"{self._room}-peer-{i}" for i in range(args.participants)]
+        self._next_peer = args.participants
+        self._speaking: set[str] = set()
+        self._sio = socketio.AsyncClient(reconnection=False)
+        self._sio.on("event", self._on_update, namespace=EVENT_NAMESPACE)
+
+    async def _on_update(self, update: dict) -> None:
+        if update.get("final") and self._pending is not None and not self._pending.done():
+            self._pending.set_result(None)
+
+    async def _send(self, kind: str, name: str, payload: dict) -> None:
+        self._pending = asyncio.get_running_loop().create_future()
+        started = time.perf_counter()
+        await self._sio.emit(
+            "event",
+            {
+                "token": self._token,
+                "name": name,
+                "router_data": {"pathname": "/", "query": {}, "asPath": "/"},
+                "payload": payload,
+            },
+            namespace=EVENT_NAMESPACE,
+        )
+        try:
+            await asyncio.wait_for(self._pending, RESPONSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._stats.timeouts[kind] += 1
+            return
+        self._stats.latencies[kind].append(time.perf_counter() - started)
+
+    async def _bridge(self, kind: str, data: dict) -> None:
+        if self._args.legacy:
+            await self._send(kind, LEGACY_MESSAGE, {"json_data": json.dumps(data)})
+        else:
+            await self._send(kind, BRIDGE_EVENT, {"payload": data})
+
+    async def start(self) -> None:
+        await self._sio.connect(
+            f"{self._args.url}?token={self._token}",
+            socketio_path=EVENT_NAMESPACE,
+            transports=["websocket"],
+            namespaces=[EVENT_NAMESPACE],
+        )
+        await self._send("hydrate", HYDRATE, {})
+        await self._send(
+            "join_room",
+            JOIN_ROOM,
+            {"form_data": {"username": self._identity, "room_name": self._room}},
+        )
+        roster = [{"identity": self._identity, "is_local": True}] + [
+            {"identity": identity, "is_local": False} for identity in self._remote
+        ]
+        await self._bridge("roster sync", {"status": "Connected", "roster": roster, "speaking": []})
+        await self._bridge("viewport", {"viewport": {"start": 0, "rows": 30}})
+
+    async def run(self, deadline: float) -> None:
+        while self._sio.connected and time.monotonic() < deadline:
+            await asyncio.sleep(self._rng.expovariate(self._args.rate))
+            roll = self._rng.random()
+            if roll < self._args.churn and self._remote:
+                await self._bridge("participant patch", self._membership_patch())
+            else:
+                await self._bridge("speaker patch", self._speaker_patch())
+
+    def _speaker_patch(self) -> dict:
+        patches = []
+        # Keep a handful of active speakers, as in a real meeting.
+        if self._speaking and (len(self._speaking) >= 3 or self._rng.random() < 0.5):
+            identity = self._rng.choice(sorted(self._speaking))
+            self._speaking.discard(identity)
+            patches.append({"op": "speaking", "identity": identity, "is_speaking": False})
+        candidates = [self._identity, *self._remote]
+        identity = self._rng.choice(candidates)
+        if identity not in self._speaking:
+            self._speaking.add(identity)
+            patches.append({"op": "speaking", "identity": identity, "is_speaking": True})
+        return {"patches": patches}
+
+    def _membership_patch(self) -> dict:
+        if self._rng.random() < 0.5:
+            identity = self._remote.pop(self._rng.randrange(len(self._remote)))
+            self._speaking.discard(identity)
+            return {"patches": [{"op": "leave", "identity": identity}]}
+        identity = f"{self._room}-peer-{self._next_peer}"
+        self._next_peer += 1
+        self._remote.append(identity)
+        return {"patches": [{"op": "join", "identity": identity, "is_local": False}]}
+
+    async def close(self) -> None:
+        await self._sio.disconnect()
+
+
+async def run(args: argparse.Namespace) -> None:
+    stats = Stats()
+    rss_before = _rss_bytes(args.backend_pid) if args.backend_pid else None
+
+    sessions = [Session(args, index, stats) for index in range(args.sessions)]
+    ramp_delay = args.ramp / max(1, len(sessions))
+
+    async def _start(index: int, session: Session) -> None:
+        await asyncio.sleep(index * ramp_delay)
+        try:
+            await session.start()
+        except Exception as e:
+            stats.errors += 1
+            print(f"session {index} failed to start: {e}")
+
+    await asyncio.gather(*(_start(i, s) for i, s in enumerate(sessions)))
+    rss_joined = _rss_bytes(args.backend_pid) if args.backend_pid else None
+
+    started = time.monotonic()
+    await asyncio.gather(*(s.run(started + args.duration) for s in sessions))
+    elapsed = time.monotonic() - started
+    rss_end = _rss_bytes(args.backend_pid) if args.backend_pid else None
+    await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
+
+    print(
+        f"{args.sessions} sessions in {args.rooms} rooms, "
+        f"{args.participants} remote participants each, {elapsed:.1f}s"
+    )
+    print(f"{'event':<20}{'count':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'timeouts':>10}")
+    for kind, latencies in stats.latencies.items():
+        latencies.sort()
+        print(
+            f"{kind:<20}{len(latencies):>8}"
+            f"{_percentile(latencies, 0.50) * 1e3:>9.1f}"
+            f"{_percentile(latencies, 0.95) * 1e3:>9.1f}"
+            f"{_percentile(latencies, 0.99) * 1e3:>9.1f}"
+            f"{stats.timeouts[kind]:>10}"
+        )
+    steady = sum(
+        len(stats.latencies[kind]) for kind in ("speaker patch", "participant patch")
+    )
+    print(f"\nbridge throughput: {steady / elapsed:.1f} events/s")
+    if stats.errors:
+        print(f"sessions failed to start: {stats.errors}")
+    if rss_before is not None:
+        per_session = (rss_joined - rss_before) / max(1, args.sessions)
+        print(
+            f"backend RSS: {rss_before / 2**20:.1f} MiB idle, "
+            f"{rss_joined / 2**20:.1f} MiB joined, {rss_end / 2**20:.1f} MiB at end "
+            f"({per_session / 1024:.1f} KiB/session)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000", help="backend URL")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--rooms", type=int, default=5)
+    parser.add_argument(
+        "--participants", type=int, default=50, help="remote participants per roster"
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of traffic")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds to connect all")
+    parser.add_argument("--rate", type=float, default=4.0, help="bridge events/s per session")
+    parser.add_argument(
+        "--churn", type=float, default=0.1, help="fraction of events that are joins/leaves"
+    )
+    parser.add_argument("--legacy", action="store_true", help="use handle_js_message")
+    parser.add_argument("--backend-pid", type=int, help="sample this process's RSS")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
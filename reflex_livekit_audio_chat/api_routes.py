@@ -0,0 +1,189 @@
+"""HTTP endpoints served by the Reflex backend (mounted via ``api_transformer``)."""
+
+from __future__ import annotations
+
+import hmac
+import json
+import logging
+import time
+from typing import AsyncIterator
+
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from reflex_livekit_audio_chat.livekit_bridge import broadcast_roster_patches
+from reflex_livekit_audio_chat.services import metrics
+from reflex_livekit_audio_chat.services.audio_profiles import audio_profile_registry
+from reflex_livekit_audio_chat.services.audio_subscriptions import last_n_registry
+from reflex_livekit_audio_chat.services.avatars import avatar_cache
+from reflex_livekit_audio_chat.services.config_service import config_service
+from reflex_livekit_audio_chat.services.recordings import recorder_registry
+from reflex_livekit_audio_chat.services.room_roster import room_roster
+from reflex_livekit_audio_chat.services.stage import stage_registry
+from reflex_livekit_audio_chat.services.token_provisioning import (
+    MAX_BATCH,
+    TokenRequest,
+    parse_entry,
+    token_provisioner,
+)
+
+
+async def livekit_webhook(request: Request) -> Response:
+    """Verify a LiveKit webhook and fold it into the server-side roster."""
+    from livekit import api
+
+    body = (await request.body()).decode()
+    credentials = config_service.snapshot.livekit
+    receiver = api.WebhookReceiver(
+        api.TokenVerifier(credentials.api_key, credentials.api_secret)
+    )
+    try:
+        event = receiver.receive(body, request.headers.get("Authorization", ""))
+    except Exception as e:
+        logging.warning(f"Rejected LiveKit webhook: {e}")
+        return Response(status_code=401)
+
+    patches = room_roster.apply_event(event)
+    if event.event == "room_finished":
+        # The room's settings don't carry over to a later room of the same name.
+        stage_registry.close(event.room.name)
+        last_n_registry.close(event.room.name)
+        audio_profile_registry.close(event.room.name)
+    # Acknowledge right away; fan-out to sessions happens after the response.
+    return Response(
+        status_code=200,
+        background=BackgroundTask(broadcast_roster_patches, event.room.name, patches),
+    )
+
+
+def _none_match(header: str, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches ``etag``, using weak comparison (RFC 9110)."""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+async def avatar(request: Request) -> Response:
+    """Serve a generated avatar; content never changes for an identity, so cache forever."""
+    svg, etag = avatar_cache.get(request.path_params["identity"])
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=31536000, immutable"}
+    if _none_match(request.headers.get("If-None-Match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(svg, media_type="image/svg+xml", headers=headers)
+
+
+async def prometheus_metrics(request: Request) -> Response:
+    """Expose this worker's counters and histograms for Prometheus to scrape."""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+def _is_admin(request: Request) -> bool:
+    """``Authorization: Bearer <ADMIN_PASSCODE>``; always false while no passcode is set."""
+    expected = config_service.snapshot.admin_passcode
+    provided = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+    return bool(expected) and hmac.compare_digest(provided.encode(), expected.encode())
+
+
+async def provision_tokens(request: Request) -> Response:
+    """Sign access tokens for a batch of (identity, room, grants, ttl) entries.
+
+    The response streams one JSON line per entry, tagged with its index
+    in the batch. Rejected entries come first, then tokens in batch order
+    as their chunks finish signing; entries of a chunk that could not be
+    signed get an error line instead.
+    """
+    if not _is_admin(request):
+        return Response(status_code=401)
+    if not config_service.snapshot.livekit.is_complete:
+        return JSONResponse({"error": "LiveKit credentials not configured"}, status_code=503)
+    try:
+        body = await request.json()
+    except ValueError:
+        return JSONResponse({"error": "body must be JSON"}, status_code=400)
+    entries = body.get("entries") if isinstance(body, dict) else body
+    if not isinstance(entries, list):
+        return JSONResponse({"error": "expected a list of entries"}, status_code=400)
+    if len(entries) > MAX_BATCH:
+        return JSONResponse({"error": f"at most {MAX_BATCH} entries per batch"}, status_code=413)
+
+    indexes: list[int] = []
+    valid: list[TokenRequest] = []
+    errors: list[dict] = []
+    for index, entry in enumerate(entries):
+        try:
+            valid.append(parse_entry(entry))
+            indexes.append(index)
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+    metrics.bulk_tokens.labels("invalid").inc(len(errors))
+    return StreamingResponse(
+        _token_lines(indexes, valid, errors), media_type="application/x-ndjson"
+    )
+
+
+async def _token_lines(
+    indexes: list[int], requests: list[TokenRequest], errors: list[dict]
+) -> AsyncIterator[str]:
+    with metrics.bulk_token_batch_duration.time():
+        for error in errors:
+            yield json.dumps(error) + "\n"
+        position = 0
+        async for chunk in token_provisioner.sign(requests):
+            now = time.time()
+            lines = []
+            if chunk.error:
+                for _ in chunk.requests:
+                    lines.append(json.dumps({"index": indexes[position], "error": chunk.error}))
+                    position += 1
+                metrics.bulk_tokens.labels("failed").inc(len(chunk.requests))
+                yield "\n".join(lines) + "\n"
+                continue
+            for token in chunk.tokens:
+                r = requests[position]
+                lines.append(
+                    json.dumps(
+                        {
+                            "index": indexes[position],
+                            "identity": r.identity,
+                            "room": r.room,
+                            "token": token,
+                            "expires_at": int(now + r.ttl.total_seconds()),
+                        }
+                    )
+                )
+                position += 1
+            metrics.bulk_tokens.labels("signed").inc(len(chunk.tokens))
+            yield "\n".join(lines) + "\n"
+
+
+async def list_recordings(request: Request) -> Response:
+    """Recordings made on this worker: name, size, length and whether still recording."""
+    if not _is_admin(request):
+        return Response(status_code=401)
+    return JSONResponse(recorder_registry.files())
+
+
+async def recording_file(request: Request) -> Response:
+    """Download one recording; an in-progress file is valid up to its last flush."""
+    if not _is_admin(request):
+        return Response(status_code=401)
+    path = recorder_registry.file(request.path_params["name"])
+    if path is None:
+        return Response(status_code=404)
+    return FileResponse(path, media_type="audio/wav", filename=path.name)
+
+
+backend_api = Starlette(
+    routes=[
+        Route("/livekit/webhook", livekit_webhook, methods=["POST"]),
+        Route("/avatars/{identity:path}.svg", avatar, methods=["GET"]),
+        Route("/metrics", prometheus_metrics, methods=["GET"]),
+        Route("/livekit/tokens", provision_tokens, methods=["POST"]),
+        Route("/livekit/recordings", list_recordings, methods=["GET"]),
+        Route("/livekit/recordings/{name}", recording_file, methods=["GET"]),
+    ],
+)
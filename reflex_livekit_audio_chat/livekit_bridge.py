@@ -1,199 +1,1094 @@
 from __future__ import annotations
 
+import asyncio
+import datetime
+import itertools
 import json
 import logging
-import os
+import time
 from typing import Type
 
 import reflex as rx
-from livekit import api
+from reflex.constants.compiler import Hooks
+from reflex.event import EventChain, passthrough_event_spec
+from reflex.state import _substate_key
+from reflex.utils.format import format_prop, wrap
+from reflex.utils.imports import ImportVar
+from reflex.utils.prerequisites import get_app
+from reflex.vars.base import Var, VarData
 
+from reflex_livekit_audio_chat.services import metrics
+from reflex_livekit_audio_chat.services.audio_profiles import audio_profile_registry
+from reflex_livekit_audio_chat.services.audio_subscriptions import (
+    DEFAULT_LAST_N,
+    last_n_registry,
+    parse_last_n,
+)
+from reflex_livekit_audio_chat.services.config_service import config_service
+from reflex_livekit_audio_chat.services.recordings import recorder_registry
+from reflex_livekit_audio_chat.services.room_roster import room_roster
+from reflex_livekit_audio_chat.services.stage import (
+    DEFAULT_ROOM_MODE,
+    stage_registry,
+    update_publish_permission,
+)
+from reflex_livekit_audio_chat.services.telemetry import telemetry_store
+from reflex_livekit_audio_chat.services.token_service import token_service, verify_token
+from reflex_livekit_audio_chat.static_assets import LIVEKIT_CLIENT
 
-class LiveKitBridgeState(rx.State):
-    """State that bridges Reflex <-> LiveKit JS client running in the browser."""
+
+# Each participant row (card + margin) is this tall, so the client can map scroll offsets to rows.
+ROSTER_ROW_HEIGHT_PX = 84
+DEFAULT_VIEWPORT_ROWS = 30
+MAX_VIEWPORT_ROWS = 200
+
+# Opus publish settings per profile. Ordered best to leanest: the client steps down
+# this list when the network degrades and back up (never above the chosen one).
+AUDIO_PROFILES: dict[str, dict] = {
+    "music": {
+        "label": "Music (stereo, 96 kbps)",
+        "maxBitrate": 96_000,
+        "dtx": False,
+        "red": True,
+        "stereo": True,
+        "capture": {
+            "channelCount": 2,
+            "echoCancellation": False,
+            "noiseSuppression": False,
+            "autoGainControl": False,
+        },
+    },
+    "speech": {
+        "label": "Speech (24 kbps)",
+        "maxBitrate": 24_000,
+        "dtx": True,
+        "red": True,
+        "stereo": False,
+        "capture": {"echoCancellation": True, "noiseSuppression": True, "autoGainControl": True},
+    },
+    "low_bandwidth": {
+        "label": "Low bandwidth (12 kbps)",
+        "maxBitrate": 12_000,
+        "dtx": True,
+        "red": False,
+        "stereo": False,
+        "capture": {"echoCancellation": True, "noiseSuppression": True, "autoGainControl": True},
+    },
+}
+DEFAULT_AUDIO_PROFILE = "speech"
+
+# A saved call is resumed with its own token only while the token has this much lifetime left.
+RESUME_MIN_REMAINING = datetime.timedelta(minutes=5)
+# Client-side latencies reported through the bridge as {"timing": {name: milliseconds}}.
+_TIMINGS = {
+    "reconnected_ms": metrics.time_to_reconnected,
+    "first_audio_ms": metrics.time_to_first_audio,
+    "signaling_ms": metrics.connect_phase.labels("signaling"),
+    "microphone_ms": metrics.connect_phase.labels("microphone"),
+}
+
+
+def _forget_session(room: str, client_token: str) -> None:
+    room_roster.unregister(room, client_token)
+    # A stage, the room's Last-N and audio profile settings and any recording end
+    # with its last session on this backend.
+    if room and not room_roster.sessions(room):
+        stage_registry.close(room)
+        last_n_registry.close(room)
+        audio_profile_registry.close(room)
+        recorder_registry.stop(room)
+
+
+def _lobby_can_publish(room: str, username: str) -> bool | None:
+    """Whether joining ``room`` as ``username`` would publish; None until both are filled in."""
+    if not room or not username:
+        return None
+    # A room without a stage is open, or will be opened by this user as host.
+    stage = stage_registry.get(room)
+    return stage is None or stage.can_publish(username)
+
+
+def _observe_timings(timing: dict) -> None:
+    for name, value in timing.items():
+        histogram = _TIMINGS.get(name)
+        if histogram is not None and isinstance(value, (int, float)) and 0 <= value < 600_000:
+            histogram.observe(value / 1000)
+
+
+_channel_messages = metrics.bridge_messages.labels("channel")
+_channel_bytes = metrics.bridge_payload_bytes.labels("channel")
+_channel_handling = metrics.bridge_handle_duration.labels("channel")
+_legacy_messages = metrics.bridge_messages.labels("legacy")
+_legacy_bytes = metrics.bridge_payload_bytes.labels("legacy")
+_legacy_handling = metrics.bridge_handle_duration.labels("legacy")
+
+
+# The bridge state is split by how often each part changes. Reflex loads and
+# saves a state together with its parents (and its substates), checking the
+# lock once per state, so these are siblings directly under rx.State: the
+# frequent roster and speaking messages load and persist just the root and
+# LiveKitRosterState.
+
+
+class LiveKitSessionState(rx.State):
+    """Who is in which room, join settings and room controls; changes on user actions."""
 
     room_name: str = ""
     username: str = ""
     token: str = ""
-    connection_status: str = "Disconnected"
-    participants: list[dict[str, str | bool]] = []
-    is_connected: bool = False
-    is_muted: bool = False
+    # The room's profile, applied at join time; the published one is
+    # LiveKitConnectionState.active_audio_profile.
+    audio_profile: str = DEFAULT_AUDIO_PROFILE
+    # Stage mode: only the host and promoted speakers get publish grants.
+    room_mode: str = DEFAULT_ROOM_MODE
+    is_host: bool = False
+    stage_speakers: list[str] = []
+    # Remote audio is only decoded for this many recent speakers (0 = everyone).
+    last_n: int = DEFAULT_LAST_N
+    # Server-side recording of the room; shown to everyone in it.
+    is_recording: bool = False
+    recording_file: str = ""
     error_message: str = ""
     loading: bool = False
+    # The current call (room, identity, token), kept in this tab so a reload can resume it.
+    # Session storage, not local: another tab resuming the same identity would evict this one.
+    resume_context: str = rx.SessionStorage("", name="livekit_resume")
 
     @rx.event
     async def join_room(self, form_data: dict):
+        started = time.perf_counter()
         self.loading = True
         self.error_message = ""
         yield
         try:
             username = form_data.get("username", "").strip()
             room_name = form_data.get("room_name", "").strip()
+            audio_profile = form_data.get("audio_profile") or DEFAULT_AUDIO_PROFILE
+            room_mode = form_data.get("room_mode") or DEFAULT_ROOM_MODE
             if not username or not room_name:
                 self.error_message = "Username and Room Name are required."
                 self.loading = False
+                metrics.join_failures.labels("missing_fields").inc()
                 return
 
-            api_key = os.environ.get("LIVEKIT_API_KEY")
-            api_secret = os.environ.get("LIVEKIT_API_SECRET")
-            livekit_url = os.environ.get("LIVEKIT_URL")
-            if not api_key or not api_secret or (not livekit_url):
+            credentials = config_service.snapshot.livekit
+            if not credentials.is_complete:
                 self.error_message = (
                     "LiveKit credentials not configured. Please check settings."
                 )
                 self.loading = False
+                metrics.join_failures.labels("not_configured").inc()
                 return
 
-            grant = api.VideoGrants(room_join=True, room=room_name)
-            access_token = (
-                api.AccessToken(api_key, api_secret)
-                .with_identity(username)
-                .with_name(username)
-                .with_grants(grant)
-                .to_jwt()
+            connect = await self._enter_room(
+                credentials.url,
+                username,
+                room_name,
+                audio_profile,
+                room_mode,
+                parse_last_n(form_data.get("last_n")),
             )
-
-            self.token = access_token
-            self.room_name = room_name
-            self.username = username
-            self.is_connected = True
-            self.connection_status = "Connecting..."
-            self.is_muted = False
-
-            # Escape username for JS.
-            safe_username = self.username.replace("\\", "\\\\").replace("'", "\\'")
-
             self.loading = False
-            yield rx.call_script(
-                f"window.livekitClient.connect('{livekit_url}', '{self.token}', '{safe_username}')"
-            )
+            metrics.join_duration.observe(time.perf_counter() - started)
+            yield connect
         except Exception as e:
             logging.exception(f"Error generating token: {e}")
             self.error_message = f"Failed to join room: {str(e)}"
-            self.is_connected = False
+            (await self.get_state(LiveKitConnectionState)).is_connected = False
             self.loading = False
+            metrics.join_failures.labels("token_error").inc()
 
     @rx.event
-    def leave_room(self):
+    async def resume_session(self):
+        """Rejoin the call saved in this tab after a reload, without the lobby.
+
+        The saved token is reused, with no mint, while it verifies against the
+        current credentials and has RESUME_MIN_REMAINING left. Room and
+        identity come from the verified token, not from what was saved.
+        Otherwise the lobby is prefilled with the saved room and name. A
+        duplicated tab inherits the record, but while the tab that saved it
+        is still in the room the lobby asks before joining, since LiveKit
+        disconnects the older participant with the same identity. Runs on
+        every load of the index page; if the call is still live in this tab
+        the client only re-reports it.
+        """
+        if not self.resume_context:
+            return
+        try:
+            saved = json.loads(self.resume_context)
+            self.room_name = str(saved.get("room_name", ""))
+            self.username = str(saved.get("username", ""))
+            credentials = config_service.snapshot.livekit
+            claims, expires_at = verify_token(credentials, str(saved.get("token", "")))
+            if expires_at - time.time() < RESUME_MIN_REMAINING.total_seconds():
+                raise ValueError("saved token expires too soon")
+        except Exception as e:
+            logging.info(f"Not resuming saved call: {e}")
+            self.resume_context = ""
+            metrics.session_resumes.labels("stale").inc()
+            return
+
+        owner = str(saved.get("tab", ""))
+        client_token = self.router.session.client_token
+        if owner != client_token and owner in room_roster.sessions(claims.video.room):
+            self.resume_context = ""
+            self.error_message = (
+                "This call is open in another tab. Join again to move it to this tab."
+            )
+            metrics.session_resumes.labels("in_use").inc()
+            return
+
+        try:
+            yield await self._enter_room(
+                credentials.url,
+                claims.identity,
+                claims.video.room,
+                saved.get("audio_profile") or DEFAULT_AUDIO_PROFILE,
+                saved.get("room_mode") or DEFAULT_ROOM_MODE,
+                parse_last_n(saved.get("last_n")),
+                saved_token=saved["token"],
+                saved_can_publish=claims.video.can_publish,
+                resume=True,
+            )
+            metrics.session_resumes.labels(
+                "resumed" if self.token == saved["token"] else "reminted"
+            ).inc()
+        except Exception as e:
+            logging.exception(f"Error resuming saved call: {e}")
+            self.error_message = f"Failed to rejoin room: {str(e)}"
+            (await self.get_state(LiveKitConnectionState)).is_connected = False
+            metrics.session_resumes.labels("failed").inc()
+
+    async def _enter_room(
+        self,
+        livekit_url: str,
+        username: str,
+        room_name: str,
+        audio_profile: str,
+        room_mode: str,
+        last_n_choice: int,
+        *,
+        saved_token: str | None = None,
+        saved_can_publish: bool = False,
+        resume: bool = False,
+    ) -> rx.event.EventSpec:
+        """Register this session in the room and return the client connect call.
+
+        ``saved_token`` is used instead of minting when its publish right
+        still matches the room's current grant for ``username``.
+        """
+        if audio_profile not in AUDIO_PROFILES:
+            audio_profile = DEFAULT_AUDIO_PROFILE
+        connection = await self.get_state(LiveKitConnectionState)
+        roster = await self.get_state(LiveKitRosterState)
+
+        client_token = self.router.session.client_token
+        if self.room_name and self.room_name != room_name:
+            _forget_session(self.room_name, client_token)
+        # Mode, Last-N and audio profile are picked by whoever opens the room;
+        # later joiners inherit them.
+        opening = not room_roster.sessions(room_name)
+        stage = stage_registry.get(room_name)
+        if stage is None and room_mode == "stage" and opening:
+            stage = stage_registry.open(room_name, host=username)
+        if opening:
+            last_n_registry.open(room_name, last_n_choice)
+            audio_profile_registry.open(room_name, audio_profile)
+        last_n = last_n_registry.get(room_name)
+        audio_profile = audio_profile_registry.get(room_name) or audio_profile
+
+        grant = stage_registry.grants(room_name, username)
+        if saved_token and saved_can_publish == grant.can_publish:
+            access_token = saved_token
+        else:
+            access_token = await token_service.get_token(username, room_name, grant)
+        room_roster.register(room_name, client_token)
+
+        self.token = access_token
+        self.room_name = room_name
+        self.username = username
+        roster._room_name = room_name
+        roster._username = username
+        if room_roster.tracks(room_name):
+            # Show who is already in the room before the client's first sync.
+            roster._reset_roster([{"identity": username, "is_local": True}], [])
+        self.audio_profile = audio_profile
+        self.room_mode = "stage" if stage else "open"
+        self.is_host = bool(stage) and stage.host == username
+        self.stage_speakers = sorted(stage.speakers) if stage else []
+        self.last_n = last_n
+        recording = recorder_registry.get(room_name)
+        self.is_recording = recording is not None
+        self.recording_file = recording.path.name if recording else ""
+        self.resume_context = json.dumps(
+            {
+                "room_name": room_name,
+                "username": username,
+                "token": access_token,
+                "audio_profile": audio_profile,
+                "room_mode": self.room_mode,
+                "last_n": last_n,
+                "tab": client_token,
+            }
+        )
+        connection.is_connected = True
+        connection.connection_status = "Connecting..."
+        connection.active_audio_profile = audio_profile
+        connection.can_publish = grant.can_publish
+        connection.is_muted = not grant.can_publish
+
+        # Escape username for JS.
+        safe_username = username.replace("\\", "\\\\").replace("'", "\\'")
+        method = "resume" if resume else "connect"
+        return rx.call_script(
+            f"window.livekitClient.{method}('{livekit_url}', '{access_token}', '{safe_username}', "
+            f"'{audio_profile}', {str(grant.can_publish).lower()}, {last_n})"
+        )
+
+    @rx.event
+    async def leave_room(self):
+        metrics.leave_room_calls.inc()
         yield rx.call_script("window.livekitClient.disconnect()")
-        self.is_connected = False
+        _forget_session(self.room_name, self.router.session.client_token)
+        connection = await self.get_state(LiveKitConnectionState)
+        roster = await self.get_state(LiveKitRosterState)
+        connection.is_connected = False
         self.room_name = ""
         self.token = ""
-        self.participants = []
-        self.connection_status = "Disconnected"
-        self.is_muted = False
+        self.resume_context = ""
+        roster._room_name = ""
+        roster._reset_roster([], [])
+        connection.connection_status = "Disconnected"
+        connection.is_muted = False
         self.error_message = ""
 
+    @rx.event(background=True)
+    async def promote_speaker(self, identity: str):
+        await self._set_speaker(identity, True)
+
+    @rx.event(background=True)
+    async def demote_speaker(self, identity: str):
+        await self._set_speaker(identity, False)
+
+    @rx.event(background=True)
+    async def start_recording(self):
+        async with self:
+            # On a stage only the host may record; in open rooms anyone can.
+            if not self.room_name or (self.room_mode == "stage" and not self.is_host):
+                return
+            room = self.room_name
+        try:
+            recorder_registry.start(room, on_finished=broadcast_recording)
+        except Exception as e:
+            logging.exception(f"Could not start recording {room}: {e}")
+            async with self:
+                self.error_message = f"Could not start recording: {e}"
+            return
+        await broadcast_recording(room)
+
+    @rx.event(background=True)
+    async def stop_recording(self):
+        async with self:
+            if not self.is_recording or (self.room_mode == "stage" and not self.is_host):
+                return
+            room = self.room_name
+        # The recorder flushes, closes the file and then broadcasts the change.
+        recorder_registry.stop(room)
+
+    async def _set_speaker(self, identity: str, speaker: bool):
+        # Runs in the background so the RoomService call doesn't hold the state lock.
+        async with self:
+            if not self.is_host:
+                return
+            room = self.room_name
+        if not stage_registry.set_speaker(room, identity, speaker):
+            return
+        try:
+            await update_publish_permission(room, identity, speaker)
+        except Exception as e:
+            # Not connected to LiveKit (yet): the grant still applies on their next join.
+            logging.warning(f"Could not update permissions for {identity} in {room}: {e}")
+        await broadcast_stage(room)
+
+
+class LiveKitConnectionState(rx.State):
+    """Connection and microphone status as reported by the browser client."""
+
+    connection_status: str = "Disconnected"
+    is_connected: bool = False
+    is_muted: bool = False
+    can_publish: bool = True
+    # Profile currently published after auto-adjustment.
+    active_audio_profile: str = DEFAULT_AUDIO_PROFILE
+
+    @rx.event
+    def prepare_connection(self):
+        """Give the lobby the LiveKit URL to warm up once the user shows intent to join."""
+        credentials = config_service.snapshot.livekit
+        if credentials.is_complete:
+            return rx.call_script(f"window.livekitClient.prepare('{credentials.url}')")
+
+    @rx.event
+    def prewarm_microphone(self, form: dict):
+        """Open the mic from the lobby only if joining the form's room would publish.
+
+        Stage listeners never open it; a mic warmed for an earlier choice is
+        released.
+        """
+        if self.is_connected or not isinstance(form, dict):
+            return
+        room_name = str(form.get("room_name", "")).strip()
+        can_publish = _lobby_can_publish(room_name, str(form.get("username", "")).strip())
+        if can_publish is None:
+            return
+        if not can_publish:
+            return rx.call_script("window.livekitClient.dropMicrophone()")
+        # Joining an open room applies its profile, not the one picked in the form.
+        audio_profile = audio_profile_registry.get(room_name) or form.get("audio_profile")
+        if audio_profile not in AUDIO_PROFILES:
+            audio_profile = DEFAULT_AUDIO_PROFILE
+        return rx.call_script(f"window.livekitClient.warmMicrophone('{audio_profile}')")
+
     @rx.event
     def toggle_mute(self):
+        metrics.toggle_mute_calls.inc()
+        if not self.can_publish:
+            return
         new_muted_state = not self.is_muted
         self.is_muted = new_muted_state
         yield rx.call_script(
             f"window.livekitClient.setMicrophone({str(not new_muted_state).lower()})"
         )
 
+
+class LiveKitRosterState(rx.State):
+    """Participants and who is speaking; receives every bridge message."""
+
+    speaking_identities: list[str] = []
+    # Only speakers and the rows inside the client's viewport are sent to the browser.
+    pinned_participants: list[dict[str, str | bool]] = []
+    visible_participants: list[dict[str, str | bool]] = []
+    roster_offset: int = 0
+    unpinned_count: int = 0
+
+    # Copies of LiveKitSessionState.room_name/username, so messages need not load the session.
+    _room_name: str = ""
+    _username: str = ""
+    # Full roster in join order: identity -> is_local.
+    _roster_index: dict[str, bool] = {}
+    _viewport_start: int = 0
+    _viewport_rows: int = DEFAULT_VIEWPORT_ROWS
+
+    @rx.event
+    async def handle_bridge_event(self, payload: dict):
+        """Apply a structured status message sent through window.livekitBridge."""
+        _channel_messages.inc()
+        try:
+            # Reflex has already decoded the frame; re-encode compactly to size it.
+            _channel_bytes.observe(len(json.dumps(payload, separators=(",", ":"))))
+            with _channel_handling.time():
+                return await self._apply_bridge_message(payload)
+        except Exception as e:
+            logging.exception(f"Failed to apply bridge message: {e}")
+
     @rx.event
-    def handle_js_message(self, json_data: str):
+    async def handle_js_message(self, json_data: str):
+        """Legacy string entry point; parses the JSON and applies it the same way."""
+        _legacy_messages.inc()
         if not json_data or json_data.strip() == "":
             return
 
+        _legacy_bytes.observe(len(json_data))
         try:
+            started = time.perf_counter()
             data = json.loads(json_data)
+            metrics.bridge_parse_duration.observe(time.perf_counter() - started)
+            with _legacy_handling.time():
+                return await self._apply_bridge_message(data)
+        except json.JSONDecodeError as e:
+            logging.exception(f"Invalid JSON from JS: {e}")
+        except Exception as e:
+            logging.exception(f"Failed to parse JS message: {e}")
 
-            if data.get("type") == "error":
-                self.error_message = data.get("message", "Unknown error")
-                self.is_connected = False
-                self.loading = False
-                yield rx.toast.error(f"Error: {self.error_message}")
-                return
+    async def _apply_bridge_message(self, data: dict):
+        # Roster, speaking, viewport and telemetry stay in this state; only the
+        # rarer status messages load the connection or session substate.
+        if data.get("type") == "error":
+            session = await self.get_state(LiveKitSessionState)
+            connection = await self.get_state(LiveKitConnectionState)
+            session.error_message = data.get("message", "Unknown error")
+            # Don't retry a failing call on the next reload.
+            session.resume_context = ""
+            connection.is_connected = False
+            session.loading = False
+            return rx.toast.error(f"Error: {session.error_message}")
 
+        if (
+            "status" in data
+            or "is_muted" in data
+            or data.get("audio_profile") in AUDIO_PROFILES
+        ):
+            connection = await self.get_state(LiveKitConnectionState)
             if "status" in data:
-                self.connection_status = data["status"]
+                connection.connection_status = data["status"]
                 if data["status"] == "Disconnected":
-                    self.is_connected = False
+                    connection.is_connected = False
+                    _forget_session(self._room_name, self.router.session.client_token)
+            if "is_muted" in data:
+                connection.is_muted = data["is_muted"]
+            if data.get("audio_profile") in AUDIO_PROFILES:
+                connection.active_audio_profile = data["audio_profile"]
 
-            if "participants" in data:
-                self.participants = data["participants"]
+        if "roster" in data:
+            self._reset_roster(data["roster"], data.get("speaking", []))
 
-            if "is_muted" in data:
-                self.is_muted = data["is_muted"]
-        except json.JSONDecodeError as e:
-            logging.exception(f"Invalid JSON from JS: {e}")
+        if "patches" in data:
+            self._apply_roster_patches(data["patches"])
+
+        if "viewport" in data:
+            self._set_viewport(data["viewport"])
+
+        if "timing" in data:
+            _observe_timings(data["timing"])
+
+        if "telemetry" in data and self._room_name:
+            # Aggregated server-side only; no state var changes, so no delta.
+            telemetry_store.ingest(self._room_name, self._username, data["telemetry"])
+
+        metrics.roster_size.observe(len(self._roster_index))
+
+    def _reset_roster(self, roster: list[dict], speaking: list[str]):
+        """Replace the roster wholesale (sent on connect and reconnect only).
+
+        In rooms the webhooks track, membership comes from the server-side
+        roster and the client's list only supplies this session's own row,
+        which may be reported before its webhook arrives.
+        """
+        if room_roster.tracks(self._room_name):
+            self._roster_index = {
+                identity: identity == self._username
+                for identity in room_roster.roster(self._room_name)
+            }
+            for p in roster:
+                if p.get("is_local"):
+                    self._roster_index.setdefault(str(p["identity"]), True)
+        else:
+            self._roster_index = {
+                str(p["identity"]): bool(p.get("is_local")) for p in roster
+            }
+        self.speaking_identities = [i for i in speaking if i in self._roster_index]
+        self._refresh_roster_view()
+
+    def _apply_roster_patches(self, patches: list[dict], *, from_server: bool = False):
+        """Apply join / leave / speaking patches keyed by identity.
+
+        Joins and leaves reported by the browser are ignored in rooms whose
+        membership the webhooks track; those arrive ``from_server``.
+        """
+        membership = from_server or not room_roster.tracks(self._room_name)
+        for patch in patches:
+            op = patch.get("op")
+            identity = patch.get("identity")
+            if not identity:
+                continue
+            if op == "join":
+                if membership and identity not in self._roster_index:
+                    self._roster_index[identity] = bool(patch.get("is_local"))
+            elif op == "leave":
+                if not membership or identity not in self._roster_index:
+                    continue
+                del self._roster_index[identity]
+                if identity in self.speaking_identities:
+                    self.speaking_identities.remove(identity)
+            elif op == "speaking":
+                if identity not in self._roster_index:
+                    continue
+                is_speaking = bool(patch.get("is_speaking"))
+                if is_speaking and identity not in self.speaking_identities:
+                    self.speaking_identities.append(identity)
+                elif not is_speaking and identity in self.speaking_identities:
+                    self.speaking_identities.remove(identity)
+        self._refresh_roster_view()
+
+    def _set_viewport(self, viewport: dict):
+        self._viewport_start = max(0, int(viewport.get("start", 0)))
+        self._viewport_rows = min(
+            MAX_VIEWPORT_ROWS, max(1, int(viewport.get("rows", DEFAULT_VIEWPORT_ROWS)))
+        )
+        self._refresh_roster_view()
+
+    def _refresh_roster_view(self):
+        """Recompute pinned speakers and the visible window; only changed vars get dirtied."""
+        index = self._roster_index
+        speaking = set(self.speaking_identities)
+        pinned = [{"identity": i, "is_local": index[i]} for i in self.speaking_identities]
+
+        unpinned_count = len(index) - len(pinned)
+        offset = min(self._viewport_start, max(0, unpinned_count - self._viewport_rows))
+        unpinned = (i for i in index if i not in speaking)
+        visible = [
+            {"identity": i, "is_local": index[i]}
+            for i in itertools.islice(unpinned, offset, offset + self._viewport_rows)
+        ]
+
+        if pinned != self.pinned_participants:
+            self.pinned_participants = pinned
+        if visible != self.visible_participants:
+            self.visible_participants = visible
+        if offset != self.roster_offset:
+            self.roster_offset = offset
+        if unpinned_count != self.unpinned_count:
+            self.unpinned_count = unpinned_count
+
+
+async def broadcast_roster_patches(room: str, patches: list[dict]) -> None:
+    """Apply server-side roster patches to every session currently in ``room``."""
+    sessions = room_roster.sessions(room)
+    if not patches or not sessions:
+        return
+    app = get_app().app
+
+    async def _update_session(client_token: str):
+        try:
+            async with app.modify_state(
+                _substate_key(client_token, LiveKitRosterState)
+            ) as root:
+                state = await root.get_state(LiveKitRosterState)
+                if state._room_name != room:
+                    room_roster.unregister(room, client_token)
+                    return
+                state._apply_roster_patches(
+                    [{**p, "is_local": p["identity"] == state._username} for p in patches],
+                    from_server=True,
+                )
         except Exception as e:
-            logging.exception(f"Failed to parse JS message: {e}")
+            logging.exception(f"Failed to push roster update to {client_token}: {e}")
+
+    await asyncio.gather(*(_update_session(t) for t in sessions))
+
+
+async def broadcast_stage(room: str) -> None:
+    """Push the current stage speakers, and each session's publish right, to ``room``."""
+    stage = stage_registry.get(room)
+    if stage is None:
+        return
+    speakers = sorted(stage.speakers)
+    app = get_app().app
+
+    async def _update_session(client_token: str):
+        try:
+            async with app.modify_state(
+                _substate_key(client_token, LiveKitSessionState)
+            ) as root:
+                session = await root.get_state(LiveKitSessionState)
+                if session.room_name != room:
+                    return
+                session.stage_speakers = speakers
+                can_publish = stage.can_publish(session.username)
+                connection = await root.get_state(LiveKitConnectionState)
+                if can_publish != connection.can_publish:
+                    connection.can_publish = can_publish
+                    connection.is_muted = not can_publish
+        except Exception as e:
+            logging.exception(f"Failed to push stage update to {client_token}: {e}")
+
+    await asyncio.gather(*(_update_session(t) for t in room_roster.sessions(room)))
+
+
+async def broadcast_recording(room: str) -> None:
+    """Push whether ``room`` is being recorded to every session in it."""
+    recording = recorder_registry.get(room)
+    file_name = recording.path.name if recording else ""
+    app = get_app().app
+
+    async def _update_session(client_token: str):
+        try:
+            async with app.modify_state(
+                _substate_key(client_token, LiveKitSessionState)
+            ) as root:
+                state = await root.get_state(LiveKitSessionState)
+                if state.room_name != room:
+                    return
+                state.is_recording = recording is not None
+                state.recording_file = file_name
+        except Exception as e:
+            logging.exception(f"Failed to push recording state to {client_token}: {e}")
+
+    await asyncio.gather(*(_update_session(t) for t in room_roster.sessions(room)))
+
+
+class _BridgeChannel(rx.Fragment):
+    """Registers ``window.livekitBridge.send`` to queue payloads as Reflex events."""
+
+    # Called with each structured payload the JS client sends.
+    on_message: rx.EventHandler[passthrough_event_spec(dict)]
+
+    def _exclude_props(self) -> list[str]:
+        return [*super()._exclude_props(), "on_message"]
+
+    def add_hooks(self) -> list[str | Var[str]]:
+        on_message = self.event_triggers.get("on_message")
+        if on_message is None:
+            return []
+        if isinstance(on_message, EventChain):
+            on_message = wrap(str(format_prop(on_message)).strip("{}"), "(")
+        return [
+            Var(
+                f"useEffect(() => {{ window.livekitBridge = {{ send: {on_message!s} }}; "
+                "return () => { delete window.livekitBridge; }; }, [addEvents]);",
+                _var_type=str,
+                _var_data=VarData(
+                    position=Hooks.HookPosition.POST_TRIGGER,
+                    imports={"react": [ImportVar(tag="useEffect")]},
+                ),
+            ),
+        ]
 
 
 class _LiveKitUI:
     """UI + JS binding helpers for LiveKit."""
 
-    def __init__(self, state_cls: Type[rx.State], *, bridge_input_id: str = "js_msg_input"):
+    def __init__(
+        self,
+        state_cls: Type[rx.State],
+        *,
+        flush_window_ms: int = 0,
+        max_messages_per_second: int = 10,
+        log_bridge_rate: bool = False,
+        server_roster: bool = False,
+        stats_interval_ms: int = 5000,
+        stats_upload_ms: int = 30000,
+        auto_audio_profile: bool = True,
+        downgrade_loss_pct: float = 5.0,
+        upgrade_loss_pct: float = 1.0,
+        upgrade_after_samples: int = 6,
+        last_n_hold_ms: int = 2000,
+        last_n_unsubscribe_ms: int = 30000,
+        mic_prewarm_ms: int = 60000,
+    ):
         self._state_cls = state_cls
-        self._bridge_input_id = bridge_input_id
+        # 0 flushes once per animation frame; otherwise wait this long to batch.
+        self._flush_window_ms = flush_window_ms
+        self._max_messages_per_second = max_messages_per_second
+        self._log_bridge_rate = log_bridge_rate
+        # When LiveKit webhooks feed the backend roster, the client skips join/leave patches.
+        self._server_roster = server_roster
+        # WebRTC getStats() sampling period and batch upload period; 0 disables telemetry.
+        self._stats_interval_ms = stats_interval_ms
+        self._stats_upload_ms = stats_upload_ms
+        # Audio profile adaptation runs on the same getStats() samples.
+        self._audio_adapt_config = {
+            "enabled": auto_audio_profile,
+            "downLossPct": downgrade_loss_pct,
+            "upLossPct": upgrade_loss_pct,
+            "upAfter": upgrade_after_samples,
+            # Step down when the estimated uplink can't carry this multiple of the bitrate.
+            "downHeadroom": 1.5,
+            "upHeadroom": 3.0,
+        }
+        # Last-N: a quiet speaker keeps their slot for hold_ms, then stays subscribed
+        # but paused until unsubscribe_ms so a quick comeback needs no renegotiation.
+        self._last_n_config = {
+            "holdMs": last_n_hold_ms,
+            "unsubscribeMs": last_n_unsubscribe_ms,
+            "tickMs": 1000,
+        }
+        # A microphone opened from the lobby is released if Join doesn't follow; 0 disables.
+        self._mic_prewarm_ms = mic_prewarm_ms
+
+    def bridge_channel(self) -> rx.Component:
+        return _BridgeChannel.create(on_message=self._state_cls.handle_bridge_event)
+
+    def prewarm_connection(self) -> rx.event.EventSpec:
+        """Client-side event for lobby intent (focus, hover): load the client, warm the connection."""
+        return rx.call_script("window.livekitClient.warmConnection()")
 
-    def bridge_input(self) -> rx.Component:
-        return rx.el.input(
-            id=self._bridge_input_id,
-            class_name="hidden",
-            on_change=self._state_cls.handle_js_message,
+    def prewarm_microphone(self) -> rx.event.EventSpec:
+        """Client-side event for the lobby form: the backend decides whether to open the mic."""
+        return rx.call_script(
+            "window.livekitClient.lobbyForm()",
+            callback=LiveKitConnectionState.prewarm_microphone,
         )
 
-    def volume_bar(self, identity: str, *, width: str = "0%") -> rx.Component:
+    def volume_bar(self, identity: str) -> rx.Component:
+        # The JS visualizer drives transform: scaleX(...) so updates never trigger layout.
         return rx.el.div(
             id=f"vol-{identity}",
-            class_name="h-full bg-violet-500 transition-all duration-75 rounded-full",
-            style={"width": width},
+            class_name="h-full w-full bg-violet-500 transition-transform duration-75 rounded-full origin-left",
+            style={"transform": "scaleX(0)"},
+        )
+
+    def preload_hint(self) -> rx.Component:
+        """Warm the HTTP cache for the client bundle while the user fills in the lobby form."""
+        return rx.el.link(
+            rel="preload",
+            href=LIVEKIT_CLIENT.url,
+            integrity=LIVEKIT_CLIENT.integrity or None,
+            cross_origin="anonymous",
+            custom_attrs={"as": "script"},
         )
 
     def head_components(self) -> list[rx.Component]:
+        # The livekit-client bundle itself is loaded on demand by connect().
         return [
-            rx.el.script(
-                src="https://cdn.jsdelivr.net/npm/livekit-client/dist/livekit-client.umd.min.js"
-            ),
             rx.el.script(
                 f"""
                     window.livekitClient = {{
                         room: null,
-                        audioInterval: null,
+                        libraryPromise: null,
+                        // Audio visualizer: one rAF loop, cached bar elements, last written level step.
+                        audioFrame: null,
+                        barElements: new Map(),
+                        barSteps: new Map(),
+                        barScales: Array.from({{ length: 21 }}, (_, i) => `scaleX(${{i / 20}})`),
+                        visibilityHooked: false,
+                        // Created once so the per-frame loop allocates no closures.
+                        audioTick: null,
+                        updateBar: null,
+                        // Last roster / speaker set reported to the server, used to send patches.
+                        roster: new Set(),
+                        speaking: new Set(),
+                        serverRoster: {str(self._server_roster).lower()},
+                        // Participant list virtualization: the server only renders reported rows.
+                        rosterRowHeight: {ROSTER_ROW_HEIGHT_PX},
+                        rosterOverscan: 10,
+                        viewport: null,
+                        viewportFrame: null,
+                        viewportHooked: false,
+                        // Outgoing bridge messages are merged here and flushed at a capped rate.
+                        bridgeConfig: {{
+                            windowMs: {self._flush_window_ms},
+                            maxPerSecond: {self._max_messages_per_second},
+                        }},
+                        pending: null,
+                        flushHandle: null,
+                        flushIsFrame: false,
+                        lastFlushAt: 0,
+                        bridgeCounters: {{ events: 0, sent: 0 }},
+                        rateLogTimer: null,
+                        // WebRTC quality telemetry: sampled locally, uploaded as periodic aggregates.
+                        statsConfig: {{
+                            intervalMs: {self._stats_interval_ms},
+                            uploadMs: {self._stats_upload_ms},
+                        }},
+                        statsTimer: null,
+                        statsUploadTimer: null,
+                        statsPrev: new Map(),
+                        statsAgg: new Map(),
+                        statsWindowStart: 0,
+                        // Audio publish profiles, best first; see AUDIO_PROFILES.
+                        audioProfiles: {json.dumps(AUDIO_PROFILES)},
+                        audioLadder: {json.dumps(list(AUDIO_PROFILES))},
+                        audioAdaptConfig: {json.dumps(self._audio_adapt_config)},
+                        audioAdapt: null,
+                        // Last-N audio: only the most recent speakers are subscribed and decoded.
+                        lastNConfig: {json.dumps(self._last_n_config)},
+                        lastN: 0,
+                        lastSpoke: new Map(),
+                        audible: new Set(),
+                        lastNTimer: null,
+                        streamStats: {{ samples: 0, available: 0, decoded: 0 }},
+                        // Lobby pre-warm of the connection and microphone; see warmConnection().
+                        serverUrl: null,
+                        connectionWarm: false,
+                        micPrewarmMs: {self._mic_prewarm_ms},
+                        micWarm: null,
 
-                        async connect(url, token, username) {{
+                        loadLibrary() {{
+                            if (window.LivekitClient) return Promise.resolve();
+                            if (!this.libraryPromise) {{
+                                this.libraryPromise = new Promise((resolve, reject) => {{
+                                    const script = document.createElement('script');
+                                    script.src = '{LIVEKIT_CLIENT.url}';
+                                    script.crossOrigin = 'anonymous';
+                                    const integrity = '{LIVEKIT_CLIENT.integrity}';
+                                    if (integrity) script.integrity = integrity;
+                                    script.onload = () => resolve();
+                                    script.onerror = () => {{
+                                        this.libraryPromise = null;
+                                        reject(new Error('Failed to load livekit-client'));
+                                    }};
+                                    document.head.appendChild(script);
+                                }});
+                            }}
+                            return this.libraryPromise;
+                        }},
+
+                        // Lobby: remember the LiveKit URL; nothing is loaded until the user shows intent.
+                        prepare(url) {{
+                            this.serverUrl = url;
+                        }},
+
+                        // Lobby pre-warm on focus or hover: load the library, then DNS, TLS and
+                        // region lookup for the LiveKit URL; no token needed.
+                        async warmConnection() {{
+                            if (this.connectionWarm || this.room || !this.serverUrl) return;
+                            this.connectionWarm = true;
                             try {{
+                                await this.loadLibrary();
+                                if (this.room) return;
+                                await new LivekitClient.Room().prepareConnection(this.serverUrl);
+                            }} catch (error) {{
+                                this.connectionWarm = false;
+                                console.warn('Connection pre-warm failed:', error);
+                            }}
+                        }},
+
+                        // The lobby form's fields, for the backend's mic pre-warm decision.
+                        lobbyForm() {{
+                            const form = document.querySelector('select[name=audio_profile]')?.form;
+                            return form ? Object.fromEntries(new FormData(form)) : {{}};
+                        }},
+
+                        // Lobby pre-warm: ask for the mic and open the device before Join is pressed.
+                        // Only called when the backend expects the join to publish.
+                        warmMicrophone(profileName) {{
+                            if (this.micWarm || this.room || this.micPrewarmMs <= 0) return;
+                            if (!(profileName in this.audioProfiles)) profileName = 'speech';
+                            const capture = this.audioProfiles[profileName].capture;
+                            const warm = {{
+                                profile: profileName,
+                                promise: this.loadLibrary().then(() => LivekitClient.createLocalAudioTrack(capture)),
+                                // The device stays open (and the browser shows it) only this long unused.
+                                timer: setTimeout(() => this.dropMicrophone(), this.micPrewarmMs),
+                            }};
+                            warm.promise.catch((error) => {{
+                                console.warn('Microphone pre-warm failed:', error);
+                                if (this.micWarm === warm) this.dropMicrophone();
+                            }});
+                            this.micWarm = warm;
+                        }},
+
+                        dropMicrophone() {{
+                            const warm = this.micWarm;
+                            if (!warm) return;
+                            this.micWarm = null;
+                            clearTimeout(warm.timer);
+                            warm.promise.then((track) => track.stop(), () => {{}});
+                        }},
+
+                        // The pre-warmed mic track (re-opened if the profile changed), or a new one.
+                        takeMicrophone(profileName) {{
+                            const warm = this.micWarm;
+                            const capture = this.audioProfiles[profileName].capture;
+                            if (!warm) return LivekitClient.createLocalAudioTrack(capture);
+                            this.micWarm = null;
+                            clearTimeout(warm.timer);
+                            return warm.promise.then(
+                                async (track) => {{
+                                    if (warm.profile !== profileName) await track.restartTrack(capture);
+                                    return track;
+                                }},
+                                () => LivekitClient.createLocalAudioTrack(capture),
+                            );
+                        }},
+
+                        // Report connect() -> first outgoing RTP packet, polling the mic sender's stats.
+                        watchFirstAudio(track, started) {{
+                            const room = this.room;
+                            const poll = async () => {{
+                                if (this.room !== room || performance.now() - started > 15000) return;
+                                try {{
+                                    const report = track.sender ? await track.sender.getStats() : new Map();
+                                    for (const s of report.values()) {{
+                                        if (s.type === 'outbound-rtp' && s.packetsSent > 0) {{
+                                            this.sendStatus({{ timing: {{ first_audio_ms: Math.round(performance.now() - started) }} }});
+                                            return;
+                                        }}
+                                    }}
+                                }} catch (error) {{
+                                    return;
+                                }}
+                                setTimeout(poll, 20);
+                            }};
+                            poll();
+                        }},
+
+                        async connect(url, token, username, profileName, canPublish = true, lastN = 0) {{
+                            const started = performance.now();
+                            let mic = null;
+                            try {{
+                                await this.loadLibrary();
+                                if (!(profileName in this.audioProfiles)) profileName = 'speech';
+                                // Mic permission and device opening run alongside signaling and ICE.
+                                // Listen-only participants never open the mic.
+                                if (canPublish) {{
+                                    mic = this.takeMicrophone(profileName);
+                                    mic.catch(() => {{}});
+                                }} else {{
+                                    this.dropMicrophone();
+                                }}
+                                const micReady = mic && mic.then(() => Math.round(performance.now() - started));
+                                if (micReady) micReady.catch(() => {{}});
+
                                 if (this.room) {{
                                     await this.room.disconnect();
                                 }}
 
+                                const profile = this.audioProfiles[profileName];
+                                this.audioAdapt = {{ chosen: profileName, current: profileName, good: 0, hold: 0, busy: false }};
+                                this.lastN = lastN > 0 ? lastN : 0;
+                                this.lastSpoke.clear();
+                                this.audible.clear();
                                 this.room = new LivekitClient.Room({{
                                     adaptiveStream: true,
                                     dynacast: true,
-                                    publishDefaults: {{
-                                        audioPreset: LivekitClient.AudioPresets.music,
-                                    }},
+                                    audioCaptureDefaults: profile.capture,
+                                    publishDefaults: this.audioPublishOptions(profile),
                                 }});
 
                                 this.room
                                     .on(LivekitClient.RoomEvent.Connected, () => this.sendStatus({{ status: 'Connected' }}))
                                     .on(LivekitClient.RoomEvent.Reconnecting, () => this.sendStatus({{ status: 'Reconnecting...' }}))
-                                    .on(LivekitClient.RoomEvent.Reconnected, () => this.sendStatus({{ status: 'Connected' }}))
-                                    .on(LivekitClient.RoomEvent.ParticipantConnected, () => this.updateParticipants())
-                                    .on(LivekitClient.RoomEvent.ParticipantDisconnected, () => this.updateParticipants())
-                                    .on(LivekitClient.RoomEvent.ActiveSpeakersChanged, () => this.updateParticipants())
+                                    .on(LivekitClient.RoomEvent.Reconnected, () => {{
+                                        this.sendStatus({{ status: 'Connected' }});
+                                        this.syncRoster();
+                                    }})
+                                    .on(LivekitClient.RoomEvent.ParticipantConnected, (p) => this.participantJoined(p))
+                                    .on(LivekitClient.RoomEvent.ParticipantDisconnected, (p) => this.participantLeft(p))
+                                    .on(LivekitClient.RoomEvent.TrackPublished, (pub, p) => {{
+                                        if (pub.kind === 'audio') this.applySubscription(p);
+                                    }})
+                                    .on(LivekitClient.RoomEvent.ActiveSpeakersChanged, (speakers) => this.speakersChanged(speakers))
+                                    .on(LivekitClient.RoomEvent.ParticipantPermissionsChanged, (prev, p) => {{
+                                        if (p === this.room.localParticipant) this.permissionsChanged();
+                                    }})
                                     .on(LivekitClient.RoomEvent.TrackSubscribed, (track) => {{
                                         if (track.kind === 'audio') {{
                                             track.attach();
                                         }}
                                     }})
+                                    .on(LivekitClient.RoomEvent.TrackUnsubscribed, (track) => track.detach())
                                     .on(LivekitClient.RoomEvent.Disconnected, () => {{
-                                        this.sendStatus({{ status: 'Disconnected', participants: [] }});
+                                        this.stopLastN();
+                                        this.stopStatsSampler();
+                                        this.roster.clear();
+                                        this.speaking.clear();
+                                        this.forgetBars();
+                                        this.sendStatus({{ status: 'Disconnected', roster: [] }});
                                         this.stopAudioVisualizer();
                                     }});
 
-                                await this.room.connect(url, token);
+                                // With Last-N, remote audio is subscribed on demand by updateAudible().
+                                await this.room.connect(url, token, {{ autoSubscribe: this.lastN === 0 }});
+                                const timing = {{ signaling_ms: Math.round(performance.now() - started) }};
 
-                                // Publish local mic
-                                await this.room.localParticipant.setMicrophoneEnabled(true);
+                                if (mic) {{
+                                    const track = await mic;
+                                    timing.microphone_ms = await micReady;
+                                    await this.room.localParticipant.publishTrack(track, {{
+                                        source: LivekitClient.Track.Source.Microphone,
+                                    }});
+                                    mic = null;
+                                    this.watchFirstAudio(track, started);
+                                }}
+                                this.sendStatus({{ timing: timing }});
 
-                                this.updateParticipants();
+                                this.syncRoster();
+                                this.watchViewport();
                                 this.startAudioVisualizer();
+                                this.startStatsSampler();
+                                this.startLastN();
 
                                 // Force connected status just in case
                                 if (this.room.state === 'connected') {{
@@ -201,10 +1096,29 @@ class _LiveKitUI:
                                 }}
                             }} catch (error) {{
                                 console.error('Connection error:', error);
+                                // A mic opened for a connection that failed is not left running.
+                                if (mic) mic.then((track) => track.stop(), () => {{}});
                                 this.sendStatus({{ type: 'error', message: error.message }});
                             }}
                         }},
 
+                        async resume(url, token, username, profileName, canPublish = true, lastN = 0) {{
+                            // Same tab, call still live (e.g. back from another page): just re-report it.
+                            if (this.room && this.room.state === 'connected') {{
+                                this.syncRoster();
+                                this.sendStatus({{
+                                    status: 'Connected',
+                                    is_muted: !this.room.localParticipant.isMicrophoneEnabled,
+                                }});
+                                return;
+                            }}
+                            await this.connect(url, token, username, profileName, canPublish, lastN);
+                            if (this.room && this.room.state === 'connected') {{
+                                // performance.now() counts from navigation start, i.e. the reload.
+                                this.sendStatus({{ timing: {{ reconnected_ms: Math.round(performance.now()) }} }});
+                            }}
+                        }},
+
                         async disconnect() {{
                             if (this.room) {{
                                 await this.room.disconnect();
@@ -215,86 +1129,561 @@ class _LiveKitUI:
 
                         startAudioVisualizer() {{
                             this.stopAudioVisualizer();
-                            this.audioInterval = setInterval(() => {{
-                                if (!this.room) return;
-
-                                const updateBar = (p) => {{
-                                    if (!p) return;
-                                    const identity = p.identity;
-                                    const el = document.getElementById('vol-' + identity);
-                                    if (el) {{
-                                        let level = p.audioLevel || 0;
-                                        let width = Math.min(100, level * 100 * 5);
-                                        if (width < 5 && width > 0) width = 5;
-                                        if (level === 0) width = 0;
-                                        el.style.width = width + '%';
-                                    }}
+                            if (!this.visibilityHooked) {{
+                                // Stop the loop entirely in background tabs; resume when visible again.
+                                document.addEventListener('visibilitychange', () => {{
+                                    if (document.hidden) this.stopAudioVisualizer();
+                                    else if (this.room) this.startAudioVisualizer();
+                                }});
+                                this.visibilityHooked = true;
+                            }}
+                            if (document.hidden) return;
+                            if (!this.audioTick) {{
+                                this.updateBar = (p) => this.drawBar(p);
+                                this.audioTick = () => {{
+                                    this.audioFrame = requestAnimationFrame(this.audioTick);
+                                    if (!this.room) return;
+                                    this.drawBar(this.room.localParticipant);
+                                    this.room.remoteParticipants.forEach(this.updateBar);
                                 }};
-
-                                if (this.room.localParticipant) updateBar(this.room.localParticipant);
-                                this.room.remoteParticipants.forEach(p => updateBar(p));
-                            }}, 50);
+                            }}
+                            this.audioFrame = requestAnimationFrame(this.audioTick);
                         }},
 
                         stopAudioVisualizer() {{
-                            if (this.audioInterval) {{
-                                clearInterval(this.audioInterval);
-                                this.audioInterval = null;
+                            if (this.audioFrame !== null) {{
+                                cancelAnimationFrame(this.audioFrame);
+                                this.audioFrame = null;
                             }}
                         }},
 
-                        async setMicrophone(enabled) {{
-                            if (this.room && this.room.localParticipant) {{
-                                await this.room.localParticipant.setMicrophoneEnabled(enabled);
-                                this.updateParticipants();
+                        drawBar(p) {{
+                            if (!p) return;
+                            const identity = p.identity;
+                            let el = this.barElements.get(identity);
+                            if (!el || !el.isConnected) {{
+                                el = document.getElementById('vol-' + identity);
+                                if (!el) return;
+                                this.barElements.set(identity, el);
+                                this.barSteps.delete(identity);
                             }}
+                            // 20 steps of 5%; any audible level shows at least one step.
+                            const level = p.audioLevel || 0;
+                            let step = Math.min(20, Math.round(level * 100));
+                            if (step === 0 && level > 0) step = 1;
+                            if (this.barSteps.get(identity) === step) return;
+                            this.barSteps.set(identity, step);
+                            el.style.transform = this.barScales[step];
                         }},
 
-                        updateParticipants() {{
-                            if (!this.room) return;
+                        forgetBar(identity) {{
+                            this.barElements.delete(identity);
+                            this.barSteps.delete(identity);
+                        }},
+
+                        forgetBars() {{
+                            this.barElements.clear();
+                            this.barSteps.clear();
+                        }},
+
+                        startLastN() {{
+                            this.stopLastN();
+                            if (!this.lastN) return;
+                            this.updateAudible(this.room.activeSpeakers || []);
+                            // Re-evaluates waiting speakers once holds expire, and retires paused tracks.
+                            this.lastNTimer = setInterval(() => {{
+                                if (!this.room) return;
+                                this.updateAudible(this.room.activeSpeakers || []);
+                                this.room.remoteParticipants.forEach((p) => {{
+                                    if (!this.audible.has(p.identity)) this.applySubscription(p);
+                                }});
+                            }}, this.lastNConfig.tickMs);
+                        }},
 
-                            const participants = [];
+                        stopLastN() {{
+                            if (this.lastNTimer === null) return;
+                            clearInterval(this.lastNTimer);
+                            this.lastNTimer = null;
+                        }},
+
+                        // Speakers fill free slots; a quiet participant only gives up theirs after holdMs.
+                        updateAudible(speakers) {{
+                            if (!this.lastN || !this.room) return;
+                            const cfg = this.lastNConfig;
+                            const now = performance.now();
+                            const remote = this.room.remoteParticipants;
+                            const active = [];
+                            speakers.forEach((p) => {{
+                                if (!remote.has(p.identity)) return;
+                                active.push(p.identity);
+                                this.lastSpoke.set(p.identity, now);
+                            }});
+                            const next = new Set();
+                            this.audible.forEach((identity) => {{
+                                if (remote.has(identity)) next.add(identity);
+                            }});
+                            for (const identity of active) {{
+                                if (next.has(identity)) continue;
+                                if (next.size >= this.lastN) {{
+                                    let quietest = null;
+                                    let quietSince = Infinity;
+                                    next.forEach((other) => {{
+                                        const spoke = this.lastSpoke.get(other) || 0;
+                                        if (spoke < quietSince && !active.includes(other)) {{
+                                            quietest = other;
+                                            quietSince = spoke;
+                                        }}
+                                    }});
+                                    // Every slot is taken by a current or recent speaker: wait for the next tick.
+                                    if (quietest === null || now - quietSince < cfg.holdMs) continue;
+                                    next.delete(quietest);
+                                }}
+                                next.add(identity);
+                            }}
+                            const previous = this.audible;
+                            this.audible = next;
+                            previous.forEach((identity) => {{
+                                if (!next.has(identity) && remote.has(identity)) this.applySubscription(remote.get(identity));
+                            }});
+                            next.forEach((identity) => {{
+                                if (!previous.has(identity)) this.applySubscription(remote.get(identity));
+                            }});
+                        }},
 
-                            // Add local participant
-                            participants.push({{
-                                identity: this.room.localParticipant.identity,
-                                is_speaking: this.room.localParticipant.isSpeaking,
-                                is_local: true,
+                        applySubscription(p) {{
+                            if (!this.lastN || !p) return;
+                            const audible = this.audible.has(p.identity);
+                            const quietFor = performance.now() - (this.lastSpoke.get(p.identity) || 0);
+                            p.audioTrackPublications.forEach((pub) => {{
+                                if (audible) {{
+                                    if (!pub.isSubscribed) pub.setSubscribed(true);
+                                    else if (!pub.isEnabled) pub.setEnabled(true);
+                                }} else if (pub.isSubscribed) {{
+                                    // Like adaptiveStream for off-screen video: pause first, drop later.
+                                    if (quietFor >= this.lastNConfig.unsubscribeMs) pub.setSubscribed(false);
+                                    else if (pub.isEnabled) pub.setEnabled(false);
+                                }}
                             }});
+                        }},
+
+                        startStatsSampler() {{
+                            this.stopStatsSampler();
+                            const cfg = this.statsConfig;
+                            if (!cfg.intervalMs) return;
+                            this.statsWindowStart = performance.now();
+                            this.statsTimer = setInterval(() => this.sampleStats(), cfg.intervalMs);
+                            if (cfg.uploadMs) {{
+                                this.statsUploadTimer = setInterval(() => this.uploadStats(), cfg.uploadMs);
+                            }}
+                        }},
 
-                            // Add remote participants
+                        stopStatsSampler() {{
+                            if (this.statsTimer === null) return;
+                            clearInterval(this.statsTimer);
+                            if (this.statsUploadTimer !== null) clearInterval(this.statsUploadTimer);
+                            this.statsTimer = null;
+                            this.statsUploadTimer = null;
+                            this.uploadStats();
+                            this.statsPrev.clear();
+                        }},
+
+                        async sampleStats() {{
+                            if (!this.room) return;
+                            const jobs = [];
+                            this.room.localParticipant.audioTrackPublications.forEach((pub) => {{
+                                if (pub.track) jobs.push(this.sampleTrack('local', 'send', pub.track));
+                            }});
+                            let available = 0;
+                            let decoded = 0;
                             this.room.remoteParticipants.forEach((p) => {{
-                                participants.push({{
-                                    identity: p.identity,
-                                    is_speaking: p.isSpeaking,
-                                    is_local: false,
+                                p.audioTrackPublications.forEach((pub) => {{
+                                    available += 1;
+                                    // Paused (Last-N) tracks receive nothing; skip them.
+                                    if (!pub.track || !pub.isEnabled) return;
+                                    decoded += 1;
+                                    jobs.push(this.sampleTrack(p.identity, 'recv', pub.track));
                                 }});
                             }});
+                            const streams = this.streamStats;
+                            streams.samples += 1;
+                            streams.available += available;
+                            streams.decoded += decoded;
+                            await Promise.all(jobs);
+                        }},
+
+                        // Reads cumulative RTP counters and folds the delta since the last sample into statsAgg.
+                        async sampleTrack(peer, dir, track) {{
+                            let report;
+                            try {{
+                                report = await track.getRTCStatsReport();
+                            }} catch (e) {{
+                                return;
+                            }}
+                            if (!report) return;
+                            const s = {{ ts: 0, bytes: 0, packets: 0, lost: 0, rtt: null, jitter: null, concealed: 0, samples: 0, availableKbps: null }};
+                            report.forEach((stat) => {{
+                                if (stat.kind !== undefined && stat.kind !== 'audio') return;
+                                if (dir === 'send' && stat.type === 'outbound-rtp') {{
+                                    s.ts = stat.timestamp;
+                                    s.bytes = stat.bytesSent || 0;
+                                    s.packets = stat.packetsSent || 0;
+                                }} else if (dir === 'send' && stat.type === 'remote-inbound-rtp') {{
+                                    s.lost = stat.packetsLost || 0;
+                                    if (stat.roundTripTime !== undefined) s.rtt = stat.roundTripTime;
+                                    if (stat.jitter !== undefined) s.jitter = stat.jitter;
+                                }} else if (dir === 'recv' && stat.type === 'inbound-rtp') {{
+                                    s.ts = stat.timestamp;
+                                    s.bytes = stat.bytesReceived || 0;
+                                    s.packets = stat.packetsReceived || 0;
+                                    s.lost = stat.packetsLost || 0;
+                                    s.concealed = stat.concealedSamples || 0;
+                                    s.samples = stat.totalSamplesReceived || 0;
+                                    if (stat.jitter !== undefined) s.jitter = stat.jitter;
+                                }} else if (stat.type === 'candidate-pair' && stat.nominated) {{
+                                    if (s.rtt === null && stat.currentRoundTripTime !== undefined) s.rtt = stat.currentRoundTripTime;
+                                    if (stat.availableOutgoingBitrate !== undefined) s.availableKbps = stat.availableOutgoingBitrate / 1000;
+                                }}
+                            }});
+                            const key = dir + ':' + peer;
+                            const prev = this.statsPrev.get(key);
+                            this.statsPrev.set(key, s);
+                            if (!prev || !s.ts || s.ts <= prev.ts) return;
+
+                            let agg = this.statsAgg.get(key);
+                            if (!agg) {{
+                                agg = {{ peer: peer, dir: dir, rtt: 0, rttN: 0, rttMax: 0, jitter: 0, jitterN: 0,
+                                        lost: 0, expected: 0, bytes: 0, seconds: 0, concealed: 0, samples: 0 }};
+                                this.statsAgg.set(key, agg);
+                            }}
+                            if (s.rtt !== null) {{
+                                agg.rtt += s.rtt;
+                                agg.rttN += 1;
+                                agg.rttMax = Math.max(agg.rttMax, s.rtt);
+                            }}
+                            if (s.jitter !== null) {{
+                                agg.jitter += s.jitter;
+                                agg.jitterN += 1;
+                            }}
+                            const lost = Math.max(0, s.lost - prev.lost);
+                            const packets = Math.max(0, s.packets - prev.packets);
+                            // Senders learn losses from receiver reports; receivers count their own gaps.
+                            agg.lost += lost;
+                            agg.expected += dir === 'send' ? packets : packets + lost;
+                            agg.bytes += Math.max(0, s.bytes - prev.bytes);
+                            agg.seconds += (s.ts - prev.ts) / 1000;
+                            agg.concealed += Math.max(0, s.concealed - prev.concealed);
+                            agg.samples += Math.max(0, s.samples - prev.samples);
+                            if (dir === 'send') {{
+                                this.adaptAudio(packets ? (lost / packets) * 100 : 0, s.availableKbps);
+                            }}
+                        }},
+
+                        audioPublishOptions(profile) {{
+                            return {{
+                                audioPreset: {{ maxBitrate: profile.maxBitrate }},
+                                dtx: profile.dtx,
+                                red: profile.red,
+                                forceStereo: profile.stereo,
+                            }};
+                        }},
+
+                        // Called once per stats sample with the uplink loss and bandwidth estimate.
+                        adaptAudio(lossPct, availableKbps) {{
+                            const a = this.audioAdapt;
+                            const cfg = this.audioAdaptConfig;
+                            if (!a || !cfg.enabled || a.busy) return;
+                            if (a.hold > 0) {{
+                                // The sample right after a switch still reflects the old settings.
+                                a.hold -= 1;
+                                return;
+                            }}
+                            const index = this.audioLadder.indexOf(a.current);
+                            const current = this.audioProfiles[a.current];
+                            const congested = lossPct > cfg.downLossPct
+                                || (availableKbps !== null && availableKbps < (current.maxBitrate / 1000) * cfg.downHeadroom);
+                            if (congested) {{
+                                a.good = 0;
+                                if (index < this.audioLadder.length - 1) this.applyAudioProfile(this.audioLadder[index + 1]);
+                                return;
+                            }}
+                            if (index <= this.audioLadder.indexOf(a.chosen)) return;
+                            const better = this.audioProfiles[this.audioLadder[index - 1]];
+                            const healthy = lossPct < cfg.upLossPct
+                                && (availableKbps === null || availableKbps > (better.maxBitrate / 1000) * cfg.upHeadroom);
+                            a.good = healthy ? a.good + 1 : 0;
+                            if (a.good >= cfg.upAfter) {{
+                                a.good = 0;
+                                this.applyAudioProfile(this.audioLadder[index - 1]);
+                            }}
+                        }},
+
+                        async applyAudioProfile(name) {{
+                            const a = this.audioAdapt;
+                            if (!this.room || !a) return;
+                            const pub = this.room.localParticipant.getTrackPublication(LivekitClient.Track.Source.Microphone);
+                            if (!pub || !pub.track) return;
+                            const prev = this.audioProfiles[a.current];
+                            const next = this.audioProfiles[name];
+                            a.busy = true;
+                            try {{
+                                const sender = pub.track.sender;
+                                if (prev.dtx === next.dtx && prev.red === next.red && prev.stereo === next.stereo && sender) {{
+                                    // Bitrate alone can change on the live sender without renegotiation.
+                                    const params = sender.getParameters();
+                                    (params.encodings || []).forEach((e) => {{ e.maxBitrate = next.maxBitrate; }});
+                                    await sender.setParameters(params);
+                                }} else {{
+                                    // DTX, RED and stereo are negotiated: republish the same mic track.
+                                    const track = pub.track;
+                                    await this.room.localParticipant.unpublishTrack(track, false);
+                                    await this.room.localParticipant.publishTrack(track, {{
+                                        ...this.audioPublishOptions(next),
+                                        source: LivekitClient.Track.Source.Microphone,
+                                    }});
+                                }}
+                                a.current = name;
+                                a.hold = 1;
+                                this.sendStatus({{ audio_profile: name }});
+                            }} catch (error) {{
+                                console.warn('Audio profile switch failed:', error);
+                            }} finally {{
+                                a.busy = false;
+                            }}
+                        }},
+
+                        uploadStats() {{
+                            const streams = this.streamStats;
+                            if (this.statsAgg.size === 0 && streams.samples === 0) return;
+                            const round = (v) => Math.round(v * 10) / 10;
+                            const tracks = [];
+                            this.statsAgg.forEach((a) => {{
+                                const t = {{ peer: a.peer, dir: a.dir }};
+                                if (a.rttN) {{
+                                    t.rtt_ms = round((a.rtt / a.rttN) * 1000);
+                                    t.rtt_max_ms = round(a.rttMax * 1000);
+                                }}
+                                if (a.jitterN) t.jitter_ms = round((a.jitter / a.jitterN) * 1000);
+                                if (a.expected) t.loss_pct = round((a.lost / a.expected) * 100);
+                                if (a.seconds) t.kbps = round((a.bytes * 8) / a.seconds / 1000);
+                                if (a.samples) t.concealed_pct = round((a.concealed / a.samples) * 100);
+                                tracks.push(t);
+                            }});
+                            const now = performance.now();
+                            const telemetry = {{ window_s: round((now - this.statsWindowStart) / 1000), tracks: tracks }};
+                            if (streams.samples) {{
+                                // Remote audio tracks available vs. actually decoded, averaged over the window.
+                                telemetry.audio_streams = {{
+                                    last_n: this.lastN,
+                                    available: round(streams.available / streams.samples),
+                                    decoded: round(streams.decoded / streams.samples),
+                                }};
+                            }}
+                            this.sendStatus({{ telemetry: telemetry }});
+                            this.streamStats = {{ samples: 0, available: 0, decoded: 0 }};
+                            this.statsAgg.clear();
+                            this.statsWindowStart = now;
+                        }},
+
+                        // Promotion to or demotion from the stage, applied by the server via RoomService.
+                        async permissionsChanged() {{
+                            const local = this.room && this.room.localParticipant;
+                            if (!local) return;
+                            const canPublish = !!(local.permissions && local.permissions.canPublish);
+                            if (canPublish && !local.isMicrophoneEnabled) {{
+                                try {{
+                                    await local.setMicrophoneEnabled(true);
+                                }} catch (error) {{
+                                    console.warn('Could not enable microphone:', error);
+                                }}
+                            }}
+                            this.sendStatus({{ is_muted: !local.isMicrophoneEnabled }});
+                        }},
+
+                        async setMicrophone(enabled) {{
+                            if (this.room && this.room.localParticipant) {{
+                                await this.room.localParticipant.setMicrophoneEnabled(enabled);
+                                this.sendStatus({{ is_muted: !this.room.localParticipant.isMicrophoneEnabled }});
+                            }}
+                        }},
+
+                        // Full resync; only sent on connect and reconnect.
+                        syncRoster() {{
+                            if (!this.room) return;
+
+                            const roster = [];
+                            this.roster = new Set();
+                            this.speaking = new Set();
+                            this.forgetBars();
+
+                            const add = (p, isLocal) => {{
+                                this.roster.add(p.identity);
+                                if (p.isSpeaking) this.speaking.add(p.identity);
+                                roster.push({{ identity: p.identity, is_local: isLocal }});
+                            }};
+                            add(this.room.localParticipant, true);
+                            this.room.remoteParticipants.forEach((p) => add(p, false));
 
                             this.sendStatus({{
-                                participants: participants,
+                                roster: roster,
+                                speaking: Array.from(this.speaking),
                                 is_muted: !this.room.localParticipant.isMicrophoneEnabled,
                             }});
                         }},
 
+                        watchViewport() {{
+                            this.viewport = null;
+                            if (!this.viewportHooked) {{
+                                // Capture scrolls from the participant list even if React re-mounts it.
+                                const onChange = (event) => {{
+                                    if (event.type === 'scroll' && event.target.id !== 'roster-scroll') return;
+                                    if (this.viewportFrame !== null) return;
+                                    this.viewportFrame = requestAnimationFrame(() => {{
+                                        this.viewportFrame = null;
+                                        this.reportViewport();
+                                    }});
+                                }};
+                                document.addEventListener('scroll', onChange, {{ capture: true, passive: true }});
+                                window.addEventListener('resize', onChange, {{ passive: true }});
+                                this.viewportHooked = true;
+                            }}
+                            this.reportViewport();
+                        }},
+
+                        reportViewport() {{
+                            const el = document.getElementById('roster-scroll');
+                            if (!el || !this.room) return;
+                            const first = Math.floor(el.scrollTop / this.rosterRowHeight);
+                            const rows = Math.ceil(el.clientHeight / this.rosterRowHeight) + 1;
+                            const v = this.viewport;
+                            // Only ask for a new window once the visible rows leave the last one.
+                            if (v && first >= v.start && first + rows <= v.start + v.rows) return;
+                            const start = Math.max(0, first - this.rosterOverscan);
+                            this.viewport = {{ start: start, rows: rows + 2 * this.rosterOverscan }};
+                            this.sendStatus({{ viewport: this.viewport }});
+                        }},
+
+                        participantJoined(p) {{
+                            if (this.roster.has(p.identity)) return;
+                            this.roster.add(p.identity);
+                            this.forgetBar(p.identity);
+                            if (this.serverRoster) return;
+                            this.sendStatus({{ patches: [{{ op: 'join', identity: p.identity, is_local: false }}] }});
+                        }},
+
+                        participantLeft(p) {{
+                            if (!this.roster.delete(p.identity)) return;
+                            this.speaking.delete(p.identity);
+                            this.forgetBar(p.identity);
+                            this.statsPrev.delete('recv:' + p.identity);
+                            this.lastSpoke.delete(p.identity);
+                            this.audible.delete(p.identity);
+                            if (this.serverRoster) return;
+                            this.sendStatus({{ patches: [{{ op: 'leave', identity: p.identity }}] }});
+                        }},
+
+                        speakersChanged(speakers) {{
+                            this.updateAudible(speakers);
+                            const active = new Set(speakers.map((p) => p.identity));
+                            const patches = [];
+                            this.speaking.forEach((identity) => {{
+                                if (!active.has(identity)) {{
+                                    patches.push({{ op: 'speaking', identity: identity, is_speaking: false }});
+                                }}
+                            }});
+                            active.forEach((identity) => {{
+                                if (!this.speaking.has(identity) && this.roster.has(identity)) {{
+                                    patches.push({{ op: 'speaking', identity: identity, is_speaking: true }});
+                                }}
+                            }});
+                            if (patches.length === 0) return;
+                            patches.forEach((patch) => {{
+                                if (patch.is_speaking) this.speaking.add(patch.identity);
+                                else this.speaking.delete(patch.identity);
+                            }});
+                            this.sendStatus({{ patches: patches }});
+                        }},
+
                         sendStatus(data) {{
-                            const input = document.getElementById('{self._bridge_input_id}');
-                            if (input) {{
-                                const jsonStr = JSON.stringify(data);
+                            this.bridgeCounters.events += 1;
+                            if (data.type === 'error' || data.status === 'Disconnected') {{
+                                // Critical events go out immediately, after anything already queued.
+                                this.flushStatus();
+                                this.postStatus(data);
+                                return;
+                            }}
+                            this.pending = this.mergeStatus(this.pending, data);
+                            this.scheduleFlush();
+                        }},
+
+                        mergeStatus(pending, data) {{
+                            if (!pending) return {{ ...data }};
+                            const merged = {{ ...pending, ...data }};
+                            if ('roster' in data) {{
+                                // A full resync supersedes any patches queued before it.
+                                delete merged.patches;
+                            }} else if (pending.patches && data.patches) {{
+                                merged.patches = pending.patches.concat(data.patches);
+                            }}
+                            if (pending.timing && data.timing) {{
+                                merged.timing = {{ ...pending.timing, ...data.timing }};
+                            }}
+                            return merged;
+                        }},
 
-                                // Hack for React 16+ to trigger onChange
-                                const nativeInputValueSetter = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, "value").set;
-                                nativeInputValueSetter.call(input, jsonStr);
+                        scheduleFlush() {{
+                            if (this.flushHandle !== null) return;
+                            const cfg = this.bridgeConfig;
+                            const sinceLast = performance.now() - this.lastFlushAt;
+                            const delay = Math.max(cfg.windowMs, 1000 / cfg.maxPerSecond - sinceLast);
+                            // requestAnimationFrame does not fire in hidden tabs, so fall back to a timer there.
+                            this.flushIsFrame = delay <= 0 && !document.hidden;
+                            this.flushHandle = this.flushIsFrame
+                                ? requestAnimationFrame(() => this.flushStatus())
+                                : setTimeout(() => this.flushStatus(), delay);
+                        }},
+
+                        flushStatus() {{
+                            if (this.flushHandle !== null) {{
+                                if (this.flushIsFrame) cancelAnimationFrame(this.flushHandle);
+                                else clearTimeout(this.flushHandle);
+                                this.flushHandle = null;
+                            }}
+                            if (!this.pending) return;
+                            const data = this.pending;
+                            this.pending = null;
+                            this.lastFlushAt = performance.now();
+                            this.postStatus(data);
+                        }},
+
+                        setBridgeLogging(enabled) {{
+                            if (this.rateLogTimer) {{
+                                clearInterval(this.rateLogTimer);
+                                this.rateLogTimer = null;
+                            }}
+                            if (!enabled) return;
+                            let last = {{ ...this.bridgeCounters }};
+                            this.rateLogTimer = setInterval(() => {{
+                                const now = this.bridgeCounters;
+                                console.info(
+                                    `[livekit bridge] ${{now.sent - last.sent}} msg/s sent, ` +
+                                    `${{now.events - last.events}} events/s coalesced`
+                                );
+                                last = {{ ...now }};
+                            }}, 1000);
+                        }},
 
-                                const event = new Event('input', {{ bubbles: true }});
-                                input.dispatchEvent(event);
+                        postStatus(data) {{
+                            this.bridgeCounters.sent += 1;
+                            if (window.livekitBridge) {{
+                                window.livekitBridge.send(data);
                             }}
                         }}
                     }};
+                    window.livekitClient.setBridgeLogging({str(self._log_bridge_rate).lower()});
                 """
             ),
         ]
 
 
-def bind_livekit(state_cls: Type[rx.State]) -> _LiveKitUI:
-    return _LiveKitUI(state_cls)
+def bind_livekit(state_cls: Type[rx.State], **options) -> _LiveKitUI:
+    return _LiveKitUI(state_cls, **options)
@@ -1,9 +1,49 @@
 import reflex as rx
+from reflex.constants import Dirs
+from reflex.utils.imports import ImportVar
+from reflex.vars.base import Var, VarData
+from reflex_livekit_audio_chat.api_routes import backend_api
+from reflex_livekit_audio_chat.services.config_service import config_service
+from reflex_livekit_audio_chat.services.livekit_client import livekit_clients
+from reflex_livekit_audio_chat.services import room_directory as room_directory_service
+from reflex_livekit_audio_chat.services.token_provisioning import token_provisioner
+from reflex_livekit_audio_chat.states.lobby_state import LobbyState
 from reflex_livekit_audio_chat.states.settings_state import SettingsState
-from reflex_livekit_audio_chat.livekit_bridge import LiveKitBridgeState, bind_livekit
+from reflex_livekit_audio_chat.states.telemetry_state import TelemetryState
+from reflex_livekit_audio_chat.static_assets import INTER_FONT
+from reflex_livekit_audio_chat.services.audio_subscriptions import LAST_N_CHOICES
+from reflex_livekit_audio_chat.services.stage import ROOM_MODES
+from reflex_livekit_audio_chat.livekit_bridge import (
+    AUDIO_PROFILES,
+    ROSTER_ROW_HEIGHT_PX,
+    LiveKitConnectionState,
+    LiveKitRosterState,
+    LiveKitSessionState,
+    bind_livekit,
+)
 
 # Single source of truth for how LiveKit JS binds to this UI.
-LIVEKIT_UI = bind_livekit(LiveKitBridgeState)
+LIVEKIT_UI = bind_livekit(LiveKitRosterState)
+
+
+# Origin of the Reflex backend as seen from the browser (same resolution Reflex uses for uploads).
+BACKEND_ORIGIN = Var(
+    _js_expr="getBackendURL(env.PING).origin",
+    _var_data=VarData(
+        imports={
+            f"$/{Dirs.STATE_PATH}": "getBackendURL",
+            "$/env.json": ImportVar(tag="env", is_default=True),
+        }
+    ),
+).to(str)
+
+
+def avatar_url(identity: Var[str]) -> Var[str]:
+    encoded = Var(
+        _js_expr=f"encodeURIComponent({identity!s})",
+        _var_data=identity._get_all_var_data(),
+    ).to(str)
+    return Var.create(f"{BACKEND_ORIGIN}/avatars/{encoded}.svg")
 
 
 def input_field(
@@ -23,6 +63,121 @@ def input_field(
     )
 
 
+def quality_cell(value: Var, class_name: str = "") -> rx.Component:
+    return rx.el.td(value, class_name=f"px-3 py-2 whitespace-nowrap {class_name}")
+
+
+def quality_header(*labels: str) -> rx.Component:
+    return rx.el.thead(
+        rx.el.tr(
+            *[
+                rx.el.th(label, class_name="px-3 py-2 text-left font-semibold")
+                for label in labels
+            ],
+            class_name="text-xs text-gray-500 uppercase tracking-wider",
+        )
+    )
+
+
+def quality_room_row(room: dict) -> rx.Component:
+    return rx.el.tr(
+        quality_cell(room["room"], "font-medium text-gray-900"),
+        quality_cell(room["participants"]),
+        quality_cell(room["rtt"]),
+        quality_cell(room["jitter"]),
+        quality_cell(room["loss"]),
+        quality_cell(room["worst_loss"]),
+        quality_cell(room["concealed"]),
+        quality_cell(room["streams"]),
+        quality_cell(room["saved"]),
+        on_click=TelemetryState.select_quality_room(room["room"]),
+        class_name=rx.cond(
+            TelemetryState.selected_room == room["room"],
+            "bg-violet-50 cursor-pointer",
+            "hover:bg-gray-50 cursor-pointer",
+        ),
+    )
+
+
+def quality_participant_row(participant: dict) -> rx.Component:
+    return rx.el.tr(
+        quality_cell(participant["identity"], "font-medium text-gray-900"),
+        quality_cell(participant["rtt"]),
+        quality_cell(participant["jitter"]),
+        quality_cell(participant["send"]),
+        quality_cell(participant["recv"]),
+        quality_cell(participant["concealed"]),
+        quality_cell(participant["streams"]),
+        quality_cell(participant["saved"]),
+    )
+
+
+def call_quality_panel() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.div(
+                rx.icon("activity", class_name="text-violet-500 h-5 w-5"),
+                rx.el.h2("Call Quality", class_name="text-lg font-bold text-gray-900"),
+                class_name="flex items-center gap-2",
+            ),
+            rx.el.button(
+                rx.icon("refresh-cw", class_name="h-4 w-4"),
+                type="button",
+                on_click=TelemetryState.load_quality,
+                class_name="text-gray-400 hover:text-violet-600 transition-colors",
+            ),
+            class_name="flex items-center justify-between mb-4",
+        ),
+        rx.cond(
+            TelemetryState.rooms.length() > 0,
+            rx.el.div(
+                rx.el.table(
+                    quality_header(
+                        "Room",
+                        "Reporting",
+                        "RTT",
+                        "Jitter",
+                        "Loss",
+                        "Worst loss",
+                        "Concealed",
+                        "Decoded",
+                        "Saved",
+                    ),
+                    rx.el.tbody(rx.foreach(TelemetryState.rooms, quality_room_row)),
+                    class_name="w-full text-sm text-gray-700",
+                ),
+                rx.cond(
+                    TelemetryState.selected_room != "",
+                    rx.el.table(
+                        quality_header(
+                            "Participant",
+                            "RTT",
+                            "Jitter",
+                            "Send",
+                            "Receive",
+                            "Concealed",
+                            "Decoded",
+                            "Saved",
+                        ),
+                        rx.el.tbody(
+                            rx.foreach(TelemetryState.participants, quality_participant_row)
+                        ),
+                        class_name="w-full text-sm text-gray-700 mt-6",
+                    ),
+                    rx.fragment(),
+                ),
+                class_name="overflow-x-auto",
+            ),
+            rx.el.p(
+                "No quality reports yet. Browsers upload call statistics every 30 seconds while in a room.",
+                class_name="text-gray-500 text-sm",
+            ),
+        ),
+        on_mount=TelemetryState.load_quality,
+        class_name="w-full max-w-3xl bg-white p-8 rounded-2xl border border-gray-100 shadow-sm mt-6",
+    )
+
+
 def settings_page() -> rx.Component:
     return rx.el.div(
         rx.el.div(
@@ -137,14 +292,65 @@ def settings_page() -> rx.Component:
                 ),
                 class_name="w-full max-w-md bg-white p-8 rounded-2xl border border-gray-100 shadow-sm",
             ),
-            class_name="flex flex-col items-center justify-center min-h-screen bg-gray-50 px-4",
+            rx.cond(
+                SettingsState.is_admin_authenticated,
+                call_quality_panel(),
+                rx.fragment(),
+            ),
+            class_name="flex flex-col items-center justify-center min-h-screen bg-gray-50 px-4 py-8",
         ),
         class_name="font-['Inter']",
     )
 
 
+def room_listing(room: dict) -> rx.Component:
+    return rx.el.button(
+        rx.el.div(
+            rx.icon("hash", class_name="h-4 w-4 text-violet-500"),
+            rx.el.span(room["name"], class_name="font-medium text-gray-900 truncate"),
+            class_name="flex items-center gap-2 min-w-0",
+        ),
+        rx.el.div(
+            rx.icon("users", class_name="h-4 w-4"),
+            rx.el.span(room["participants"]),
+            class_name="flex items-center gap-1 text-sm text-gray-500",
+        ),
+        type="button",
+        on_click=LobbyState.select_room(room["name"]),
+        class_name="w-full flex items-center justify-between gap-3 px-4 py-2 rounded-lg hover:bg-violet-50 transition-colors",
+    )
+
+
+def room_directory() -> rx.Component:
+    return rx.cond(
+        LobbyState.rooms.length() > 0,
+        rx.el.div(
+            rx.el.div(
+                rx.el.h3(
+                    "Active Rooms",
+                    class_name="text-sm font-semibold text-gray-500 uppercase tracking-wider",
+                ),
+                rx.el.button(
+                    rx.icon("refresh-cw", class_name="h-4 w-4"),
+                    type="button",
+                    on_click=LobbyState.load_rooms,
+                    class_name="text-gray-400 hover:text-violet-600 transition-colors",
+                ),
+                class_name="flex items-center justify-between mb-2",
+            ),
+            rx.el.div(
+                rx.foreach(LobbyState.rooms, room_listing),
+                class_name="flex flex-col max-h-60 overflow-auto",
+            ),
+            class_name="w-full max-w-md bg-white p-6 rounded-3xl border border-gray-100 shadow-xl shadow-gray-200/50 mt-6",
+        ),
+        rx.fragment(),
+    )
+
+
 def lobby_view() -> rx.Component:
     return rx.el.div(
+        LIVEKIT_UI.preload_hint(),
         rx.el.div(
             rx.el.div(
                 rx.icon("mic-vocal", class_name="h-12 w-12 text-violet-600"),
@@ -158,14 +364,14 @@ def lobby_view() -> rx.Component:
                 rx.el.form(
                     rx.el.div(
                         rx.cond(
-                            LiveKitBridgeState.error_message != "",
+                            LiveKitSessionState.error_message != "",
                             rx.el.div(
                                 rx.icon(
                                     "circle-alert",
                                     class_name="h-5 w-5 text-red-500 shrink-0",
                                 ),
                                 rx.el.p(
-                                    LiveKitBridgeState.error_message,
+                                    LiveKitSessionState.error_message,
                                     class_name="text-red-700 text-sm",
                                 ),
                                 class_name="bg-red-50 p-4 rounded-lg flex items-center gap-3 border border-red-100 mb-2",
@@ -176,17 +382,69 @@ def lobby_view() -> rx.Component:
                             "Display Name",
                             "username",
                             "Enter your name",
-                            value=LiveKitBridgeState.username,
+                            value=LiveKitSessionState.username,
                         ),
                         input_field(
                             "Room Name",
                             "room_name",
                             "Enter room to join",
-                            value=LiveKitBridgeState.room_name,
+                            value=LiveKitSessionState.room_name,
+                        ),
+                        rx.el.div(
+                            rx.el.label(
+                                "Audio Quality",
+                                class_name="block text-sm font-semibold text-gray-700 mb-1",
+                            ),
+                            rx.el.select(
+                                *[
+                                    rx.el.option(profile["label"], value=name)
+                                    for name, profile in AUDIO_PROFILES.items()
+                                ],
+                                name="audio_profile",
+                                default_value=LiveKitSessionState.audio_profile,
+                                class_name="w-full px-4 py-2 border border-gray-200 rounded-lg bg-white focus:ring-2 focus:ring-violet-500 focus:border-transparent outline-none transition-all",
+                            ),
+                            class_name="w-full",
+                        ),
+                        rx.el.div(
+                            rx.el.label(
+                                "Room Mode",
+                                class_name="block text-sm font-semibold text-gray-700 mb-1",
+                            ),
+                            rx.el.select(
+                                *[
+                                    rx.el.option(label, value=mode)
+                                    for mode, label in ROOM_MODES.items()
+                                ],
+                                name="room_mode",
+                                default_value=LiveKitSessionState.room_mode,
+                                class_name="w-full px-4 py-2 border border-gray-200 rounded-lg bg-white focus:ring-2 focus:ring-violet-500 focus:border-transparent outline-none transition-all",
+                            ),
+                            class_name="w-full",
+                        ),
+                        rx.el.div(
+                            rx.el.label(
+                                "Play Audio From",
+                                class_name="block text-sm font-semibold text-gray-700 mb-1",
+                            ),
+                            rx.el.select(
+                                *[
+                                    rx.el.option(label, value=str(last_n))
+                                    for last_n, label in LAST_N_CHOICES.items()
+                                ],
+                                name="last_n",
+                                default_value=LiveKitSessionState.last_n.to_string(),
+                                class_name="w-full px-4 py-2 border border-gray-200 rounded-lg bg-white focus:ring-2 focus:ring-violet-500 focus:border-transparent outline-none transition-all",
+                            ),
+                            rx.el.p(
+                                "Audio quality, room mode and audio sources apply when you open a new room; existing rooms keep theirs.",
+                                class_name="text-xs text-gray-400 mt-1",
+                            ),
+                            class_name="w-full",
                         ),
                         rx.el.button(
                             rx.cond(
-                                LiveKitBridgeState.loading,
+                                LiveKitSessionState.loading,
                                 rx.el.div(
                                     rx.spinner(size="1"),
                                     rx.el.span("Joining..."),
@@ -195,16 +453,21 @@ def lobby_view() -> rx.Component:
                                 "Join Room",
                             ),
                             type="submit",
-                            disabled=LiveKitBridgeState.loading,
+                            disabled=LiveKitSessionState.loading,
                             class_name="w-full bg-violet-600 hover:bg-violet-700 text-white font-bold py-3 rounded-xl transition-all shadow-lg shadow-violet-200 mt-2 disabled:opacity-70",
                         ),
                         class_name="space-y-6",
                     ),
-                    on_submit=LiveKitBridgeState.join_room,
+                    on_submit=LiveKitSessionState.join_room,
+                    # React's onFocus bubbles: focusing any field warms the connection, and
+                    # the mic once the backend knows the join will publish.
+                    on_focus=[LIVEKIT_UI.prewarm_connection(), LIVEKIT_UI.prewarm_microphone()],
+                    on_mouse_enter=LIVEKIT_UI.prewarm_connection(),
                     reset_on_submit=False,
                 ),
                 class_name="w-full max-w-md bg-white p-8 rounded-3xl border border-gray-100 shadow-xl shadow-gray-200/50",
             ),
+            room_directory(),
             rx.el.div(
                 rx.el.a(
                     "Configure Settings",
@@ -219,15 +482,55 @@ def lobby_view() -> rx.Component:
     )
 
 
+def stage_controls(participant: dict) -> rx.Component:
+    """Promote/demote buttons, shown to the stage host on other participants' cards."""
+    identity = participant["identity"]
+    return rx.cond(
+        LiveKitSessionState.is_host & ~participant["is_local"].to(bool),
+        rx.cond(
+            LiveKitSessionState.stage_speakers.contains(identity),
+            rx.el.button(
+                "Move to audience",
+                type="button",
+                on_click=LiveKitSessionState.demote_speaker(identity),
+                class_name="text-xs font-medium text-gray-500 hover:text-red-600 transition-colors shrink-0",
+            ),
+            rx.el.button(
+                "Invite to stage",
+                type="button",
+                on_click=LiveKitSessionState.promote_speaker(identity),
+                class_name="text-xs font-medium text-violet-600 hover:text-violet-800 transition-colors shrink-0",
+            ),
+        ),
+        rx.fragment(),
+    )
+
+
+def participant_role(participant: dict) -> Var[str]:
+    return rx.cond(
+        participant["is_local"],
+        "You",
+        rx.cond(
+            LiveKitSessionState.room_mode == "stage",
+            rx.cond(
+                LiveKitSessionState.stage_speakers.contains(participant["identity"]),
+                "Speaker",
+                "Listener",
+            ),
+            "Participant",
+        ),
+    )
+
+
 def participant_card(participant: dict) -> rx.Component:
     return rx.el.div(
         rx.el.div(
             rx.image(
-                src=f"https://api.dicebear.com/9.x/notionists/svg?seed={participant['identity']}",
+                src=avatar_url(participant["identity"]),
                 class_name="size-12 rounded-full bg-gray-100",
             ),
             rx.cond(
-                participant["is_speaking"],
+                LiveKitRosterState.speaking_identities.contains(participant["identity"]),
                 rx.el.div(
                     class_name="absolute -bottom-1 -right-1 size-4 bg-green-500 border-2 border-white rounded-full animate-pulse"
                 ),
@@ -242,21 +545,57 @@ def participant_card(participant: dict) -> rx.Component:
                     class_name="font-semibold text-gray-900 truncate",
                 ),
                 rx.el.p(
-                    rx.cond(participant["is_local"], "You", "Participant"),
+                    participant_role(participant),
                     class_name="text-xs text-gray-500",
                 ),
                 class_name="flex justify-between items-baseline",
             ),
             rx.el.div(
-                LIVEKIT_UI.volume_bar(
-                    participant["identity"],
-                    width=participant.get("audio_width", "0%"),
-                ),
+                LIVEKIT_UI.volume_bar(participant["identity"]),
                 class_name="h-1 bg-gray-100 rounded-full mt-2 w-full overflow-hidden",
             ),
             class_name="min-w-0 w-full",
         ),
-        class_name="flex items-center gap-3 p-3 bg-white rounded-xl border border-gray-100 shadow-sm",
+        stage_controls(participant),
+        key=participant["identity"],
+        class_name="flex items-center gap-3 p-3 h-[72px] mb-3 shrink-0 bg-white rounded-xl border border-gray-100 shadow-sm",
+    )
+
+
+def participant_list() -> rx.Component:
+    """Speakers pinned on top, everyone else windowed to the client's viewport."""
+    rows_above = LiveKitRosterState.roster_offset
+    rows_below = (
+        LiveKitRosterState.unpinned_count
+        - LiveKitRosterState.roster_offset
+        - LiveKitRosterState.visible_participants.length()
+    )
+    return rx.el.div(
+        rx.el.h3(
+            "Participants (",
+            LiveKitRosterState.unpinned_count
+            + LiveKitRosterState.pinned_participants.length(),
+            ")",
+            class_name="text-sm font-semibold text-gray-500 uppercase tracking-wider mb-4",
+        ),
+        rx.el.div(
+            rx.foreach(LiveKitRosterState.pinned_participants, participant_card),
+            class_name="flex flex-col",
+        ),
+        rx.el.div(
+            rx.el.div(
+                rx.foreach(LiveKitRosterState.visible_participants, participant_card),
+                class_name="flex flex-col",
+                # Spacers keep the scrollbar sized for the whole roster.
+                style={
+                    "padding_top": f"{rows_above * ROSTER_ROW_HEIGHT_PX}px",
+                    "padding_bottom": f"{rows_below * ROSTER_ROW_HEIGHT_PX}px",
+                },
+            ),
+            id="roster-scroll",
+            class_name="flex-1 overflow-auto pr-2",
+        ),
+        class_name="flex flex-col flex-1 min-h-0",
     )
 
 
@@ -268,58 +607,113 @@ def room_view() -> rx.Component:
                     rx.el.div(
                         rx.icon("hash", class_name="h-5 w-5 text-violet-500"),
                         rx.el.h2(
-                            LiveKitBridgeState.room_name,
+                            LiveKitSessionState.room_name,
                             class_name="text-xl font-bold text-gray-900",
                         ),
+                        rx.cond(
+                            LiveKitSessionState.room_mode == "stage",
+                            rx.el.span(
+                                rx.cond(
+                                    LiveKitSessionState.is_host,
+                                    "Stage · Host",
+                                    rx.cond(
+                                        LiveKitConnectionState.can_publish,
+                                        "Stage · Speaker",
+                                        "Stage · Listening",
+                                    ),
+                                ),
+                                class_name="text-xs font-medium text-violet-700 bg-violet-50 px-2 py-0.5 rounded-full",
+                            ),
+                            rx.fragment(),
+                        ),
                         class_name="flex items-center gap-2",
                     ),
                     rx.el.div(
                         rx.el.div(
                             class_name=rx.cond(
-                                LiveKitBridgeState.connection_status == "Connected",
+                                LiveKitConnectionState.connection_status == "Connected",
                                 "size-2 rounded-full bg-green-500",
                                 "size-2 rounded-full bg-yellow-500 animate-pulse",
                             )
                         ),
                         rx.el.span(
-                            LiveKitBridgeState.connection_status,
+                            LiveKitConnectionState.connection_status,
                             class_name="text-sm font-medium text-gray-600",
                         ),
+                        rx.cond(
+                            LiveKitSessionState.is_recording,
+                            rx.el.span(
+                                rx.el.span(class_name="size-2 rounded-full bg-red-500 animate-pulse"),
+                                "REC",
+                                title=LiveKitSessionState.recording_file,
+                                class_name="flex items-center gap-1 text-xs font-semibold text-red-600 bg-red-50 px-2 py-0.5 rounded-full",
+                            ),
+                            rx.fragment(),
+                        ),
+                        rx.cond(
+                            LiveKitConnectionState.active_audio_profile
+                            != LiveKitSessionState.audio_profile,
+                            rx.el.span(
+                                "Reduced audio quality",
+                                title="Network is congested; audio bitrate was lowered automatically.",
+                                class_name="text-xs font-medium text-amber-700 bg-amber-50 px-2 py-0.5 rounded-full",
+                            ),
+                            rx.fragment(),
+                        ),
                         class_name="flex items-center gap-2 bg-white px-3 py-1 rounded-full border border-gray-100",
                     ),
                     class_name="flex items-center justify-between mb-8",
                 ),
                 rx.el.div(
-                    rx.el.div(
-                        rx.el.h3(
-                            "Participants",
-                            class_name="text-sm font-semibold text-gray-500 uppercase tracking-wider mb-4",
-                        ),
-                        rx.el.div(
-                            rx.foreach(LiveKitBridgeState.participants, participant_card),
-                            class_name="flex flex-col gap-3",
-                        ),
-                        class_name="flex-1 overflow-auto pr-2",
-                    ),
+                    participant_list(),
                     class_name="flex flex-col h-[calc(100vh-280px)]",
                 ),
                 rx.el.div(
                     rx.el.div(
-                        rx.el.button(
-                            rx.icon(
-                                rx.cond(LiveKitBridgeState.is_muted, "mic-off", "mic"),
-                                class_name="h-6 w-6",
+                        rx.cond(
+                            LiveKitConnectionState.can_publish,
+                            rx.el.button(
+                                rx.icon(
+                                    rx.cond(LiveKitConnectionState.is_muted, "mic-off", "mic"),
+                                    class_name="h-6 w-6",
+                                ),
+                                on_click=LiveKitConnectionState.toggle_mute,
+                                class_name=rx.cond(
+                                    LiveKitConnectionState.is_muted,
+                                    "p-4 rounded-full bg-red-100 text-red-600 hover:bg-red-200 transition-colors",
+                                    "p-4 rounded-full bg-violet-100 text-violet-600 hover:bg-violet-200 transition-colors",
+                                ),
                             ),
-                            on_click=LiveKitBridgeState.toggle_mute,
-                            class_name=rx.cond(
-                                LiveKitBridgeState.is_muted,
-                                "p-4 rounded-full bg-red-100 text-red-600 hover:bg-red-200 transition-colors",
-                                "p-4 rounded-full bg-violet-100 text-violet-600 hover:bg-violet-200 transition-colors",
+                            rx.fragment(),
+                        ),
+                        rx.cond(
+                            (LiveKitSessionState.room_mode != "stage") | LiveKitSessionState.is_host,
+                            rx.el.button(
+                                rx.icon(
+                                    rx.cond(LiveKitSessionState.is_recording, "square", "circle"),
+                                    class_name="h-6 w-6",
+                                ),
+                                title=rx.cond(
+                                    LiveKitSessionState.is_recording,
+                                    "Stop recording",
+                                    "Record this room",
+                                ),
+                                on_click=rx.cond(
+                                    LiveKitSessionState.is_recording,
+                                    LiveKitSessionState.stop_recording,
+                                    LiveKitSessionState.start_recording,
+                                ),
+                                class_name=rx.cond(
+                                    LiveKitSessionState.is_recording,
+                                    "p-4 rounded-full bg-red-600 text-white hover:bg-red-700 transition-colors",
+                                    "p-4 rounded-full bg-red-50 text-red-600 hover:bg-red-100 transition-colors",
+                                ),
                             ),
+                            rx.fragment(),
                         ),
                         rx.el.button(
                             rx.icon("phone-off", class_name="h-6 w-6"),
-                            on_click=LiveKitBridgeState.leave_room,
+                            on_click=LiveKitSessionState.leave_room,
                             class_name="p-4 rounded-full bg-gray-900 text-white hover:bg-gray-800 transition-colors",
                         ),
                         class_name="flex items-center justify-center gap-6",
@@ -336,22 +730,56 @@ def room_view() -> rx.Component:
 
 def index() -> rx.Component:
     return rx.el.div(
-        LIVEKIT_UI.bridge_input(),
-        rx.cond(LiveKitBridgeState.is_connected, room_view(), lobby_view()),
+        LIVEKIT_UI.bridge_channel(),
+        rx.cond(LiveKitConnectionState.is_connected, room_view(), lobby_view()),
     )
 
 
+def font_head_components() -> list[rx.Component]:
+    """Inter, self-hosted when vendored; otherwise from Google Fonts."""
+    if not INTER_FONT.is_vendored:
+        return [
+            rx.el.link(rel="preconnect", href="https://fonts.googleapis.com"),
+            rx.el.link(rel="preconnect", href="https://fonts.gstatic.com", cross_origin=""),
+            rx.el.link(
+                href="https://fonts.googleapis.com/css2?family=Inter:wght@400..700&display=swap",
+                rel="stylesheet",
+            ),
+        ]
+    return [
+        rx.el.link(
+            rel="preload",
+            href=INTER_FONT.url,
+            type="font/woff2",
+            cross_origin="anonymous",
+            custom_attrs={"as": "font"},
+        ),
+        rx.el.style(
+            "@font-face { font-family: 'Inter'; font-style: normal; font-weight: 100 900; "
+            f"font-display: swap; src: url('{INTER_FONT.url}') format('woff2'); }}"
+        ),
+    ]
+
+
 app = rx.App(
     theme=rx.theme(appearance="light"),
     head_components=[
-        rx.el.link(rel="preconnect", href="https://fonts.googleapis.com"),
-        rx.el.link(rel="preconnect", href="https://fonts.gstatic.com", cross_origin=""),
-        rx.el.link(
-            href="https://fonts.googleapis.com/css2?family=Inter:wght@400..700&display=swap",
-            rel="stylesheet",
-        ),
+        *font_head_components(),
         *LIVEKIT_UI.head_components(),
     ],
+    api_transformer=backend_api,
+)
+app.register_lifespan_task(config_service.lifespan)
+app.register_lifespan_task(livekit_clients.lifespan)
+app.register_lifespan_task(room_directory_service.room_directory.lifespan)
+app.register_lifespan_task(token_provisioner.lifespan)
+app.add_page(
+    index,
+    route="/",
+    on_load=[
+        LiveKitSessionState.resume_session,
+        LiveKitConnectionState.prepare_connection,
+        LobbyState.load_rooms,
+    ],
 )
-app.add_page(index, route="/")
 app.add_page(settings_page, route="/settings", on_load=SettingsState.on_settings_load)
\ No newline at end of file
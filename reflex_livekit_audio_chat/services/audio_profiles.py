@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+
+class AudioProfileRegistry:
+    """Per-room audio publish profile, chosen by whoever opens the room.
+
+    Everyone in a room publishes with the same profile, so a music room
+    stays full-band for every speaker. Each browser may still step down
+    from it on a poor uplink. Rooms not listed here use the joiner's choice.
+    """
+
+    def __init__(self):
+        self._rooms: dict[str, str] = {}
+
+    def get(self, room: str) -> str | None:
+        return self._rooms.get(room)
+
+    def open(self, room: str, profile: str) -> str:
+        return self._rooms.setdefault(room, profile)
+
+    def close(self, room: str) -> None:
+        self._rooms.pop(room, None)
+
+
+audio_profile_registry = AudioProfileRegistry()
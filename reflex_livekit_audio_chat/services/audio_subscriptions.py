@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+# How many recent speakers each browser decodes; 0 subscribes to everyone.
+LAST_N_CHOICES = {
+    0: "Everyone",
+    3: "3 most recent speakers",
+    5: "5 most recent speakers",
+    8: "8 most recent speakers",
+}
+DEFAULT_LAST_N = 0
+
+
+def parse_last_n(value: object) -> int:
+    try:
+        last_n = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_LAST_N
+    return last_n if last_n in LAST_N_CHOICES else DEFAULT_LAST_N
+
+
+class LastNRegistry:
+    """Per-room Last-N setting, chosen by whoever opens the room.
+
+    Rooms not listed here use ``DEFAULT_LAST_N``.
+    """
+
+    def __init__(self):
+        self._rooms: dict[str, int] = {}
+
+    def get(self, room: str) -> int:
+        return self._rooms.get(room, DEFAULT_LAST_N)
+
+    def open(self, room: str, last_n: int) -> int:
+        return self._rooms.setdefault(room, last_n)
+
+    def close(self, room: str) -> None:
+        self._rooms.pop(room, None)
+
+
+last_n_registry = LastNRegistry()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+GRID = 5
+CELL = 10
+
+
+def render_avatar(identity: str) -> bytes:
+    """Deterministic, mirrored 5x5 identicon for ``identity`` as SVG."""
+    digest = hashlib.sha256(identity.encode()).digest()
+    hue = int.from_bytes(digest[:2], "big") % 360
+    size = GRID * CELL
+
+    cells = []
+    bits = int.from_bytes(digest[2:6], "big")
+    for row in range(GRID):
+        for col in range((GRID + 1) // 2):
+            if not bits & (1 << (row * 3 + col)):
+                continue
+            for x in {col, GRID - 1 - col}:
+                cells.append(f'<rect x="{x * CELL}" y="{row * CELL}" width="{CELL}" height="{CELL}"/>')
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}">'
+        f'<rect width="{size}" height="{size}" fill="hsl({hue},70%,92%)"/>'
+        f'<g fill="hsl({hue},55%,50%)">{"".join(cells)}</g>'
+        "</svg>"
+    ).encode()
+
+
+class AvatarCache:
+    """LRU cache of rendered avatars, bounded by total bytes rather than entries."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._entries: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+
+    def get(self, identity: str) -> tuple[bytes, str]:
+        """Return (svg, strong ETag) for ``identity``, rendering on a miss."""
+        entry = self._entries.get(identity)
+        if entry is not None:
+            self._entries.move_to_end(identity)
+            return entry
+
+        svg = render_avatar(identity)
+        entry = (svg, f'"{hashlib.sha256(svg).hexdigest()[:32]}"')
+        self._entries[identity] = entry
+        self._bytes += len(svg)
+        while self._bytes > self._max_bytes and len(self._entries) > 1:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+        return entry
+
+
+avatar_cache = AvatarCache()
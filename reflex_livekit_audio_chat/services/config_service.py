@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from dotenv import dotenv_values
+
+DEFAULT_ENV_PATH = Path(".env")
+# How often (at most) the .env file is stat'ed for changes.
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+@dataclass(frozen=True)
+class LiveKitCredentials:
+    """LiveKit server credentials used to sign tokens and reach the SFU."""
+
+    api_key: str = ""
+    api_secret: str = ""
+    url: str = ""
+
+    @property
+    def is_complete(self) -> bool:
+        return bool(self.api_key and self.api_secret and self.url)
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable view of the app configuration at one point in time."""
+
+    livekit: LiveKitCredentials
+    admin_passcode: str = ""
+
+
+def _file_signature(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+
+def _read_env(path: Path) -> tuple[tuple[int, int, int] | None, dict[str, str]]:
+    """The env file's signature and the process environment overlaid with its values."""
+    signature = _file_signature(path)
+    values = dict(os.environ)
+    if signature is not None:
+        values.update({k: v for k, v in dotenv_values(path).items() if v is not None})
+    return signature, values
+
+
+def _write_env_atomic(path: Path, updates: dict[str, str]) -> None:
+    existing = dotenv_values(path) if path.exists() else {}
+    # Preserve ADMIN_PASSCODE (and any other existing keys) while updating.
+    merged = {**existing, **updates}
+    lines = [f"{key}={value}" for key, value in merged.items() if value is not None]
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp_name, path.stat().st_mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class ConfigService:
+    """Serves config snapshots from ``.env`` and hot-reloads them on change.
+
+    Values in the file take precedence over the process environment, so a
+    settings change written by one backend worker is picked up by every
+    other worker. While ``lifespan`` runs, the file is polled in a thread
+    and reading the snapshot never touches the disk; without it (scripts,
+    tests) the snapshot is re-checked on read, at most once per interval.
+    """
+
+    def __init__(
+        self,
+        env_path: Path = DEFAULT_ENV_PATH,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        self._env_path = env_path
+        self._poll_interval = poll_interval
+        self._signature: tuple[int, int, int] | None = None
+        self._checked_at = 0.0
+        self._snapshot: ConfigSnapshot | None = None
+        self._listeners: list[Callable[[ConfigSnapshot], None]] = []
+        self._lock = asyncio.Lock()
+        self._watcher: asyncio.Task | None = None
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        if self._snapshot is None:
+            self._apply(*_read_env(self._env_path))
+        elif self._watcher is None and time.monotonic() - self._checked_at >= self._poll_interval:
+            self._checked_at = time.monotonic()
+            if _file_signature(self._env_path) != self._signature:
+                self._apply(*_read_env(self._env_path))
+        return self._snapshot
+
+    def subscribe(self, listener: Callable[[ConfigSnapshot], None]) -> None:
+        """Call ``listener`` with every newly loaded snapshot."""
+        self._listeners.append(listener)
+
+    async def save(self, updates: dict[str, str]) -> ConfigSnapshot:
+        """Merge ``updates`` into the env file atomically, off the event loop."""
+        async with self._lock:
+            await asyncio.to_thread(_write_env_atomic, self._env_path, updates)
+            self._apply(*await asyncio.to_thread(_read_env, self._env_path))
+        return self._snapshot
+
+    async def refresh(self) -> None:
+        """Reload the snapshot if the env file changed, with all file I/O off the event loop."""
+        async with self._lock:
+            signature = await asyncio.to_thread(_file_signature, self._env_path)
+            if self._snapshot is None or signature != self._signature:
+                self._apply(*await asyncio.to_thread(_read_env, self._env_path))
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logging.warning(f"Failed to reload {self._env_path}: {e}")
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self):
+        """App lifespan hook that polls the env file in the background while the backend runs."""
+        self._watcher = asyncio.create_task(self._watch())
+        try:
+            yield
+        finally:
+            task, self._watcher = self._watcher, None
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def _apply(self, signature: tuple[int, int, int] | None, values: dict[str, str]) -> None:
+        self._checked_at = time.monotonic()
+        self._signature = signature
+        self._snapshot = ConfigSnapshot(
+            livekit=LiveKitCredentials(
+                api_key=values.get("LIVEKIT_API_KEY", ""),
+                api_secret=values.get("LIVEKIT_API_SECRET", ""),
+                url=values.get("LIVEKIT_URL", ""),
+            ),
+            admin_passcode=values.get("ADMIN_PASSCODE", "").strip(),
+        )
+        for listener in self._listeners:
+            listener(self._snapshot)
+
+
+config_service = ConfigService()
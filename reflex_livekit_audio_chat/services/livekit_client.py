@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import contextlib
+from typing import TYPE_CHECKING
+
+from reflex_livekit_audio_chat.services.config_service import (
+    LiveKitCredentials,
+    config_service,
+)
+
+if TYPE_CHECKING:
+    import aiohttp
+    from livekit import api
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_TIMEOUT = 10.0
+
+
+class LiveKitClientPool:
+    """One keep-alive HTTP session and ``LiveKitAPI`` client per backend worker.
+
+    The client is rebuilt (reusing the connection pool) whenever the
+    configured credentials change.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self._max_connections = max_connections
+        self._timeout = timeout
+        self._session: aiohttp.ClientSession | None = None
+        self._client: api.LiveKitAPI | None = None
+        self._credentials: LiveKitCredentials | None = None
+
+    def get(self) -> api.LiveKitAPI:
+        """Return the shared client; must be called from the event loop."""
+        credentials = config_service.snapshot.livekit
+        if not credentials.is_complete:
+            raise ValueError("LiveKit credentials not configured.")
+        import aiohttp
+        from livekit import api
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._max_connections, ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+            )
+            self._client = None
+        if self._client is None or credentials != self._credentials:
+            self._client = api.LiveKitAPI(
+                credentials.url,
+                credentials.api_key,
+                credentials.api_secret,
+                session=self._session,
+            )
+            self._credentials = credentials
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+        self._client = None
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self):
+        """App lifespan hook that closes the pool on backend shutdown."""
+        try:
+            yield
+        finally:
+            await self.aclose()
+
+
+livekit_clients = LiveKitClientPool()
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import abc
+import bisect
+import contextlib
+import math
+import time
+from typing import Callable, Iterator
+
+# Seconds; covers sub-millisecond handlers up to slow token mints and saves.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+BYTES_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144)
+ROSTER_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+# Seconds; client-side connection milestones (page load, signaling, ICE, media).
+CONNECT_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], object] = {}
+        REGISTRY.append(self)
+        if not labelnames and self.kind != "gauge":
+            # Unlabelled series are exported (as zero) before the first event.
+            self.labels()
+
+    def labels(self, *values: str):
+        """Child metric for one label combination (cached, so cheap to call per event)."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    @abc.abstractmethod
+    def _new_child(self):
+        """A fresh child for one label combination."""
+
+    @abc.abstractmethod
+    def _samples(self) -> Iterator[str]:
+        """Sample lines in the text exposition format, without the HELP/TYPE header."""
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(f"{line}\n" for line in self._samples())
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonic counter. Unlabelled counters can be incremented directly."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in self._children.items():
+            yield f"{self.name}_total{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf; made cumulative only when rendered.
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @contextlib.contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram; ``observe`` is a bisect and two additions."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), child.counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class GaugeFunc(_Metric):
+    """Gauge whose value is read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], float]):
+        super().__init__(name, documentation)
+        self._read = read
+
+    def _new_child(self):
+        raise TypeError(f"{self.name} is read from a callback and has no labels")
+
+    def _samples(self) -> Iterator[str]:
+        yield f"{self.name} {_format_value(self._read())}"
+
+
+REGISTRY: list[_Metric] = []
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text exposition format."""
+    return "".join(metric.render() for metric in REGISTRY)
+
+
+join_duration = Histogram(
+    "livekit_join_duration_seconds", "End-to-end join_room latency up to the connect call."
+)
+join_failures = Counter(
+    "livekit_join_failures", "join_room failures by reason.", ("reason",)
+)
+token_mint_duration = Histogram(
+    "livekit_token_mint_seconds", "Time to sign a LiveKit access token on a cache miss."
+)
+bulk_tokens = Counter(
+    "livekit_bulk_tokens", "Entries posted to /livekit/tokens, by outcome.", ("outcome",)
+)
+bulk_token_batch_duration = Histogram(
+    "livekit_bulk_token_batch_seconds",
+    "Time to sign and stream one /livekit/tokens batch.",
+    buckets=(*LATENCY_BUCKETS, 5.0, 10.0, 30.0),
+)
+bridge_messages = Counter(
+    "livekit_bridge_messages", "Status messages received from the browser client.", ("path",)
+)
+bridge_payload_bytes = Histogram(
+    "livekit_bridge_payload_bytes",
+    "Size of bridge messages as compact JSON, by entry point.",
+    ("path",),
+    buckets=BYTES_BUCKETS,
+)
+bridge_parse_duration = Histogram(
+    "livekit_bridge_parse_seconds", "Time to parse legacy JSON-string bridge messages."
+)
+bridge_handle_duration = Histogram(
+    "livekit_bridge_handle_seconds",
+    "Time to apply a parsed bridge message to the session state, by entry point.",
+    ("path",),
+)
+roster_size = Histogram(
+    "livekit_roster_size",
+    "Participants in the session's roster after applying a bridge message.",
+    buckets=ROSTER_BUCKETS,
+)
+session_resumes = Counter(
+    "livekit_session_resumes", "Page loads with a saved call, by outcome.", ("outcome",)
+)
+time_to_reconnected = Histogram(
+    "livekit_time_to_reconnected_seconds",
+    "Page load to LiveKit connected when a saved call is resumed.",
+    buckets=CONNECT_BUCKETS,
+)
+time_to_first_audio = Histogram(
+    "livekit_time_to_first_audio_seconds",
+    "Client connect() to the first outgoing audio packet.",
+    buckets=CONNECT_BUCKETS,
+)
+connect_phase = Histogram(
+    "livekit_connect_phase_seconds",
+    "Client connect() to signaling done and to microphone ready; the two overlap.",
+    ("phase",),
+    buckets=CONNECT_BUCKETS,
+)
+leave_room_calls = Counter("livekit_leave_room", "leave_room calls.")
+toggle_mute_calls = Counter("livekit_toggle_mute", "toggle_mute calls.")
+save_config_duration = Histogram(
+    "settings_save_config_seconds", "Time to persist settings from the admin page."
+)
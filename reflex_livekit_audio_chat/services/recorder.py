@@ -0,0 +1,215 @@
+"""Room recording: mix every audio track and stream it to WAV in constant memory.
+
+Audio flows tap -> ``mix`` -> ``PcmRingBuffer`` -> ``WavStreamWriter``.
+Mixing happens on the event loop once per tick, with one vectorized sum
+over all tracks. A flusher drains the fixed-size ring buffer and writes
+to disk in a worker thread, so memory does not grow with meeting length
+and a slow disk never blocks the loop. Started and stopped through
+``recordings.recorder_registry``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import wave
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+import numpy as np
+
+from reflex_livekit_audio_chat.services.config_service import LiveKitCredentials
+from reflex_livekit_audio_chat.services.room_audio import SAMPLE_RATE, RoomAudioTap
+
+if TYPE_CHECKING:
+    from livekit import rtc
+
+DEFAULT_TICK = 0.1
+DEFAULT_RING_SECONDS = 10.0
+DEFAULT_FLUSH_INTERVAL = 1.0
+# WAV sizes are 32-bit; start a new part well before 4 GiB (~6 h of 48 kHz mono).
+DEFAULT_MAX_PART_BYTES = 2**31
+
+
+def mix(block: np.ndarray) -> np.ndarray:
+    """Sum a (tracks, frames, samples) int16 block into one mono int16 stream.
+
+    An empty block (nobody publishing) mixes to silence of the same length.
+    """
+    mixed = block.sum(axis=0, dtype=np.int32).reshape(-1)
+    return np.clip(mixed, -32768, 32767).astype(np.int16)
+
+
+class PcmRingBuffer:
+    """Fixed-capacity FIFO of int16 samples.
+
+    Samples that do not fit (the writer fell behind by more than the
+    capacity) are dropped and counted in ``dropped``.
+    """
+
+    def __init__(self, capacity: int):
+        self._data = np.zeros(capacity, dtype=np.int16)
+        self._start = 0
+        self._size = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def write(self, samples: np.ndarray) -> int:
+        capacity = len(self._data)
+        count = min(len(samples), capacity - self._size)
+        self.dropped += len(samples) - count
+        end = (self._start + self._size) % capacity
+        first = min(count, capacity - end)
+        self._data[end : end + first] = samples[:first]
+        self._data[: count - first] = samples[first:count]
+        self._size += count
+        return count
+
+    def read(self, max_samples: int | None = None) -> np.ndarray:
+        """Remove and return up to ``max_samples`` of the oldest samples (a copy)."""
+        count = self._size if max_samples is None else min(max_samples, self._size)
+        capacity = len(self._data)
+        first = min(count, capacity - self._start)
+        out = np.concatenate(
+            (self._data[self._start : self._start + first], self._data[: count - first])
+        )
+        self._start = (self._start + count) % capacity
+        self._size -= count
+        return out
+
+
+class WavStreamWriter:
+    """Appends 16-bit mono PCM to WAV files as it arrives.
+
+    ``wave`` rewrites the header sizes on every write and each write is
+    flushed, so the file on disk is playable at any moment, even if the
+    process dies. Output rolls over
+    to ``<stem>-part2.wav`` and so on at ``max_part_bytes``. Nothing is
+    created until the first write.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        sample_rate: int = SAMPLE_RATE,
+        max_part_bytes: int = DEFAULT_MAX_PART_BYTES,
+    ):
+        self.path = path
+        self.parts: list[Path] = []
+        self.samples_written = 0
+        self._sample_rate = sample_rate
+        self._max_part_bytes = max_part_bytes
+        self._file: BinaryIO | None = None
+        self._wav: wave.Wave_write | None = None
+        self._part_bytes = 0
+
+    @property
+    def seconds_written(self) -> float:
+        return self.samples_written / self._sample_rate
+
+    def write(self, pcm: np.ndarray) -> None:
+        data = pcm.astype("<i2", copy=False).tobytes()
+        while data:
+            if self._wav is None or self._part_bytes >= self._max_part_bytes:
+                self._open_part()
+            chunk = data[: self._max_part_bytes - self._part_bytes]
+            self._wav.writeframes(chunk)
+            self._part_bytes += len(chunk)
+            data = data[len(chunk) :]
+        self._file.flush()
+        self.samples_written += len(pcm)
+
+    def close(self) -> None:
+        if self._wav is not None:
+            # Wave_write leaves a file object it was handed open.
+            self._wav.close()
+            self._file.close()
+            self._wav = None
+            self._file = None
+
+    def _open_part(self) -> None:
+        self.close()
+        number = len(self.parts) + 1
+        path = self.path if number == 1 else self.path.with_name(
+            f"{self.path.stem}-part{number}{self.path.suffix}"
+        )
+        self._file = open(path, "wb")
+        self._wav = wave.open(self._file, "wb")
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(self._sample_rate)
+        self._part_bytes = 0
+        self.parts.append(path)
+
+
+class RecordingPipeline:
+    """Mix, buffer and write; ``push`` is cheap and never touches the disk."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ring_seconds: float = DEFAULT_RING_SECONDS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_part_bytes: int = DEFAULT_MAX_PART_BYTES,
+    ):
+        self.ring = PcmRingBuffer(int(ring_seconds * SAMPLE_RATE))
+        self.writer = WavStreamWriter(path, max_part_bytes=max_part_bytes)
+        self._flush_interval = flush_interval
+
+    def push(self, block: np.ndarray) -> None:
+        self.ring.write(mix(block))
+
+    async def flush(self) -> None:
+        if len(self.ring):
+            await asyncio.to_thread(self.writer.write, self.ring.read())
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Flush every ``flush_interval`` until ``stop`` is set, then close the file."""
+        try:
+            while not stop.is_set():
+                try:
+                    await asyncio.wait_for(stop.wait(), self._flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                await self.flush()
+        finally:
+            await self.flush()
+            await asyncio.to_thread(self.writer.close)
+
+
+class RoomRecorder(RoomAudioTap):
+    """Hidden participant that records the mixed audio of a room to WAV."""
+
+    def __init__(
+        self,
+        room_name: str,
+        path: Path,
+        *,
+        credentials: LiveKitCredentials | None = None,
+        identity: str = "recorder",
+        tick: float = DEFAULT_TICK,
+        ring_seconds: float = DEFAULT_RING_SECONDS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
+        super().__init__(room_name, credentials=credentials, identity=identity, interval=tick)
+        self.pipeline = RecordingPipeline(
+            path, ring_seconds=ring_seconds, flush_interval=flush_interval
+        )
+
+    async def record(self, stop: asyncio.Event) -> None:
+        flusher = asyncio.create_task(self.pipeline.run(stop))
+        try:
+            await self.run(stop)
+        finally:
+            stop.set()
+            await flusher
+
+    async def on_tick(self, room: rtc.Room, keys: list[str], block: np.ndarray) -> None:
+        self.pipeline.push(block)
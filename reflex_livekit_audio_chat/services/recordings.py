@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+if TYPE_CHECKING:
+    from reflex_livekit_audio_chat.services.recorder import RoomRecorder
+
+RECORDINGS_DIR = Path("recordings")
+# Names ``start`` gives recordings (and their rollover parts); nothing else is listed or served.
+_FILE_NAME = re.compile(r"[A-Za-z0-9._-]+\.wav")
+
+
+@dataclass
+class Recording:
+    path: Path
+    started_at: float
+    stop: asyncio.Event
+    task: asyncio.Task | None = None
+
+
+class RecorderRegistry:
+    """Recordings running on this backend worker, one per room.
+
+    The recorder itself (NumPy, livekit.rtc) is only imported when a
+    recording starts, so the web app does not pay for it at startup.
+    """
+
+    def __init__(self, directory: Path = RECORDINGS_DIR):
+        self._directory = directory
+        self._recordings: dict[str, Recording] = {}
+
+    def get(self, room: str) -> Recording | None:
+        return self._recordings.get(room)
+
+    def start(
+        self,
+        room: str,
+        on_finished: Callable[[str], Awaitable[None]] | None = None,
+    ) -> Recording:
+        """Start recording ``room`` (no-op if already recording); must run on the event loop."""
+        recording = self._recordings.get(room)
+        if recording is not None:
+            return recording
+        from reflex_livekit_audio_chat.services.recorder import RoomRecorder
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+        safe_room = re.sub(r"[^A-Za-z0-9._-]", "_", room)
+        path = self._directory / f"{safe_room}-{time.strftime('%Y%m%d-%H%M%S')}.wav"
+        recording = self._recordings[room] = Recording(
+            path=path, started_at=time.time(), stop=asyncio.Event()
+        )
+        recording.task = asyncio.create_task(
+            self._record(room, recording, RoomRecorder(room, path), on_finished)
+        )
+        return recording
+
+    def files(self) -> list[dict]:
+        """Recordings on disk, newest first, with their length and whether they are still growing."""
+        if not self._directory.is_dir():
+            return []
+        active = [recording.path.stem for recording in self._recordings.values()]
+        listing = []
+        for path in self._directory.iterdir():
+            if not _FILE_NAME.fullmatch(path.name) or not path.is_file():
+                continue
+            stat = path.stat()
+            try:
+                with wave.open(str(path), "rb") as wav:
+                    seconds = wav.getnframes() / wav.getframerate()
+            except (wave.Error, EOFError):
+                continue
+            listing.append(
+                {
+                    "name": path.name,
+                    "bytes": stat.st_size,
+                    "seconds": round(seconds, 3),
+                    "modified_at": stat.st_mtime,
+                    "in_progress": any(
+                        path.stem == stem or path.stem.startswith(f"{stem}-part") for stem in active
+                    ),
+                }
+            )
+        return sorted(listing, key=lambda entry: entry["modified_at"], reverse=True)
+
+    def file(self, name: str) -> Path | None:
+        """The recording called ``name`` in the recordings directory, if there is one."""
+        if not _FILE_NAME.fullmatch(name):
+            return None
+        path = self._directory / name
+        return path if path.is_file() else None
+
+    def stop(self, room: str) -> bool:
+        """Ask the room's recording to finish; it flushes and closes the file itself."""
+        recording = self._recordings.get(room)
+        if recording is None:
+            return False
+        recording.stop.set()
+        return True
+
+    async def _record(
+        self,
+        room: str,
+        recording: Recording,
+        recorder: RoomRecorder,
+        on_finished: Callable[[str], Awaitable[None]] | None,
+    ) -> None:
+        try:
+            await recorder.record(recording.stop)
+        except Exception as e:
+            logging.exception(f"Recording of {room} failed: {e}")
+        finally:
+            if self._recordings.get(room) is recording:
+                del self._recordings[room]
+            writer = recorder.pipeline.writer
+            logging.info(
+                f"Recording of {room} finished: {writer.seconds_written:.0f}s "
+                f"in {', '.join(str(p) for p in writer.parts) or 'no file'}"
+            )
+            if recorder.pipeline.ring.dropped:
+                logging.warning(
+                    f"Recording of {room} dropped {recorder.pipeline.ring.dropped} samples"
+                )
+            if on_finished is not None:
+                await on_finished(room)
+
+
+recorder_registry = RecorderRegistry()
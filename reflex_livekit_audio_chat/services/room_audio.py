@@ -0,0 +1,201 @@
+"""Hidden LiveKit participant that reads a room's audio in fixed-size blocks.
+
+``RoomAudioTap`` subscribes to every remote audio track, decodes each one
+to 48 kHz mono through ``rtc.AudioStream`` and, every ``interval``
+seconds, hands subclasses one int16 block with the frames received since
+the previous tick. It backs the speaker detector and the recorder.
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import logging
+from collections import deque
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from reflex_livekit_audio_chat.services.config_service import (
+    LiveKitCredentials,
+    config_service,
+)
+from reflex_livekit_audio_chat.services.token_service import sign_token
+
+if TYPE_CHECKING:
+    from livekit import rtc
+
+SAMPLE_RATE = 48_000
+FRAME_MS = 10
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000
+
+
+class RoomAudioTap(abc.ABC):
+    """Base class for server-side consumers of a room's audio.
+
+    Subclasses implement ``on_tick``. Blocks are shaped
+    (participants, frames_per_tick, FRAME_SAMPLES) with one row per
+    participant, in ``keys`` order. Tracks are read and buffered per
+    publication, so a participant with two audio tracks (microphone and
+    screen-share audio) gets both summed into its row. A track that
+    delivered fewer frames (muted, or a late reader) is padded with leading
+    silence.
+    """
+
+    def __init__(
+        self,
+        room_name: str,
+        *,
+        credentials: LiveKitCredentials | None = None,
+        identity: str,
+        interval: float,
+        can_publish_data: bool = False,
+    ):
+        self.room_name = room_name
+        self._credentials = credentials
+        self._identity = identity
+        self._interval = interval
+        self._can_publish_data = can_publish_data
+        self.frames_per_tick = max(1, round(interval * 1000 / FRAME_MS))
+        # Keyed by track publication sid; ``_owners`` maps each to its participant.
+        self._buffers: dict[str, deque[np.ndarray]] = {}
+        self._readers: dict[str, asyncio.Task] = {}
+        self._owners: dict[str, str] = {}
+        self._block = np.zeros((0, self.frames_per_tick, FRAME_SAMPLES), dtype=np.int16)
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """Connect, tick until ``stop`` is set (or forever), then disconnect."""
+        from livekit import api, rtc
+
+        credentials = self._credentials or config_service.snapshot.livekit
+        if not credentials.is_complete:
+            raise ValueError("LiveKit credentials not configured.")
+        token = sign_token(
+            credentials,
+            self._identity,
+            api.VideoGrants(
+                room_join=True,
+                room=self.room_name,
+                can_publish=False,
+                can_subscribe=True,
+                can_publish_data=self._can_publish_data,
+                hidden=True,
+            ),
+        )
+
+        room = rtc.Room()
+        room.on("track_subscribed", self._on_track_subscribed)
+        room.on("track_unsubscribed", self._on_track_unsubscribed)
+        await room.connect(credentials.url, token)
+        try:
+            await self._tick_loop(room, stop or asyncio.Event())
+        finally:
+            for task in self._readers.values():
+                task.cancel()
+            self._readers.clear()
+            self._buffers.clear()
+            self._owners.clear()
+            await room.disconnect()
+
+    @abc.abstractmethod
+    async def on_tick(self, room: rtc.Room, keys: list[str], block: np.ndarray) -> None:
+        """Consume one tick's block of frames; ``room`` is connected for replies."""
+
+    def _on_track_subscribed(
+        self,
+        track: rtc.Track,
+        publication: rtc.RemoteTrackPublication,
+        participant: rtc.RemoteParticipant,
+    ) -> None:
+        from livekit import rtc
+
+        if track.kind != rtc.TrackKind.KIND_AUDIO:
+            return
+        sid = publication.sid
+        # A slow tick keeps at most two ticks' worth of frames per track.
+        self._buffers[sid] = deque(maxlen=2 * self.frames_per_tick)
+        self._owners[sid] = participant.identity
+        self._readers[sid] = asyncio.create_task(self._read(track, sid))
+
+    def _on_track_unsubscribed(
+        self,
+        track: rtc.Track,
+        publication: rtc.RemoteTrackPublication,
+        participant: rtc.RemoteParticipant,
+    ) -> None:
+        task = self._readers.pop(publication.sid, None)
+        if task is not None:
+            task.cancel()
+        self._buffers.pop(publication.sid, None)
+        self._owners.pop(publication.sid, None)
+
+    def has_audio(self, identity: str) -> bool:
+        """Whether any audio track of ``identity`` is still being read."""
+        return identity in self._owners.values()
+
+    async def _read(self, track: rtc.Track, sid: str) -> None:
+        from livekit import rtc
+
+        stream = rtc.AudioStream(
+            track, sample_rate=SAMPLE_RATE, num_channels=1, frame_size_ms=FRAME_MS
+        )
+        try:
+            async for event in stream:
+                buffer = self._buffers.get(sid)
+                if buffer is None:
+                    break
+                buffer.append(np.frombuffer(event.frame.data, dtype=np.int16))
+        finally:
+            await stream.aclose()
+
+    def collect(self) -> tuple[list[str], np.ndarray]:
+        """Drain the frames buffered since the last tick into one block per participant.
+
+        The block is reused between ticks; copy it to keep it.
+        """
+        sids = list(self._buffers)
+        if self._block.shape[0] < len(sids):
+            self._block = np.zeros(
+                (max(len(sids), 2 * self._block.shape[0]), self.frames_per_tick, FRAME_SAMPLES),
+                dtype=np.int16,
+            )
+        block = self._block[: len(sids)]
+        block.fill(0)
+        for row, sid in enumerate(sids):
+            buffer = self._buffers[sid]
+            count = min(len(buffer), self.frames_per_tick)
+            for column in range(self.frames_per_tick - count, self.frames_per_tick):
+                frame = buffer.popleft()
+                if frame.shape[0] == FRAME_SAMPLES:
+                    block[row, column] = frame
+
+        owners = [self._owners[sid] for sid in sids]
+        keys = list(dict.fromkeys(owners))
+        if len(keys) == len(sids):
+            return keys, block
+        # Someone publishes more than one audio track: sum them into their row.
+        rows = np.fromiter((keys.index(owner) for owner in owners), dtype=np.intp, count=len(sids))
+        mixed = np.zeros((len(keys), self.frames_per_tick, FRAME_SAMPLES), dtype=np.int32)
+        np.add.at(mixed, rows, block)
+        return keys, np.clip(mixed, -32768, 32767).astype(np.int16)
+
+    async def _tick_loop(self, room: rtc.Room, stop: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while not stop.is_set():
+            next_tick += self._interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # Fell behind (e.g. a long GC pause): skip missed ticks rather than bursting.
+                next_tick = loop.time()
+            else:
+                try:
+                    await asyncio.wait_for(stop.wait(), delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+            keys, block = self.collect()
+            try:
+                await self.on_tick(room, keys, block)
+            except Exception as e:
+                logging.warning(f"{type(self).__name__} tick failed in {self.room_name}: {e}")
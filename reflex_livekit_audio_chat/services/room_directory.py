@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from reflex_livekit_audio_chat.services.config_service import config_service
+from reflex_livekit_audio_chat.services.livekit_client import livekit_clients
+
+# Listings younger than this are served without touching LiveKit.
+DEFAULT_TTL = 10.0
+# Older listings are still served (and refreshed in the background) up to this age.
+DEFAULT_STALE_TTL = 120.0
+# The lifespan refresher runs this often, inside the TTL, so page loads find a fresh listing.
+DEFAULT_REFRESH_INTERVAL = 8.0
+
+
+@dataclass(frozen=True)
+class RoomListing:
+    name: str
+    participants: int
+
+
+async def fetch_active_rooms() -> list[RoomListing]:
+    from livekit import api
+
+    response = await livekit_clients.get().room.list_rooms(api.ListRoomsRequest())
+    return sorted(
+        (RoomListing(room.name, room.num_participants) for room in response.rooms),
+        key=lambda room: (-room.participants, room.name),
+    )
+
+
+class RoomDirectory:
+    """TTL cache of active rooms with stale-while-revalidate refreshes.
+
+    Reads never wait on LiveKit. A listing older than ``ttl`` is served
+    while a background refresh runs. One older than ``stale_ttl``, or none
+    yet, reads as empty. ``lifespan`` keeps the listing fresh on its own.
+    At most one ``ListRooms`` call is in flight per worker, no matter how
+    many lobby pages load at once.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[list[RoomListing]]] = fetch_active_rooms,
+        *,
+        ttl: float = DEFAULT_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        self._fetch = fetch
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._refresh_interval = refresh_interval
+        self._rooms: list[RoomListing] = []
+        self._fetched_at: float | None = None
+        self._failed_at: float | None = None
+        self._refresh: asyncio.Task | None = None
+
+    @property
+    def refreshing(self) -> bool:
+        return self._refresh is not None and not self._refresh.done()
+
+    def rooms(self) -> list[RoomListing]:
+        """The cached listing, starting a refresh if it is due; must run on the event loop."""
+        now = time.monotonic()
+        age = None if self._fetched_at is None else now - self._fetched_at
+        if age is not None and age < self._ttl:
+            return self._rooms
+        # Don't hammer LiveKit while it is failing; serve what we have for one TTL.
+        if self._failed_at is None or now - self._failed_at >= self._ttl:
+            self._start_refresh()
+        return self._servable(age)
+
+    async def wait_refreshed(self) -> list[RoomListing]:
+        """Wait for the refresh in flight, if any, and return the listing it left."""
+        if self._refresh is not None:
+            await asyncio.shield(self._refresh)
+        age = None if self._fetched_at is None else time.monotonic() - self._fetched_at
+        return self._servable(age)
+
+    def _servable(self, age: float | None) -> list[RoomListing]:
+        return self._rooms if age is not None and age < self._stale_ttl else []
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._do_refresh())
+        return self._refresh
+
+    async def _do_refresh(self) -> None:
+        try:
+            self._rooms = await self._fetch()
+            self._fetched_at = time.monotonic()
+            self._failed_at = None
+        except Exception as e:
+            logging.warning(f"Failed to refresh room directory: {e}")
+            self._failed_at = time.monotonic()
+
+    async def _keep_fresh(self) -> None:
+        while True:
+            if config_service.snapshot.livekit.is_complete:
+                await self._start_refresh()
+            await asyncio.sleep(self._refresh_interval)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self):
+        """App lifespan hook that refreshes the listing in the background while the backend runs."""
+        task = asyncio.create_task(self._keep_fresh())
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+
+room_directory = RoomDirectory()
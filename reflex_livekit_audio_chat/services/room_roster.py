@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from livekit import api
+
+
+class RoomRosterIndex:
+    """Authoritative per-room roster built from LiveKit webhook events.
+
+    It also tracks which Reflex sessions (client tokens) are in each room, so
+    roster changes can be fanned out to exactly those sessions.
+    """
+
+    def __init__(self):
+        # room -> identity -> display name
+        self._rooms: dict[str, dict[str, str]] = defaultdict(dict)
+        # room -> client tokens of sessions in that room
+        self._sessions: dict[str, set[str]] = defaultdict(set)
+
+    def roster(self, room: str) -> list[str]:
+        """Identities in ``room``, in join order."""
+        return list(self._rooms.get(room, ()))
+
+    def tracks(self, room: str) -> bool:
+        """Whether webhooks currently report membership for ``room``."""
+        return room in self._rooms
+
+    def sessions(self, room: str) -> set[str]:
+        return set(self._sessions.get(room, ()))
+
+    def register(self, room: str, client_token: str) -> None:
+        self._sessions[room].add(client_token)
+
+    def unregister(self, room: str, client_token: str) -> None:
+        sessions = self._sessions.get(room)
+        if sessions is None:
+            return
+        sessions.discard(client_token)
+        if not sessions:
+            del self._sessions[room]
+
+    def apply_event(self, event: api.WebhookEvent) -> list[dict]:
+        """Update the index from a webhook event and return the roster patches."""
+        room = event.room.name
+        if not room:
+            return []
+
+        if event.event == "participant_joined":
+            identity = event.participant.identity
+            if identity in self._rooms[room]:
+                return []
+            self._rooms[room][identity] = event.participant.name or identity
+            return [{"op": "join", "identity": identity}]
+
+        if event.event == "participant_left":
+            identity = event.participant.identity
+            members = self._rooms.get(room)
+            if members is None or identity not in members:
+                return []
+            del members[identity]
+            if not members:
+                del self._rooms[room]
+            return [{"op": "leave", "identity": identity}]
+
+        if event.event == "room_finished":
+            members = self._rooms.pop(room, {})
+            return [{"op": "leave", "identity": identity} for identity in members]
+
+        return []
+
+
+room_roster = RoomRosterIndex()
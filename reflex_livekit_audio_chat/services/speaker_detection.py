@@ -0,0 +1,260 @@
+"""Server-side audio levels and voice activity for every audio track in a room.
+
+``SpeakerDetector`` is pure NumPy: each ``process`` call takes a block of
+10 ms PCM frames from many tracks at once and computes RMS, peak and a
+speaking decision per track without per-sample Python loops. The
+``RoomSpeakerMonitor`` joins a LiveKit room as a hidden participant (see
+``RoomAudioTap``), feeds the detector and publishes the results as a data
+packet at a fixed cadence. It is run by ``scripts/speaker_detector.py``
+and is not imported by the web app.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from reflex_livekit_audio_chat.services.config_service import LiveKitCredentials
+from reflex_livekit_audio_chat.services.room_audio import (
+    FRAME_SAMPLES,
+    SAMPLE_RATE,
+    RoomAudioTap,
+)
+
+if TYPE_CHECKING:
+    from livekit import rtc
+
+SPEAKER_TOPIC = "speaker-levels"
+DEFAULT_INTERVAL = 0.25
+SILENCE_DB = -100.0
+
+_FULL_SCALE = 32768.0
+# Energy floor for log10, equivalent to SILENCE_DB.
+_MIN_ENERGY = (_FULL_SCALE * 10 ** (SILENCE_DB / 20)) ** 2
+
+
+@dataclass(frozen=True)
+class VadConfig:
+    """Energy-based voice activity parameters, in dBFS and 10 ms frames."""
+
+    # A frame is voiced when it is this far above the track's noise floor...
+    margin_db: float = 9.0
+    # ...and louder than this, so hiss in a dead-quiet room never counts.
+    min_level_db: float = -50.0
+    # Voiced frames in a row before a track starts speaking, and quiet frames before it stops.
+    attack_frames: int = 3
+    hangover_frames: int = 30
+    # The noise floor follows drops at once and creeps up by this much per frame.
+    floor_rise_db: float = 0.02
+    initial_floor_db: float = -60.0
+
+
+@dataclass
+class LevelBatch:
+    """Results of one ``process`` call, one entry per track in ``keys`` order."""
+
+    keys: list[str]
+    rms_db: np.ndarray
+    peak: np.ndarray
+    speaking: np.ndarray
+
+    def as_message(self) -> dict:
+        return {
+            "speaking": [key for key, on in zip(self.keys, self.speaking) if on],
+            "levels": {
+                key: [round(float(rms), 1), round(float(peak), 3)]
+                for key, rms, peak in zip(self.keys, self.rms_db, self.peak)
+            },
+        }
+
+
+class SpeakerDetector:
+    """Vectorized RMS, peak and VAD over many tracks.
+
+    Per-track state (noise floor, voiced run, hangover, speaking) lives in
+    flat arrays indexed by a slot number, so one call updates every track
+    with a handful of array operations per 10 ms frame.
+    """
+
+    def __init__(self, config: VadConfig = VadConfig(), *, capacity: int = 64):
+        self.config = config
+        self._slots: dict[str, int] = {}
+        self._free: list[int] = []
+        self._floor = np.empty(0, dtype=np.float32)
+        self._run = np.empty(0, dtype=np.int32)
+        self._hang = np.empty(0, dtype=np.int32)
+        self._speaking = np.empty(0, dtype=bool)
+        self._grow(capacity)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def keys(self) -> list[str]:
+        return list(self._slots)
+
+    def add_track(self, key: str) -> int:
+        slot = self._slots.get(key)
+        if slot is not None:
+            return slot
+        if not self._free:
+            self._grow(len(self._floor) * 2)
+        slot = self._slots[key] = self._free.pop()
+        self._reset(slot)
+        return slot
+
+    def remove_track(self, key: str) -> None:
+        slot = self._slots.pop(key, None)
+        if slot is not None:
+            self._free.append(slot)
+
+    def process(self, keys: list[str], frames: np.ndarray) -> LevelBatch:
+        """Run ``frames`` (int16, tracks x frames x samples) through the detector.
+
+        Row ``i`` belongs to ``keys[i]``; unknown keys are added. Frames are
+        processed in order, so state carries over between calls.
+        """
+        if frames.ndim != 3 or frames.shape[0] != len(keys):
+            raise ValueError("frames must be shaped (len(keys), frames, samples)")
+        slots = np.fromiter((self.add_track(k) for k in keys), dtype=np.intp, count=len(keys))
+        cfg = self.config
+
+        samples = frames.astype(np.float32)
+        energy = np.einsum("tfs,tfs->tf", samples, samples) / frames.shape[2]
+        level_db = 10 * np.log10(np.maximum(energy, _MIN_ENERGY) / _FULL_SCALE**2)
+        # int16 -32768 has no positive counterpart, so take the extremes separately.
+        peak = np.maximum(frames.max(axis=(1, 2)).astype(np.int32), -frames.min(axis=(1, 2)).astype(np.int32))
+
+        floor = self._floor[slots]
+        run = self._run[slots]
+        hang = self._hang[slots]
+        speaking = self._speaking[slots]
+        for f in range(frames.shape[1]):
+            level = level_db[:, f]
+            floor = np.minimum(level, floor + cfg.floor_rise_db)
+            voiced = (level > floor + cfg.margin_db) & (level > cfg.min_level_db)
+            run = np.where(voiced, run + 1, 0)
+            hang = np.where(voiced, cfg.hangover_frames, np.maximum(hang - 1, 0))
+            speaking = (speaking | (run >= cfg.attack_frames)) & (hang > 0)
+        self._floor[slots] = floor
+        self._run[slots] = run
+        self._hang[slots] = hang
+        self._speaking[slots] = speaking
+
+        mean_energy = energy.mean(axis=1)
+        rms_db = 10 * np.log10(np.maximum(mean_energy, _MIN_ENERGY) / _FULL_SCALE**2)
+        return LevelBatch(
+            keys=list(keys),
+            rms_db=rms_db,
+            peak=np.minimum(peak / _FULL_SCALE, 1.0),
+            speaking=speaking.copy(),
+        )
+
+    def _grow(self, capacity: int) -> None:
+        old = len(self._floor)
+        capacity = max(capacity, 1)
+        self._floor = np.resize(self._floor, capacity)
+        self._run = np.resize(self._run, capacity)
+        self._hang = np.resize(self._hang, capacity)
+        self._speaking = np.resize(self._speaking, capacity)
+        self._free.extend(range(capacity - 1, old - 1, -1))
+
+    def _reset(self, slot: int) -> None:
+        self._floor[slot] = self.config.initial_floor_db
+        self._run[slot] = 0
+        self._hang[slot] = 0
+        self._speaking[slot] = False
+
+
+def synthetic_frames(
+    rng: np.random.Generator,
+    tracks: int,
+    frames: int,
+    *,
+    talk_probability: float = 0.3,
+    noise_db: float = -65.0,
+    speech_db: float = -25.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Noise plus bursts of voiced, syllable-modulated tones, with ground truth.
+
+    Returns ``(pcm, talking)``: int16 frames shaped (tracks, frames, samples)
+    and a (tracks, frames) bool array marking the frames that contain speech.
+    """
+    # Talk spurts of 0.3-2 s, so a random fraction of each track is speech.
+    talking = np.zeros((tracks, frames), dtype=bool)
+    for track in range(tracks):
+        f = 0
+        while f < frames:
+            length = int(rng.integers(30, 200))
+            talking[track, f : f + length] = rng.random() < talk_probability
+            f += length
+
+    t = np.arange(frames * FRAME_SAMPLES, dtype=np.float32) / SAMPLE_RATE
+    pitch = rng.uniform(90, 250, size=(tracks, 1)).astype(np.float32)
+    voice = sum(
+        np.sin(2 * math.pi * harmonic * pitch * t) / harmonic for harmonic in (1, 2, 3, 4)
+    )
+    # ~4 syllables per second.
+    voice *= 0.6 + 0.4 * np.sin(2 * math.pi * 4 * t)
+    gain = np.repeat(talking, FRAME_SAMPLES, axis=1) * (_FULL_SCALE * 10 ** (speech_db / 20))
+    noise = rng.standard_normal((tracks, frames * FRAME_SAMPLES), dtype=np.float32)
+    pcm = voice * gain + noise * (_FULL_SCALE * 10 ** (noise_db / 20))
+    pcm = np.clip(pcm, -_FULL_SCALE, _FULL_SCALE - 1).astype(np.int16)
+    return pcm.reshape(tracks, frames, FRAME_SAMPLES), talking
+
+
+class RoomSpeakerMonitor(RoomAudioTap):
+    """Joins a room as a hidden participant and publishes speaker levels.
+
+    Every ``interval`` seconds the frames received since the last tick are
+    run through one ``SpeakerDetector.process`` call and the result is sent
+    to the room as a lossy data packet on ``topic``:
+
+        {"t": <unix time>, "speaking": [identity, ...],
+         "levels": {identity: [rms_dbfs, peak], ...}}
+    """
+
+    def __init__(
+        self,
+        room_name: str,
+        *,
+        credentials: LiveKitCredentials | None = None,
+        identity: str = "speaker-detector",
+        interval: float = DEFAULT_INTERVAL,
+        config: VadConfig = VadConfig(),
+        topic: str = SPEAKER_TOPIC,
+    ):
+        super().__init__(
+            room_name,
+            credentials=credentials,
+            identity=identity,
+            interval=interval,
+            can_publish_data=True,
+        )
+        self._topic = topic
+        self._detector = SpeakerDetector(config)
+
+    def _on_track_unsubscribed(
+        self,
+        track: rtc.Track,
+        publication: rtc.RemoteTrackPublication,
+        participant: rtc.RemoteParticipant,
+    ) -> None:
+        super()._on_track_unsubscribed(track, publication, participant)
+        if not self.has_audio(participant.identity):
+            self._detector.remove_track(participant.identity)
+
+    async def on_tick(self, room: rtc.Room, keys: list[str], block: np.ndarray) -> None:
+        if not keys:
+            return
+        message = self._detector.process(keys, block).as_message()
+        message["t"] = round(time.time(), 3)
+        await room.local_participant.publish_data(
+            json.dumps(message, separators=(",", ":")),
+            reliable=False,
+            topic=self._topic,
+        )
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from reflex_livekit_audio_chat.services.livekit_client import livekit_clients
+
+if TYPE_CHECKING:
+    from livekit import api
+
+ROOM_MODES = {
+    "open": "Open discussion (everyone speaks)",
+    "stage": "Stage (audience listens)",
+}
+DEFAULT_ROOM_MODE = "open"
+
+
+@dataclass
+class Stage:
+    host: str
+    speakers: set[str] = field(default_factory=set)
+
+    def can_publish(self, identity: str) -> bool:
+        return identity == self.host or identity in self.speakers
+
+
+class StageRegistry:
+    """Rooms running in stage mode, their host and who is allowed to publish.
+
+    Rooms not listed here are open: everyone gets publish grants.
+    """
+
+    def __init__(self):
+        self._stages: dict[str, Stage] = {}
+
+    def get(self, room: str) -> Stage | None:
+        return self._stages.get(room)
+
+    def open(self, room: str, host: str) -> Stage:
+        stage = self._stages.get(room)
+        if stage is None:
+            stage = self._stages[room] = Stage(host=host, speakers={host})
+        return stage
+
+    def close(self, room: str) -> None:
+        self._stages.pop(room, None)
+
+    def can_publish(self, room: str, identity: str) -> bool:
+        stage = self._stages.get(room)
+        return stage is None or stage.can_publish(identity)
+
+    def set_speaker(self, room: str, identity: str, speaker: bool) -> bool:
+        """Grant or revoke the stage; returns whether anything changed."""
+        stage = self._stages.get(room)
+        if stage is None or identity == stage.host:
+            return False
+        if speaker == (identity in stage.speakers):
+            return False
+        if speaker:
+            stage.speakers.add(identity)
+        else:
+            stage.speakers.discard(identity)
+        return True
+
+    def grants(self, room: str, identity: str) -> api.VideoGrants:
+        from livekit import api
+
+        # Listeners may still subscribe and send data (e.g. raise-hand or chat).
+        return api.VideoGrants(
+            room_join=True,
+            room=room,
+            can_publish=self.can_publish(room, identity),
+            can_subscribe=True,
+            can_publish_data=True,
+        )
+
+
+async def update_publish_permission(room: str, identity: str, can_publish: bool) -> None:
+    """Change a connected participant's publish right; the SFU unpublishes on revoke."""
+    from livekit import api
+
+    await livekit_clients.get().room.update_participant(
+        api.UpdateParticipantRequest(
+            room=room,
+            identity=identity,
+            permission=api.ParticipantPermission(
+                can_subscribe=True,
+                can_publish=can_publish,
+                can_publish_data=True,
+            ),
+        )
+    )
+
+
+stage_registry = StageRegistry()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+DEFAULT_MAX_ROOMS = 500
+DEFAULT_MAX_PARTICIPANTS = 200
+# Participants that stop reporting are dropped after this long.
+DEFAULT_IDLE_TTL = 600.0
+# Weight of the newest batch in the rolling averages.
+SMOOTHING = 0.3
+# Upper bound on tracks read from one batch; a browser only reports what it subscribes to.
+MAX_TRACKS_PER_BATCH = 64
+# Upper bound on remote audio tracks a browser can report as available.
+MAX_AUDIO_STREAMS = 10_000
+
+
+def _number(value: object, upper: float) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if not math.isfinite(value) or value < 0:
+        return None
+    return min(float(value), upper)
+
+
+def _blend(current: float | None, sample: float | None) -> float | None:
+    if sample is None:
+        return current
+    if current is None:
+        return sample
+    return current + SMOOTHING * (sample - current)
+
+
+def _mean(values: list[float]) -> float | None:
+    return sum(values) / len(values) if values else None
+
+
+@dataclass
+class ParticipantQuality:
+    """Rolling call-quality averages reported by one participant's browser."""
+
+    rtt_ms: float | None = None
+    jitter_ms: float | None = None
+    send_loss_pct: float | None = None
+    send_kbps: float | None = None
+    recv_loss_pct: float | None = None
+    recv_kbps: float | None = None
+    concealed_pct: float | None = None
+    # Remote audio tracks in the room vs. the ones this browser decodes (Last-N).
+    available_streams: float | None = None
+    decoded_streams: float | None = None
+    batches: int = 0
+    updated_at: float = 0.0
+
+    @property
+    def worst_loss_pct(self) -> float | None:
+        losses = [v for v in (self.send_loss_pct, self.recv_loss_pct) if v is not None]
+        return max(losses) if losses else None
+
+    @property
+    def saved_kbps(self) -> float | None:
+        """Downlink not spent on skipped streams, priced at this browser's per-stream rate."""
+        if self.available_streams is None or not self.decoded_streams or self.recv_kbps is None:
+            return None
+        skipped = max(0.0, self.available_streams - self.decoded_streams)
+        return skipped * self.recv_kbps / self.decoded_streams
+
+    def apply(self, tracks: list[dict], streams: dict, now: float) -> None:
+        send = [t for t in tracks if t.get("dir") == "send"]
+        recv = [t for t in tracks if t.get("dir") == "recv"]
+
+        def collect(group: list[dict], field: str, upper: float) -> list[float]:
+            return [v for t in group if (v := _number(t.get(field), upper)) is not None]
+
+        self.rtt_ms = _blend(self.rtt_ms, _mean(collect(tracks, "rtt_ms", 60_000)))
+        self.jitter_ms = _blend(self.jitter_ms, _mean(collect(tracks, "jitter_ms", 60_000)))
+        self.send_loss_pct = _blend(self.send_loss_pct, _mean(collect(send, "loss_pct", 100)))
+        self.send_kbps = _blend(self.send_kbps, _mean(collect(send, "kbps", 10_000)))
+        self.recv_loss_pct = _blend(self.recv_loss_pct, _mean(collect(recv, "loss_pct", 100)))
+        recv_kbps = collect(recv, "kbps", 10_000)
+        self.recv_kbps = _blend(self.recv_kbps, sum(recv_kbps) if recv_kbps else None)
+        self.concealed_pct = _blend(
+            self.concealed_pct, _mean(collect(recv, "concealed_pct", 100))
+        )
+        available = _number(streams.get("available"), MAX_AUDIO_STREAMS)
+        decoded = _number(streams.get("decoded"), MAX_AUDIO_STREAMS)
+        if available is not None and decoded is not None:
+            self.available_streams = _blend(self.available_streams, available)
+            self.decoded_streams = _blend(self.decoded_streams, min(decoded, available))
+        self.batches += 1
+        self.updated_at = now
+
+
+class TelemetryStore:
+    """Per-room, per-participant call-quality aggregates in bounded memory.
+
+    Browsers upload pre-aggregated batches; each batch is folded into
+    exponentially weighted averages, so memory is constant per participant.
+    Rooms and participants are LRU-bounded and expire when idle.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_rooms: int = DEFAULT_MAX_ROOMS,
+        max_participants: int = DEFAULT_MAX_PARTICIPANTS,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+    ):
+        self._max_rooms = max_rooms
+        self._max_participants = max_participants
+        self._idle_ttl = idle_ttl
+        self._rooms: OrderedDict[str, OrderedDict[str, ParticipantQuality]] = OrderedDict()
+
+    def ingest(self, room: str, identity: str, batch: dict) -> None:
+        tracks = batch.get("tracks")
+        streams = batch.get("audio_streams")
+        if not room or not identity or not isinstance(tracks, list):
+            return
+        tracks = [t for t in tracks[:MAX_TRACKS_PER_BATCH] if isinstance(t, dict)]
+        if not isinstance(streams, dict):
+            streams = {}
+        if not tracks and not streams:
+            return
+
+        now = time.monotonic()
+        participants = self._rooms.get(room)
+        if participants is None:
+            participants = self._rooms[room] = OrderedDict()
+            while len(self._rooms) > self._max_rooms:
+                self._rooms.popitem(last=False)
+        else:
+            self._rooms.move_to_end(room)
+
+        quality = participants.get(identity)
+        if quality is None:
+            quality = participants[identity] = ParticipantQuality()
+            while len(participants) > self._max_participants:
+                participants.popitem(last=False)
+        else:
+            participants.move_to_end(identity)
+        quality.apply(tracks, streams, now)
+
+    def participants(self, room: str) -> list[tuple[str, ParticipantQuality]]:
+        """Participants of ``room``, worst packet loss first."""
+        self._expire()
+        return sorted(
+            self._rooms.get(room, {}).items(),
+            key=lambda item: -(item[1].worst_loss_pct or 0.0),
+        )
+
+    def rooms(self) -> list[dict[str, float | int | str | None]]:
+        """One summary per room, worst packet loss first."""
+        self._expire()
+        summaries = []
+        for room, participants in self._rooms.items():
+            values = list(participants.values())
+
+            def average(field: str) -> float | None:
+                return _mean([v for q in values if (v := getattr(q, field)) is not None])
+
+            losses = [v for q in values if (v := q.worst_loss_pct) is not None]
+            summaries.append(
+                {
+                    "room": room,
+                    "participants": len(values),
+                    "rtt_ms": average("rtt_ms"),
+                    "jitter_ms": average("jitter_ms"),
+                    "loss_pct": _mean(losses),
+                    "worst_loss_pct": max(losses) if losses else None,
+                    "concealed_pct": average("concealed_pct"),
+                    "available_streams": average("available_streams"),
+                    "decoded_streams": average("decoded_streams"),
+                    "saved_kbps": average("saved_kbps"),
+                }
+            )
+        summaries.sort(key=lambda s: -(s["worst_loss_pct"] or 0.0))
+        return summaries
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self._idle_ttl
+        for room in list(self._rooms):
+            participants = self._rooms[room]
+            for identity in [i for i, q in participants.items() if q.updated_at < cutoff]:
+                del participants[identity]
+            if not participants:
+                del self._rooms[room]
+
+
+telemetry_store = TelemetryStore()
@@ -0,0 +1,241 @@
+"""Bulk access tokens for schedulers that assign many people to rooms at once.
+
+Entries are validated up front, then signed in chunks with
+``token_service.sign_token``, the same code ``join_room`` mints with.
+Multi-chunk batches are spread over a process pool, so a batch of
+thousands uses every core and never blocks the event loop. Results come
+back chunk by chunk, in input order, for the HTTP layer to stream.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import datetime
+import logging
+import math
+import os
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from reflex_livekit_audio_chat.services.config_service import (
+    LiveKitCredentials,
+    config_service,
+)
+from reflex_livekit_audio_chat.services.token_service import DEFAULT_TOKEN_TTL, sign_token
+
+if TYPE_CHECKING:
+    from livekit import api
+
+MAX_BATCH = 10_000
+MIN_TTL = datetime.timedelta(minutes=1)
+MAX_TTL = datetime.timedelta(hours=24)
+# Tokens per pool task: large enough that pickling and IPC are noise next to signing.
+DEFAULT_CHUNK_SIZE = 64
+# Grants a provisioned token may carry, with their defaults (the same as join_room's).
+# Admin, recorder and room-creation rights are never handed out in bulk.
+PARTICIPANT_GRANTS = {
+    "can_publish": True,
+    "can_subscribe": True,
+    "can_publish_data": True,
+    "can_update_own_metadata": False,
+    "hidden": False,
+}
+
+
+@dataclass(frozen=True)
+class TokenRequest:
+    """One validated entry of a batch; plain data, so it pickles cheaply to workers."""
+
+    identity: str
+    room: str
+    ttl: datetime.timedelta = DEFAULT_TOKEN_TTL
+    grants: tuple[tuple[str, bool], ...] = ()
+    name: str | None = None
+
+    def video_grants(self) -> api.VideoGrants:
+        from livekit import api
+
+        return api.VideoGrants(
+            room_join=True, room=self.room, **{**PARTICIPANT_GRANTS, **dict(self.grants)}
+        )
+
+
+def parse_entry(entry: Any) -> TokenRequest:
+    """Validate one batch entry ``{identity, room, grants?, ttl?, name?}``; raise ValueError."""
+    if not isinstance(entry, dict):
+        raise ValueError("entry must be an object")
+    identity, room, name = entry.get("identity"), entry.get("room"), entry.get("name")
+    if not isinstance(identity, str) or not identity.strip():
+        raise ValueError("identity is required")
+    if not isinstance(room, str) or not room.strip():
+        raise ValueError("room is required")
+    if name is not None and not isinstance(name, str):
+        raise ValueError("name must be a string")
+
+    grants = entry.get("grants") or {}
+    if not isinstance(grants, dict):
+        raise ValueError("grants must be an object")
+    unknown = sorted(set(grants) - set(PARTICIPANT_GRANTS))
+    if unknown:
+        raise ValueError(f"grants not allowed: {', '.join(unknown)}")
+    if not all(isinstance(value, bool) for value in grants.values()):
+        raise ValueError("grants must be true or false")
+
+    ttl = entry.get("ttl", DEFAULT_TOKEN_TTL.total_seconds())
+    if isinstance(ttl, bool) or not isinstance(ttl, (int, float)):
+        raise ValueError("ttl must be a number of seconds")
+    # Checked before building the timedelta, which overflows on huge or non-finite values.
+    # The range test comes first: it is exact for huge ints, which isfinite() can't convert.
+    if not (MIN_TTL.total_seconds() <= ttl <= MAX_TTL.total_seconds() and math.isfinite(ttl)):
+        raise ValueError(
+            f"ttl must be between {MIN_TTL.total_seconds():.0f} and {MAX_TTL.total_seconds():.0f} seconds"
+        )
+    ttl = datetime.timedelta(seconds=ttl)
+    return TokenRequest(
+        identity=identity.strip(),
+        room=room.strip(),
+        ttl=ttl,
+        grants=tuple(sorted(grants.items())),
+        name=name,
+    )
+
+
+@dataclass(frozen=True)
+class SignedChunk:
+    """Tokens for one chunk of a batch, in order; or why none were signed."""
+
+    requests: list[TokenRequest]
+    tokens: list[str]
+    error: str = ""
+
+
+def sign_chunk(credentials: LiveKitCredentials, requests: list[TokenRequest]) -> list[str]:
+    """Sign a chunk of requests; runs in a pool worker."""
+    return [
+        sign_token(credentials, r.identity, r.video_grants(), r.ttl, r.name) for r in requests
+    ]
+
+
+class TokenProvisioner:
+    """Signs token batches on a process pool that is started on first use.
+
+    A batch that fits in one chunk is signed on the loop's default thread
+    pool instead, as ``TokenService`` does: for a handful of tokens,
+    starting or feeding worker processes costs more than it saves. If a
+    worker dies, the broken pool is replaced and the chunks it held are
+    tried once more on the new one.
+    """
+
+    def __init__(
+        self,
+        credentials: LiveKitCredentials | None = None,
+        *,
+        workers: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        executor: Executor | None = None,
+    ):
+        self._credentials = credentials
+        self._workers = workers or min(os.cpu_count() or 1, 8)
+        self._chunk_size = chunk_size
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    @property
+    def credentials(self) -> LiveKitCredentials:
+        return self._credentials or config_service.snapshot.livekit
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Spawned, not forked: the backend process runs threads and an event loop.
+            self._executor = ProcessPoolExecutor(
+                self._workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _replace_pool(self, broken: Executor | None) -> None:
+        """Drop a pool whose worker died, so the next submit starts a fresh one."""
+        if self._owns_executor and broken is not None and self._executor is broken:
+            logging.warning("Token signing pool broke; starting a new one")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _submit(
+        self, credentials: LiveKitCredentials, chunk: list[TokenRequest], use_pool: bool
+    ) -> tuple[Executor | None, asyncio.Future[list[str]]]:
+        loop = asyncio.get_running_loop()
+        executor = self._pool() if use_pool else None
+        try:
+            return executor, loop.run_in_executor(executor, sign_chunk, credentials, chunk)
+        except BrokenProcessPool:
+            # The pool noticed a dead worker between batches.
+            self._replace_pool(executor)
+            executor = self._pool()
+            return executor, loop.run_in_executor(executor, sign_chunk, credentials, chunk)
+
+    async def _collect(
+        self,
+        credentials: LiveKitCredentials,
+        chunk: list[TokenRequest],
+        executor: Executor | None,
+        future: asyncio.Future[list[str]],
+    ) -> SignedChunk:
+        try:
+            try:
+                return SignedChunk(chunk, await future)
+            except BrokenProcessPool:
+                self._replace_pool(executor)
+                _, retry = self._submit(credentials, chunk, executor is not None)
+                return SignedChunk(chunk, await retry)
+        except Exception as e:
+            logging.exception(f"Failed to sign {len(chunk)} tokens: {e}")
+            return SignedChunk(chunk, [], error=f"signing failed: {type(e).__name__}")
+
+    async def sign(self, requests: list[TokenRequest]) -> AsyncIterator[SignedChunk]:
+        """Yield the tokens for ``requests`` one chunk at a time, in order.
+
+        At most two chunks per worker are in flight, so a slow reader of
+        the stream holds back signing instead of buffering the whole batch.
+        A chunk that can't be signed is yielded with its error, and the
+        rest of the batch carries on.
+        """
+        credentials = self.credentials
+        size = self._chunk_size
+        chunks = [requests[i : i + size] for i in range(0, len(requests), size)]
+        use_pool = len(chunks) > 1
+        window = 2 * self._workers
+        pending: collections.deque[
+            tuple[list[TokenRequest], Executor | None, asyncio.Future[list[str]]]
+        ] = collections.deque()
+        try:
+            for chunk in chunks:
+                pending.append((chunk, *self._submit(credentials, chunk, use_pool)))
+                if len(pending) >= window:
+                    yield await self._collect(credentials, *pending.popleft())
+            while pending:
+                yield await self._collect(credentials, *pending.popleft())
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self):
+        """App lifespan hook that stops the worker processes on backend shutdown."""
+        try:
+            yield
+        finally:
+            self.shutdown()
+
+
+token_provisioner = TokenProvisioner()
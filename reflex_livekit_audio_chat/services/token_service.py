@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import datetime
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING
+
+from reflex_livekit_audio_chat.services import metrics
+from reflex_livekit_audio_chat.services.config_service import (
+    LiveKitCredentials,
+    config_service,
+)
+
+if TYPE_CHECKING:
+    from livekit import api
+    from livekit.api.access_token import Claims
+
+DEFAULT_TOKEN_TTL = datetime.timedelta(hours=6)
+# A cached token is only reused while it still has at least this much lifetime.
+DEFAULT_MIN_REMAINING = datetime.timedelta(hours=1)
+DEFAULT_MAX_ENTRIES = 10_000
+
+_CacheKey = tuple[str, str, tuple, float]
+
+
+@dataclass
+class TokenStats:
+    """Counters for token cache efficiency and signing cost."""
+
+    hits: int = 0
+    misses: int = 0
+    # Misses that waited on a signing already in flight for the same key.
+    coalesced: int = 0
+    evictions: int = 0
+    mint_seconds_total: float = 0.0
+    mint_seconds_max: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def mint_seconds_avg(self) -> float:
+        return self.mint_seconds_total / self.misses if self.misses else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            "mint_seconds_avg": self.mint_seconds_avg,
+            "mint_seconds_max": self.mint_seconds_max,
+        }
+
+
+def sign_token(
+    credentials: LiveKitCredentials,
+    identity: str,
+    grants: api.VideoGrants,
+    ttl: datetime.timedelta = DEFAULT_TOKEN_TTL,
+    name: str | None = None,
+) -> str:
+    """Build and sign a LiveKit access token (CPU bound, safe to run off-loop)."""
+    from livekit import api
+
+    return (
+        api.AccessToken(credentials.api_key, credentials.api_secret)
+        .with_identity(identity)
+        .with_name(name or identity)
+        .with_grants(grants)
+        .with_ttl(ttl)
+        .to_jwt()
+    )
+
+
+def verify_token(credentials: LiveKitCredentials, token: str) -> tuple[Claims, float]:
+    """Check a token's signature and expiry; return its claims and expiry (unix time).
+
+    Raises if the token was not signed with ``credentials`` or has expired.
+    """
+    import jwt
+    from livekit import api
+
+    claims = api.TokenVerifier(credentials.api_key, credentials.api_secret).verify(token)
+    expires_at = jwt.decode(token, options={"verify_signature": False})["exp"]
+    return claims, float(expires_at)
+
+
+def grants_key(grants: api.VideoGrants) -> tuple:
+    """Hashable representation of a grant set, used as part of the cache key."""
+    return tuple(
+        (field, tuple(value) if isinstance(value, list) else value)
+        for field, value in sorted(dataclasses.asdict(grants).items())
+    )
+
+
+class TokenService:
+    """Mints access tokens in an executor and caches the still-valid ones.
+
+    Tokens are cached per (identity, room, grant set, TTL). A cached token
+    is reused until its remaining lifetime drops below ``min_remaining``, or
+    below half its TTL for TTLs shorter than that. Concurrent misses on one
+    key share a single signing call. The cache is bounded and evicts stale
+    entries first, then least recently used.
+    """
+
+    def __init__(
+        self,
+        credentials: LiveKitCredentials | None = None,
+        *,
+        ttl: datetime.timedelta = DEFAULT_TOKEN_TTL,
+        min_remaining: datetime.timedelta = DEFAULT_MIN_REMAINING,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        executor: Executor | None = None,
+    ):
+        self._credentials = credentials
+        self._ttl = ttl
+        self._min_remaining = min_remaining.total_seconds()
+        self._max_entries = max_entries
+        self._executor = executor
+        self._cache: OrderedDict[_CacheKey, tuple[str, float]] = OrderedDict()
+        self._pending: dict[_CacheKey, asyncio.Future[str]] = {}
+        self.stats = TokenStats()
+
+    @property
+    def credentials(self) -> LiveKitCredentials:
+        if self._credentials is None:
+            self._credentials = config_service.snapshot.livekit
+        return self._credentials
+
+    def set_credentials(self, credentials: LiveKitCredentials) -> None:
+        """Swap credentials; tokens signed with the old secret are dropped."""
+        if credentials != self._credentials:
+            self._credentials = credentials
+            self._cache.clear()
+            # Signings in flight finish for their callers but are not cached.
+            self._pending.clear()
+
+    async def get_token(
+        self,
+        identity: str,
+        room: str,
+        grants: api.VideoGrants,
+        *,
+        ttl: datetime.timedelta | None = None,
+    ) -> str:
+        ttl = ttl or self._ttl
+        key = (identity, room, grants_key(grants), ttl.total_seconds())
+        cached = self._cache.get(key)
+        if cached is not None:
+            token, expires_at = cached
+            if expires_at - time.time() >= self._reuse_margin(key):
+                self._cache.move_to_end(key)
+                self.stats.hits += 1
+                return token
+            del self._cache[key]
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+            pending = self._pending[key] = asyncio.ensure_future(
+                self._mint(key, identity, grants, ttl)
+            )
+        # Shielded: one caller going away must not cancel the others' token.
+        return await asyncio.shield(pending)
+
+    async def _mint(
+        self, key: _CacheKey, identity: str, grants: api.VideoGrants, ttl: datetime.timedelta
+    ) -> str:
+        loop = asyncio.get_running_loop()
+        now = time.time()
+        started = time.perf_counter()
+        try:
+            token = await loop.run_in_executor(
+                self._executor,
+                partial(sign_token, self.credentials, identity, grants, ttl),
+            )
+        finally:
+            mine = self._pending.get(key) is asyncio.current_task()
+            if mine:
+                del self._pending[key]
+        elapsed = time.perf_counter() - started
+        metrics.token_mint_duration.observe(elapsed)
+        self.stats.mint_seconds_total += elapsed
+        self.stats.mint_seconds_max = max(self.stats.mint_seconds_max, elapsed)
+
+        # Not cached if the credentials changed while signing.
+        if mine:
+            self._cache[key] = (token, now + ttl.total_seconds())
+            if len(self._cache) > self._max_entries:
+                self._evict(now)
+        return token
+
+    def _reuse_margin(self, key: _CacheKey) -> float:
+        """Lifetime a cached token must have left to be handed out again."""
+        return min(self._min_remaining, key[3] / 2)
+
+    def _evict(self, now: float) -> None:
+        stale = [
+            key
+            for key, (_, expires_at) in self._cache.items()
+            if expires_at - now < self._reuse_margin(key)
+        ]
+        for key in stale:
+            del self._cache[key]
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+            self.stats.evictions += 1
+        self.stats.evictions += len(stale)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+token_service = TokenService()
+config_service.subscribe(lambda snapshot: token_service.set_credentials(snapshot.livekit))
+metrics.GaugeFunc(
+    "livekit_token_cache_hit_ratio",
+    "Share of join_room token lookups served from the cache.",
+    lambda: token_service.stats.hit_rate,
+)
+metrics.GaugeFunc(
+    "livekit_token_cache_entries", "Tokens currently cached.", lambda: len(token_service)
+)
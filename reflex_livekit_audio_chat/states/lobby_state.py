@@ -0,0 +1,31 @@
+import reflex as rx
+
+from reflex_livekit_audio_chat.livekit_bridge import LiveKitSessionState
+from reflex_livekit_audio_chat.services.room_directory import RoomListing, room_directory
+
+
+def _as_rows(rooms: list[RoomListing]) -> list[dict[str, str | int]]:
+    return [{"name": room.name, "participants": room.participants} for room in rooms]
+
+
+class LobbyState(rx.State):
+    rooms: list[dict[str, str | int]] = []
+
+    @rx.event(background=True)
+    async def load_rooms(self):
+        """Show the cached room listing; if a refresh was due, update it when that lands.
+
+        A background task, so a slow ListRooms never holds up this client's
+        other events (e.g. a join clicked meanwhile).
+        """
+        async with self:
+            self.rooms = _as_rows(room_directory.rooms())
+        if room_directory.refreshing:
+            rooms = await room_directory.wait_refreshed()
+            async with self:
+                self.rooms = _as_rows(rooms)
+
+    @rx.event
+    async def select_room(self, room_name: str):
+        session = await self.get_state(LiveKitSessionState)
+        session.room_name = room_name
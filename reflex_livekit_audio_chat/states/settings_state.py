@@ -1,8 +1,8 @@
 import reflex as rx
-import os
-from pathlib import Path
 import logging
-from dotenv import dotenv_values
+
+from reflex_livekit_audio_chat.services import metrics
+from reflex_livekit_audio_chat.services.config_service import config_service
 
 
 class SettingsState(rx.State):
@@ -33,7 +33,7 @@ class SettingsState(rx.State):
         yield
         try:
             provided = (form_data.get("admin_passcode") or "").strip()
-            expected = (os.environ.get("ADMIN_PASSCODE") or "").strip()
+            expected = config_service.snapshot.admin_passcode
 
             if not expected:
                 self.auth_error = "ADMIN_PASSCODE is not set in the environment."
@@ -53,10 +53,11 @@ class SettingsState(rx.State):
 
     @rx.event
     def load_config(self):
-        """Load existing config from environment or .env file."""
-        self.livekit_api_key = os.environ.get("LIVEKIT_API_KEY", "")
-        self.livekit_api_secret = os.environ.get("LIVEKIT_API_SECRET", "")
-        self.livekit_url = os.environ.get("LIVEKIT_URL", "")
+        """Load existing config from the current config snapshot."""
+        credentials = config_service.snapshot.livekit
+        self.livekit_api_key = credentials.api_key
+        self.livekit_api_secret = credentials.api_secret
+        self.livekit_url = credentials.url
 
     @rx.event
     async def save_config(self, form_data: dict[str, str]):
@@ -75,25 +76,15 @@ class SettingsState(rx.State):
                 yield rx.toast("All fields are required", duration=3000)
                 self.is_saving = False
                 return
-            os.environ["LIVEKIT_API_KEY"] = api_key
-            os.environ["LIVEKIT_API_SECRET"] = api_secret
-            os.environ["LIVEKIT_URL"] = url
-            env_path = Path(".env")
-
-            existing = dotenv_values(env_path) if env_path.exists() else {}
-            # Preserve ADMIN_PASSCODE (and any other existing keys) while updating LiveKit keys.
-            merged = dict(existing)
-            merged["LIVEKIT_API_KEY"] = api_key
-            merged["LIVEKIT_API_SECRET"] = api_secret
-            merged["LIVEKIT_URL"] = url
-
-            lines: list[str] = []
-            for key, value in merged.items():
-                if value is None:
-                    continue
-                lines.append(f"{key}={value}")
-            with env_path.open("w") as f:
-                f.write("\n".join(lines) + "\n")
+            # Atomic write in a thread; other workers reload on their next snapshot read.
+            with metrics.save_config_duration.time():
+                await config_service.save(
+                    {
+                        "LIVEKIT_API_KEY": api_key,
+                        "LIVEKIT_API_SECRET": api_secret,
+                        "LIVEKIT_URL": url,
+                    }
+                )
 
             self.livekit_api_key = api_key
             self.livekit_api_secret = api_secret
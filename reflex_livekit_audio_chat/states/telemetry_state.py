@@ -0,0 +1,60 @@
+import reflex as rx
+
+from reflex_livekit_audio_chat.services.telemetry import telemetry_store
+from reflex_livekit_audio_chat.states.settings_state import SettingsState
+
+
+def _fmt(value: float | None, unit: str = "") -> str:
+    return "–" if value is None else f"{value:.1f}{unit}"
+
+
+def _streams(decoded: float | None, available: float | None) -> str:
+    if decoded is None or available is None:
+        return "–"
+    return f"{decoded:.0f} / {available:.0f}"
+
+
+class TelemetryState(rx.State):
+    """Admin view over the call-quality aggregates uploaded by browsers."""
+
+    rooms: list[dict[str, str]] = []
+    selected_room: str = ""
+    participants: list[dict[str, str]] = []
+
+    @rx.event
+    async def load_quality(self):
+        settings = await self.get_state(SettingsState)
+        if not settings.is_admin_authenticated:
+            return
+        self.rooms = [
+            {
+                "room": summary["room"],
+                "participants": str(summary["participants"]),
+                "rtt": _fmt(summary["rtt_ms"], " ms"),
+                "jitter": _fmt(summary["jitter_ms"], " ms"),
+                "loss": _fmt(summary["loss_pct"], "%"),
+                "worst_loss": _fmt(summary["worst_loss_pct"], "%"),
+                "concealed": _fmt(summary["concealed_pct"], "%"),
+                "streams": _streams(summary["decoded_streams"], summary["available_streams"]),
+                "saved": _fmt(summary["saved_kbps"], " kbps"),
+            }
+            for summary in telemetry_store.rooms()
+        ]
+        self.participants = [
+            {
+                "identity": identity,
+                "rtt": _fmt(quality.rtt_ms, " ms"),
+                "jitter": _fmt(quality.jitter_ms, " ms"),
+                "send": f"{_fmt(quality.send_kbps, ' kbps')} / {_fmt(quality.send_loss_pct, '%')}",
+                "recv": f"{_fmt(quality.recv_kbps, ' kbps')} / {_fmt(quality.recv_loss_pct, '%')}",
+                "concealed": _fmt(quality.concealed_pct, "%"),
+                "streams": _streams(quality.decoded_streams, quality.available_streams),
+                "saved": _fmt(quality.saved_kbps, " kbps"),
+            }
+            for identity, quality in telemetry_store.participants(self.selected_room)
+        ]
+
+    @rx.event
+    async def select_quality_room(self, room: str):
+        self.selected_room = "" if room == self.selected_room else room
+        await self.load_quality()
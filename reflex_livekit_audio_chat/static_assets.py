@@ -0,0 +1,60 @@
+"""Pinned third-party browser assets, loaded from their CDN URLs by default.
+
+Running ``scripts/vendor_assets.py`` downloads the pinned versions into
+``assets/vendor`` as content-hashed files plus ``manifest.json``; when those
+are present, they are served from the app instead, with SRI hashes.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+LIVEKIT_CLIENT_VERSION = "2.15.2"
+INTER_FONT_VERSION = "5.0.16"
+
+# name -> (upstream URL, file extension)
+UPSTREAM = {
+    "livekit-client": (
+        f"https://cdn.jsdelivr.net/npm/livekit-client@{LIVEKIT_CLIENT_VERSION}/dist/livekit-client.umd.min.js",
+        "umd.min.js",
+    ),
+    "inter": (
+        f"https://cdn.jsdelivr.net/npm/@fontsource-variable/inter@{INTER_FONT_VERSION}/files/inter-latin-wght-normal.woff2",
+        "woff2",
+    ),
+}
+
+VENDOR_DIR = Path(__file__).resolve().parent.parent / "assets" / "vendor"
+MANIFEST_PATH = VENDOR_DIR / "manifest.json"
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    url: str
+    # Subresource-integrity hash; only known for vendored files.
+    integrity: str = ""
+
+    @property
+    def is_vendored(self) -> bool:
+        return bool(self.integrity)
+
+
+def _load_manifest() -> dict[str, dict[str, str]]:
+    try:
+        return json.loads(MANIFEST_PATH.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def _resolve(name: str, manifest: dict[str, dict[str, str]]) -> StaticAsset:
+    entry = manifest.get(name)
+    if entry and (VENDOR_DIR / entry["file"]).exists():
+        return StaticAsset(url=f"/vendor/{entry['file']}", integrity=entry["integrity"])
+    return StaticAsset(url=UPSTREAM[name][0])
+
+
+_manifest = _load_manifest()
+LIVEKIT_CLIENT = _resolve("livekit-client", _manifest)
+INTER_FONT = _resolve("inter", _manifest)
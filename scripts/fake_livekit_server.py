@@ -0,0 +1,91 @@
+"""Minimal local stand-in for the LiveKit server's Twirp RoomService.
+
+Point LIVEKIT_URL at it (e.g. http://localhost:7880) to exercise the room
+directory and stage promotions without a real LiveKit deployment:
+
+    poetry run python scripts/fake_livekit_server.py --room standup:12 --room design:3
+
+Requests are authenticated with the app's configured API key/secret.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from aiohttp import web
+from livekit import api
+
+from reflex_livekit_audio_chat.services.config_service import config_service
+
+TWIRP_PREFIX = "/twirp/livekit.RoomService"
+
+
+def _authorized(request: web.Request) -> bool:
+    credentials = config_service.snapshot.livekit
+    token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    try:
+        api.TokenVerifier(credentials.api_key, credentials.api_secret).verify(token)
+    except Exception:
+        return False
+    return True
+
+
+def _twirp_error(status: int, code: str, msg: str) -> web.Response:
+    return web.json_response({"code": code, "msg": msg}, status=status)
+
+
+def build_app(rooms: dict[str, int]) -> web.Application:
+    async def list_rooms(request: web.Request) -> web.Response:
+        if not _authorized(request):
+            return _twirp_error(401, "unauthenticated", "invalid token")
+        query = api.ListRoomsRequest.FromString(await request.read())
+        response = api.ListRoomsResponse(
+            rooms=[
+                api.Room(name=name, num_participants=count)
+                for name, count in rooms.items()
+                if not query.names or name in query.names
+            ]
+        )
+        return web.Response(
+            body=response.SerializeToString(), content_type="application/protobuf"
+        )
+
+    async def update_participant(request: web.Request) -> web.Response:
+        if not _authorized(request):
+            return _twirp_error(401, "unauthenticated", "invalid token")
+        update = api.UpdateParticipantRequest.FromString(await request.read())
+        print(
+            f"UpdateParticipant {update.room}/{update.identity}: "
+            f"can_publish={update.permission.can_publish}"
+        )
+        response = api.ParticipantInfo(
+            identity=update.identity, permission=update.permission
+        )
+        return web.Response(
+            body=response.SerializeToString(), content_type="application/protobuf"
+        )
+
+    app = web.Application()
+    app["rooms"] = rooms
+    app.router.add_post(f"{TWIRP_PREFIX}/ListRooms", list_rooms)
+    app.router.add_post(f"{TWIRP_PREFIX}/UpdateParticipant", update_participant)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=7880)
+    parser.add_argument(
+        "--room", action="append", default=[], help="NAME:PARTICIPANTS (repeatable)"
+    )
+    args = parser.parse_args()
+
+    rooms = {}
+    for spec in args.room:
+        name, _, count = spec.partition(":")
+        rooms[name] = int(count or 0)
+    web.run_app(build_app(rooms), port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Profile backend import time and enforce a startup budget.
+
+Imports the app module in a fresh interpreter under ``-X importtime`` and
+prints the slowest top-level packages. The budget applies to the app's own
+share: the time to import the app once Reflex's own startup modules are
+loaded. Reflex alone takes about a second and varies a lot between
+machines, so a budget on the total would mostly measure the machine. Exits
+non-zero when the app's share (best of ``--runs``) exceeds the budget, or
+when a module that should load lazily is imported at startup.
+``tests/test_import_time.py`` runs this check:
+
+    poetry run python scripts/import_profile.py
+    poetry run python scripts/import_profile.py --budget-ms 300 --top 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+APP_MODULE = "reflex_livekit_audio_chat.reflex_livekit_audio_chat"
+DEFAULT_BUDGET_MS = 300.0
+# Imported before the timed app import; every Reflex app pays for these.
+FRAMEWORK_MODULES = ("reflex.app", "reflex.state", "reflex.components.el", "reflex.components.radix")
+# Heavy modules that must only be imported on first use (token minting,
+# webhooks and the room service).
+LAZY_MODULES = ("livekit.api", "livekit.rtc", "livekit.agents", "numpy")
+
+_PROBE = f"""
+import importlib
+import sys
+import time
+for name in {FRAMEWORK_MODULES!r}:
+    importlib.import_module(name)
+started = time.perf_counter()
+import {APP_MODULE}
+print(f"app_ms:{{(time.perf_counter() - started) * 1000}}")
+print("eager:" + ",".join(name for name in {LAZY_MODULES!r} if name in sys.modules))
+"""
+
+
+def profile_once() -> tuple[list[tuple[str, int, int]], float, list[str]]:
+    """Return ([(module, self_us, cumulative_us)], app share in ms, eagerly imported lazy modules)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    app_ms = next(
+        float(line[len("app_ms:") :])
+        for line in result.stdout.splitlines()
+        if line.startswith("app_ms:")
+    )
+    eager = [
+        name
+        for line in result.stdout.splitlines()
+        if line.startswith("eager:")
+        for name in line[len("eager:") :].split(",")
+        if name
+    ]
+    return rows, app_ms, eager
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    best_total = None
+    best_rows: list[tuple[str, int, int]] = []
+    best_app_ms = float("inf")
+    eager: list[str] = []
+    for _ in range(args.runs):
+        rows, app_ms, eager = profile_once()
+        total = sum(self_us for _, self_us, _ in rows)
+        if best_total is None or total < best_total:
+            best_total, best_rows = total, rows
+        best_app_ms = min(best_app_ms, app_ms)
+
+    by_package: dict[str, int] = defaultdict(int)
+    for name, self_us, _ in best_rows:
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"{'package':<32} {'self ms':>9}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{package:<32} {self_us / 1000:>9.1f}")
+
+    print(f"\ntotal import time: {best_total / 1000:.1f} ms (best of {args.runs})")
+    print(f"app share: {best_app_ms:.1f} ms (budget {args.budget_ms:.0f} ms, best of {args.runs})")
+
+    failed = False
+    if best_app_ms > args.budget_ms:
+        print(f"FAIL: app import time exceeds budget by {best_app_ms - args.budget_ms:.1f} ms")
+        failed = True
+    if eager:
+        print(f"FAIL: imported at startup but expected to load lazily: {', '.join(eager)}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Publish server-side speaker levels for a LiveKit room.
+
+Joins the room as a hidden participant, runs voice activity detection over
+every remote audio track and publishes the levels as lossy data packets on
+the ``speaker-levels`` topic every ``--interval`` seconds:
+
+    poetry run python scripts/speaker_detector.py --room standup
+
+Credentials default to the app's own config (.env / environment). With
+``--synthetic N`` no LiveKit server is needed: N generated tracks go
+through the same detector and each message is printed instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import numpy as np
+
+from reflex_livekit_audio_chat.services.speaker_detection import (
+    DEFAULT_INTERVAL,
+    FRAME_MS,
+    SPEAKER_TOPIC,
+    RoomSpeakerMonitor,
+    SpeakerDetector,
+    synthetic_frames,
+)
+
+
+async def run_synthetic(tracks: int, interval: float, seconds: float) -> None:
+    frames_per_tick = max(1, round(interval * 1000 / FRAME_MS))
+    pcm, _ = synthetic_frames(np.random.default_rng(0), tracks, int(seconds * 1000 / FRAME_MS))
+    detector = SpeakerDetector()
+    keys = [f"synthetic-{i}" for i in range(tracks)]
+    for start in range(0, pcm.shape[1], frames_per_tick):
+        message = detector.process(keys, pcm[:, start : start + frames_per_tick]).as_message()
+        message["t"] = round(time.time(), 3)
+        print(json.dumps(message, separators=(",", ":")))
+        await asyncio.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--room", help="room to join")
+    parser.add_argument("--identity", default="speaker-detector")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="seconds")
+    parser.add_argument("--topic", default=SPEAKER_TOPIC)
+    parser.add_argument("--synthetic", type=int, metavar="N", help="use N generated tracks")
+    parser.add_argument(
+        "--seconds", type=float, default=10.0, help="length of the synthetic run"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.synthetic:
+        asyncio.run(run_synthetic(args.synthetic, args.interval, args.seconds))
+        return
+    if not args.room:
+        parser.error("--room is required unless --synthetic is given")
+    monitor = RoomSpeakerMonitor(
+        args.room, identity=args.identity, interval=args.interval, topic=args.topic
+    )
+    try:
+        asyncio.run(monitor.run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Download the pinned livekit-client bundle and Inter font into assets/vendor.
+
+Each file is stored under a content-hashed name and recorded, with its SRI
+hash, in assets/vendor/manifest.json, which the app picks up on next start:
+
+    poetry run python scripts/vendor_assets.py
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import urllib.request
+
+from reflex_livekit_audio_chat.static_assets import MANIFEST_PATH, UPSTREAM, VENDOR_DIR
+
+
+def main() -> None:
+    VENDOR_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for name, (url, extension) in UPSTREAM.items():
+        with urllib.request.urlopen(url) as response:
+            content = response.read()
+        digest = hashlib.sha384(content).digest()
+        filename = f"{name}-{hashlib.sha256(content).hexdigest()[:12]}.{extension}"
+        for stale in VENDOR_DIR.glob(f"{name}-*.{extension}"):
+            stale.unlink()
+        (VENDOR_DIR / filename).write_bytes(content)
+        manifest[name] = {
+            "file": filename,
+            "source": url,
+            "integrity": f"sha384-{base64.b64encode(digest).decode()}",
+        }
+        print(f"{name}: {filename} ({len(content)} bytes)")
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
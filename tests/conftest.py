@@ -0,0 +1,83 @@
+"""Shared fixtures: fake LiveKit credentials and a scratch working directory.
+
+The config service reads ``.env`` from the working directory, so every
+test runs in its own temporary directory with the credentials below and
+never sees a developer's real ``.env``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from typing import Any, NamedTuple
+
+import pytest
+import reflex as rx
+from reflex.istate.data import RouterData
+
+from reflex_livekit_audio_chat.livekit_bridge import (
+    LiveKitConnectionState,
+    LiveKitRosterState,
+    LiveKitSessionState,
+)
+
+FAKE_ENV = {
+    "LIVEKIT_API_KEY": "test-key",
+    "LIVEKIT_API_SECRET": "test-secret-test-secret-test-secret",
+    "LIVEKIT_URL": "ws://localhost:7880",
+    "ADMIN_PASSCODE": "test-passcode",
+}
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for key, value in FAKE_ENV.items():
+        monkeypatch.setenv(key, value)
+    from reflex_livekit_audio_chat.services.config_service import config_service
+
+    # Drop the cached snapshot so the next read picks up this test's environment.
+    monkeypatch.setattr(config_service, "_snapshot", None)
+    return tmp_path
+
+
+class Bridge(NamedTuple):
+    root: rx.State
+    session: LiveKitSessionState
+    connection: LiveKitConnectionState
+    roster: LiveKitRosterState
+
+
+@pytest.fixture
+def bridge():
+    """Build an in-memory state tree for a browser session with the given client token."""
+
+    def make(client_token: str = "tab-1") -> Bridge:
+        root = rx.State(_reflex_internal_init=True)
+        root.router = RouterData.from_router_data(
+            {"token": client_token, "sid": "sid", "headers": {}, "pathname": "/"}
+        )
+        return Bridge(
+            root,
+            *(
+                root.get_substate(cls.get_full_name().split(".")[1:])
+                for cls in (LiveKitSessionState, LiveKitConnectionState, LiveKitRosterState)
+            ),
+        )
+
+    return make
+
+
+def drive(result: Any) -> list:
+    """Run an event handler's return value (coroutine or generator) to completion."""
+
+    async def run() -> list:
+        if inspect.isasyncgen(result):
+            return [event async for event in result]
+        if inspect.isgenerator(result):
+            return list(result)
+        if inspect.isawaitable(result):
+            return [await result]
+        return [result]
+
+    return asyncio.run(run())
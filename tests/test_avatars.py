@@ -0,0 +1,59 @@
+import pytest
+from starlette.testclient import TestClient
+
+from reflex_livekit_audio_chat.api_routes import backend_api
+from reflex_livekit_audio_chat.services.avatars import avatar_cache
+
+
+@pytest.fixture
+def get():
+    client = TestClient(backend_api)
+
+    def fetch(identity: str, if_none_match: str | None = None):
+        headers = {} if if_none_match is None else {"If-None-Match": if_none_match}
+        return client.get(f"/avatars/{identity}.svg", headers=headers)
+
+    return fetch
+
+
+def test_avatar_is_served_with_a_strong_etag(get):
+    response = get("alice")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/svg+xml"
+    assert response.headers["etag"] == avatar_cache.get("alice")[1]
+    assert "immutable" in response.headers["cache-control"]
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        "{etag}",
+        "W/{etag}",
+        '"stale", {etag}',
+        '"stale",W/{etag} , "older"',
+        "*",
+    ],
+)
+def test_matching_if_none_match_is_not_modified(get, header):
+    etag = avatar_cache.get("alice")[1]
+    response = get("alice", header.format(etag=etag))
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        '"stale", "older"',
+        # The ETag of another identity's avatar.
+        "{other}",
+        'W/"stale"',
+        "",
+    ],
+)
+def test_mismatched_if_none_match_sends_the_avatar(get, header):
+    other = avatar_cache.get("bob")[1]
+    response = get("alice", header.format(other=other))
+    assert response.status_code == 200
+    assert response.content == avatar_cache.get("alice")[0]
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import stat
+
+import pytest
+
+from conftest import FAKE_ENV
+from reflex_livekit_audio_chat.services import config_service as config_module
+from reflex_livekit_audio_chat.services.config_service import ConfigService, ConfigSnapshot
+
+
+def write_env(path, **values) -> None:
+    """Rewrite ``path`` and move its mtime forward, as a save from another worker would."""
+    path.write_text("".join(f"{key}={value}\n" for key, value in values.items()))
+    mtime = path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+
+
+def leftovers(path) -> list[str]:
+    return sorted(p.name for p in path.parent.glob(f".{path.name}.*"))
+
+
+def test_save_replaces_the_file_through_a_temp_file(tmp_path, monkeypatch):
+    env = tmp_path / ".env"
+    env.write_text("ADMIN_PASSCODE=kept\nLIVEKIT_URL=ws://old\n")
+    env.chmod(0o600)
+    replaced = []
+    real_replace = os.replace
+
+    def spy(src, dst):
+        replaced.append((src, dst))
+        assert env.read_text().endswith("LIVEKIT_URL=ws://old\n")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(config_module.os, "replace", spy)
+    service = ConfigService(env)
+
+    snapshot = asyncio.run(service.save({"LIVEKIT_URL": "ws://new"}))
+
+    [(src, dst)] = replaced
+    assert dst == env
+    assert os.path.dirname(src) == str(tmp_path)
+    assert os.path.basename(src).startswith(f".{env.name}.")
+    assert env.read_text() == "ADMIN_PASSCODE=kept\nLIVEKIT_URL=ws://new\n"
+    assert stat.S_IMODE(env.stat().st_mode) == 0o600
+    assert leftovers(env) == []
+    assert snapshot.livekit.url == "ws://new"
+    assert snapshot.admin_passcode == "kept"
+
+
+def test_failed_save_keeps_the_old_file(tmp_path, monkeypatch):
+    env = tmp_path / ".env"
+    env.write_text("LIVEKIT_URL=ws://old\n")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(config_module.os, "replace", fail)
+    service = ConfigService(env)
+
+    with pytest.raises(OSError):
+        asyncio.run(service.save({"LIVEKIT_URL": "ws://new"}))
+    assert env.read_text() == "LIVEKIT_URL=ws://old\n"
+    assert leftovers(env) == []
+    assert service.snapshot.livekit.url == "ws://old"
+
+
+def test_lifespan_reloads_a_changed_file_and_notifies_once(tmp_path):
+    env = tmp_path / ".env"
+    write_env(env, LIVEKIT_URL="ws://old")
+    service = ConfigService(env, poll_interval=0.01)
+    seen: list[ConfigSnapshot] = []
+    service.subscribe(seen.append)
+    assert service.snapshot.livekit.url == "ws://old"
+    assert len(seen) == 1
+
+    async def scenario():
+        async with service.lifespan():
+            write_env(env, LIVEKIT_URL="ws://new", ADMIN_PASSCODE="rotated")
+            for _ in range(200):
+                if len(seen) > 1:
+                    break
+                await asyncio.sleep(0.01)
+            # Further polls of the unchanged file load nothing.
+            await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+
+    assert len(seen) == 2
+    assert seen[1].livekit.url == "ws://new"
+    assert seen[1].livekit.api_key == FAKE_ENV["LIVEKIT_API_KEY"]
+    assert seen[1].admin_passcode == "rotated"
+    assert service.snapshot is seen[1]
+
+
+def test_snapshot_read_picks_up_a_change_without_lifespan(tmp_path):
+    env = tmp_path / ".env"
+    service = ConfigService(env, poll_interval=0.0)
+    seen: list[ConfigSnapshot] = []
+    service.subscribe(seen.append)
+    assert service.snapshot.livekit.url == FAKE_ENV["LIVEKIT_URL"]
+
+    write_env(env, LIVEKIT_URL="ws://new")
+    assert service.snapshot.livekit.url == "ws://new"
+    assert service.snapshot is seen[-1]
+    assert len(seen) == 2
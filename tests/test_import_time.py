@@ -0,0 +1,12 @@
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "import_profile.py"
+
+
+def test_app_import_stays_within_budget_and_lazy():
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT), "--runs", "3"], capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,39 @@
+from reflex_livekit_audio_chat.livekit_bridge import LiveKitConnectionState
+from reflex_livekit_audio_chat.services.stage import stage_registry
+
+
+def prewarm(tab, **form) -> str | None:
+    event = LiveKitConnectionState.prewarm_microphone.fn(tab.connection, form)
+    return None if event is None else str(event)
+
+
+def test_mic_is_warmed_for_an_open_room(bridge):
+    script = prewarm(bridge(), username="alice", room_name="prewarm-open", audio_profile="music")
+    assert "warmMicrophone('music')" in script
+
+
+def test_unknown_profile_falls_back_to_the_default(bridge):
+    script = prewarm(bridge(), username="alice", room_name="prewarm-open", audio_profile="');alert(1);//")
+    assert "warmMicrophone('speech')" in script
+
+
+def test_nothing_happens_until_room_and_name_are_filled_in(bridge):
+    assert prewarm(bridge(), username="alice", room_name=" ") is None
+    assert prewarm(bridge(), room_name="prewarm-open") is None
+
+
+def test_stage_listeners_never_open_the_mic(bridge):
+    stage_registry.open("prewarm-stage", host="alice")
+    try:
+        assert "dropMicrophone()" in prewarm(bridge(), username="bob", room_name="prewarm-stage")
+        assert "warmMicrophone(" in prewarm(bridge(), username="alice", room_name="prewarm-stage")
+        stage_registry.set_speaker("prewarm-stage", "bob", True)
+        assert "warmMicrophone(" in prewarm(bridge(), username="bob", room_name="prewarm-stage")
+    finally:
+        stage_registry.close("prewarm-stage")
+
+
+def test_no_prewarm_once_connected(bridge):
+    tab = bridge()
+    tab.connection.is_connected = True
+    assert prewarm(tab, username="alice", room_name="prewarm-open") is None
@@ -0,0 +1,118 @@
+import pytest
+
+from conftest import drive
+from reflex_livekit_audio_chat.livekit_bridge import LiveKitRosterState
+from reflex_livekit_audio_chat.services import metrics
+
+
+def count(histogram: metrics.Histogram, *labels: str) -> int:
+    return sum(histogram.labels(*labels).counts)
+
+
+@pytest.fixture
+def registered():
+    """Register throwaway metrics for one test and drop them afterwards."""
+    created = []
+
+    def make(cls, *args, **kwargs):
+        metric = cls(*args, **kwargs)
+        created.append(metric)
+        return metric
+
+    yield make
+    for metric in created:
+        metrics.REGISTRY.remove(metric)
+
+
+def sample_lines(metric) -> list[str]:
+    return [line for line in metric.render().splitlines() if not line.startswith("#")]
+
+
+def test_histogram_exposes_cumulative_buckets_sum_and_count(registered):
+    histogram = registered(
+        metrics.Histogram, "test_histogram", "Buckets.", ("path",), buckets=(1, 0.5)
+    )
+    for value in (0.25, 0.5, 0.75, 3):
+        histogram.labels("channel").observe(value)
+
+    assert histogram.render().splitlines()[:2] == [
+        "# HELP test_histogram Buckets.",
+        "# TYPE test_histogram histogram",
+    ]
+    assert sample_lines(histogram) == [
+        'test_histogram_bucket{path="channel",le="0.5"} 2',
+        'test_histogram_bucket{path="channel",le="1"} 3',
+        'test_histogram_bucket{path="channel",le="+Inf"} 4',
+        'test_histogram_sum{path="channel"} 4.5',
+        'test_histogram_count{path="channel"} 4',
+    ]
+
+
+def test_counter_samples_carry_the_total_suffix(registered):
+    counter = registered(metrics.Counter, "test_counter", "Events.")
+    counter.inc()
+    counter.inc(2)
+
+    assert "# TYPE test_counter counter" in counter.render()
+    assert sample_lines(counter) == ["test_counter_total 3"]
+
+
+def test_label_values_are_escaped(registered):
+    counter = registered(metrics.Counter, "test_escaped", "Escaping.", ("reason",))
+    counter.labels('say "hi"').inc()
+    counter.labels("C:\\rooms").inc()
+    counter.labels("two\nlines").inc()
+
+    assert sample_lines(counter) == [
+        'test_escaped_total{reason="say \\"hi\\""} 1',
+        'test_escaped_total{reason="C:\\\\rooms"} 1',
+        'test_escaped_total{reason="two\\nlines"} 1',
+    ]
+
+
+def test_gauge_funcs_have_no_labels(registered):
+    gauge = registered(metrics.GaugeFunc, "test_gauge_no_labels", "Read at scrape time.", lambda: 3)
+    assert sample_lines(gauge) == ["test_gauge_no_labels 3"]
+    with pytest.raises(TypeError):
+        gauge.labels()
+
+
+def test_bridge_channel_messages_record_size_and_handling_time(bridge):
+    roster = bridge().roster
+    before = (
+        count(metrics.bridge_payload_bytes, "channel"),
+        count(metrics.bridge_handle_duration, "channel"),
+        count(metrics.roster_size),
+    )
+    # The same roster sync and speaker patches benchmarks/ws_load.py sends.
+    sync = {
+        "status": "Connected",
+        "roster": [
+            {"identity": "alice", "is_local": True},
+            {"identity": "bob", "is_local": False},
+        ],
+        "speaking": [],
+    }
+    patches = {
+        "patches": [
+            {"op": "speaking", "identity": "bob", "is_speaking": True},
+            {"op": "join", "identity": "carol", "is_local": False},
+        ]
+    }
+
+    drive(LiveKitRosterState.handle_bridge_event.fn(roster, sync))
+    drive(LiveKitRosterState.handle_bridge_event.fn(roster, patches))
+
+    assert roster.speaking_identities == ["bob"]
+    assert list(roster._roster_index) == ["alice", "bob", "carol"]
+    assert count(metrics.bridge_payload_bytes, "channel") == before[0] + 2
+    assert count(metrics.bridge_handle_duration, "channel") == before[1] + 2
+    assert count(metrics.roster_size) == before[2] + 2
+    assert 'livekit_bridge_payload_bytes_count{path="channel"}' in metrics.render()
+
+
+def test_legacy_messages_are_labelled_separately(bridge):
+    before = count(metrics.bridge_payload_bytes, "legacy")
+    drive(LiveKitRosterState.handle_js_message.fn(bridge().roster, '{"status": "Connected"}'))
+    assert count(metrics.bridge_payload_bytes, "legacy") == before + 1
+    assert count(metrics.bridge_handle_duration, "legacy") >= 1
@@ -0,0 +1,251 @@
+import asyncio
+import tracemalloc
+import wave
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from livekit import rtc
+from starlette.testclient import TestClient
+
+from conftest import FAKE_ENV
+from reflex_livekit_audio_chat.api_routes import backend_api
+from reflex_livekit_audio_chat.services.recorder import (
+    PcmRingBuffer,
+    RecordingPipeline,
+    RoomRecorder,
+    WavStreamWriter,
+    mix,
+)
+from reflex_livekit_audio_chat.services.recordings import RECORDINGS_DIR, recorder_registry
+from reflex_livekit_audio_chat.services.room_audio import FRAME_SAMPLES, SAMPLE_RATE
+from reflex_livekit_audio_chat.services.speaker_detection import (
+    RoomSpeakerMonitor,
+    synthetic_frames,
+)
+
+ADMIN = {"Authorization": f"Bearer {FAKE_ENV['ADMIN_PASSCODE']}"}
+
+
+def wav_frames(path) -> np.ndarray:
+    with wave.open(str(path), "rb") as wav:
+        assert (wav.getnchannels(), wav.getsampwidth(), wav.getframerate()) == (1, 2, SAMPLE_RATE)
+        return np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+
+
+def test_ring_buffer_wraps_around_in_order():
+    ring = PcmRingBuffer(8)
+    ring.write(np.arange(6, dtype=np.int16))
+    assert ring.read(4).tolist() == [0, 1, 2, 3]
+
+    # Starts at slot 6 and wraps to the front of the array.
+    assert ring.write(np.arange(6, 11, dtype=np.int16)) == 5
+    assert len(ring) == 7
+    assert ring.read().tolist() == [4, 5, 6, 7, 8, 9, 10]
+    assert len(ring) == 0 and ring.dropped == 0
+
+
+def test_ring_buffer_drops_what_does_not_fit():
+    ring = PcmRingBuffer(4)
+    assert ring.write(np.arange(3, dtype=np.int16)) == 3
+    assert ring.write(np.arange(3, 6, dtype=np.int16)) == 1
+    assert ring.dropped == 2
+    assert ring.read().tolist() == [0, 1, 2, 3]
+
+
+def test_mix_sums_tracks_with_clipping_and_silence_for_no_tracks():
+    block = np.full((3, 2, FRAME_SAMPLES), 20000, dtype=np.int16)
+    block[1] = -100
+    mixed = mix(block)
+    assert mixed.shape == (2 * FRAME_SAMPLES,)
+    assert mixed.max() == 32767
+
+    empty = np.zeros((0, 2, FRAME_SAMPLES), dtype=np.int16)
+    assert mix(empty).tolist() == [0] * (2 * FRAME_SAMPLES)
+
+
+def test_wav_header_is_valid_after_every_write_and_on_close(tmp_path):
+    writer = WavStreamWriter(tmp_path / "call.wav")
+    assert not (tmp_path / "call.wav").exists()
+    first = np.arange(-500, 500, dtype=np.int16)
+    second = np.arange(1000, dtype=np.int16)
+
+    writer.write(first)
+    # Still open: the sizes in the header already cover what was written.
+    assert wav_frames(tmp_path / "call.wav").tolist() == first.tolist()
+    writer.write(second)
+    assert len(wav_frames(tmp_path / "call.wav")) == 2000
+    writer.close()
+
+    data = (tmp_path / "call.wav").read_bytes()
+    assert int.from_bytes(data[4:8], "little") == len(data) - 8
+    assert int.from_bytes(data[40:44], "little") == 4000
+    assert wav_frames(tmp_path / "call.wav").tolist() == first.tolist() + second.tolist()
+    assert writer.seconds_written == 2000 / SAMPLE_RATE
+
+
+def test_wav_output_rolls_over_to_parts(tmp_path):
+    writer = WavStreamWriter(tmp_path / "call.wav", max_part_bytes=1000)
+    samples = np.arange(1200, dtype=np.int16)
+    writer.write(samples)
+    writer.close()
+
+    assert [p.name for p in writer.parts] == ["call.wav", "call-part2.wav", "call-part3.wav"]
+    joined = np.concatenate([wav_frames(p) for p in writer.parts])
+    assert joined.tolist() == samples.tolist()
+
+
+def test_pipeline_memory_stays_flat_over_a_long_stream(tmp_path):
+    # Half a second of synthetic speech from 8 tracks, replayed as 100 ms ticks.
+    pcm, _ = synthetic_frames(np.random.default_rng(1), 8, 50)
+    ticks = [pcm[:, f : f + 10] for f in range(0, 50, 10)]
+    pipeline = RecordingPipeline(tmp_path / "long.wav", ring_seconds=2.0)
+
+    async def stream(seconds: int) -> None:
+        for tick in range(seconds * 10):
+            pipeline.push(ticks[tick % len(ticks)])
+            if tick % 10 == 9:
+                await pipeline.flush()
+
+    async def scenario() -> tuple[int, int]:
+        await stream(30)
+        tracemalloc.start()
+        try:
+            await stream(30)
+            _, short_peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await stream(300)
+            current, long_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        await pipeline.flush()
+        pipeline.writer.close()
+        return short_peak, long_peak
+
+    short_peak, long_peak = asyncio.run(scenario())
+
+    # Ten times the audio, the same working set: one tick plus one second of flush.
+    assert long_peak < short_peak + 256 * 1024
+    assert pipeline.ring.dropped == 0
+    assert pipeline.writer.seconds_written == pytest.approx(360.0)
+    assert len(wav_frames(tmp_path / "long.wav")) == 360 * SAMPLE_RATE
+
+
+@pytest.fixture
+def client():
+    return TestClient(backend_api)
+
+
+def write_recording(name: str, seconds: float) -> None:
+    RECORDINGS_DIR.mkdir(exist_ok=True)
+    writer = WavStreamWriter(RECORDINGS_DIR / name)
+    writer.write(np.zeros(int(seconds * SAMPLE_RATE), dtype=np.int16))
+    writer.close()
+
+
+def test_recordings_are_listed_and_served_to_admins(client):
+    write_recording("standup-20260101-090000.wav", 1.5)
+    write_recording("standup-20260101-090000-part2.wav", 0.5)
+    (RECORDINGS_DIR / "notes.txt").write_text("not a recording")
+
+    assert client.get("/livekit/recordings").status_code == 401
+    listing = client.get("/livekit/recordings", headers=ADMIN).json()
+    assert sorted((entry["name"], entry["seconds"]) for entry in listing) == [
+        ("standup-20260101-090000-part2.wav", 0.5),
+        ("standup-20260101-090000.wav", 1.5),
+    ]
+    assert not any(entry["in_progress"] for entry in listing)
+
+    response = client.get("/livekit/recordings/standup-20260101-090000.wav", headers=ADMIN)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/wav"
+    assert response.content == (RECORDINGS_DIR / "standup-20260101-090000.wav").read_bytes()
+    assert client.get("/livekit/recordings/standup-20260101-090000.wav").status_code == 401
+
+
+def test_only_recordings_in_the_directory_are_served(client, tmp_path):
+    write_recording("standup-20260101-090000.wav", 0.1)
+    (tmp_path / "secret.wav").write_bytes(b"RIFF")
+
+    for name in ("notes.txt", "missing.wav", "..%2Fsecret.wav", "%2E%2E%2Fsecret.wav"):
+        assert client.get(f"/livekit/recordings/{name}", headers=ADMIN).status_code == 404
+    assert recorder_registry.file("../secret.wav") is None
+
+
+class Tracks:
+    """Fake subscriptions for a tap whose readers never touch LiveKit."""
+
+    def __init__(self, tap):
+        self.tap = tap
+
+    def subscribe(self, identity: str, sid: str) -> None:
+        self.tap._on_track_subscribed(
+            SimpleNamespace(kind=rtc.TrackKind.KIND_AUDIO),
+            SimpleNamespace(sid=sid),
+            SimpleNamespace(identity=identity),
+        )
+
+    def unsubscribe(self, identity: str, sid: str) -> None:
+        self.tap._on_track_unsubscribed(None, SimpleNamespace(sid=sid), SimpleNamespace(identity=identity))
+
+    def feed(self, sid: str, value: int, frames: int) -> None:
+        for _ in range(frames):
+            self.tap._buffers[sid].append(np.full(FRAME_SAMPLES, value, dtype=np.int16))
+
+
+async def _idle_reader(self, track, sid: str) -> None:
+    await asyncio.Event().wait()
+
+
+def test_second_audio_track_of_a_participant_is_read_separately_and_summed(monkeypatch, tmp_path):
+    monkeypatch.setattr(RoomRecorder, "_read", _idle_reader)
+    recorder = RoomRecorder("standup", tmp_path / "call.wav", tick=0.02)
+
+    async def scenario():
+        tracks = Tracks(recorder)
+        tracks.subscribe("alice", "TR_mic")
+        tracks.subscribe("alice", "TR_screen")
+        tracks.subscribe("bob", "TR_bob")
+        tracks.feed("TR_mic", 100, 2)
+        tracks.feed("TR_screen", 20, 2)
+        tracks.feed("TR_bob", 7, 2)
+
+        keys, block = recorder.collect()
+        assert keys == ["alice", "bob"]
+        assert block[:, :, 0].tolist() == [[120, 120], [7, 7]]
+
+        # Dropping the screen share leaves the microphone reader running.
+        mic_reader = recorder._readers["TR_mic"]
+        tracks.unsubscribe("alice", "TR_screen")
+        await asyncio.sleep(0)
+        assert not mic_reader.cancelled()
+        assert recorder.has_audio("alice")
+        tracks.feed("TR_mic", 100, 2)
+        keys, block = recorder.collect()
+        assert keys == ["alice", "bob"]
+        assert block[0, :, 0].tolist() == [100, 100]
+
+        tracks.unsubscribe("alice", "TR_mic")
+        assert not recorder.has_audio("alice")
+        for task in recorder._readers.values():
+            task.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_speaker_monitor_keeps_a_participant_while_any_track_remains(monkeypatch):
+    monkeypatch.setattr(RoomSpeakerMonitor, "_read", _idle_reader)
+    monitor = RoomSpeakerMonitor("standup")
+
+    async def scenario():
+        tracks = Tracks(monitor)
+        tracks.subscribe("alice", "TR_mic")
+        tracks.subscribe("alice", "TR_screen")
+        monitor._detector.add_track("alice")
+
+        tracks.unsubscribe("alice", "TR_screen")
+        assert monitor._detector.keys() == ["alice"]
+        tracks.unsubscribe("alice", "TR_mic")
+        assert monitor._detector.keys() == []
+
+    asyncio.run(scenario())
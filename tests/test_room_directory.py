@@ -0,0 +1,150 @@
+"""Room directory cache against ``scripts/fake_livekit_server.py``: reads never wait on LiveKit."""
+
+import asyncio
+import contextlib
+import importlib.util
+from pathlib import Path
+
+from aiohttp import web
+
+from reflex_livekit_audio_chat.services.config_service import config_service
+from reflex_livekit_audio_chat.services.livekit_client import livekit_clients
+from reflex_livekit_audio_chat.services.room_directory import (
+    RoomDirectory,
+    RoomListing,
+    fetch_active_rooms,
+)
+
+_spec = importlib.util.spec_from_file_location(
+    "fake_livekit_server", Path(__file__).parent.parent / "scripts" / "fake_livekit_server.py"
+)
+fake_livekit_server = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(fake_livekit_server)
+
+
+@contextlib.asynccontextmanager
+async def fake_livekit(monkeypatch, rooms: dict[str, int]):
+    """Serve ``rooms`` on a free local port and point the app's LIVEKIT_URL at it."""
+    runner = web.AppRunner(fake_livekit_server.build_app(rooms))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    monkeypatch.setenv("LIVEKIT_URL", f"http://127.0.0.1:{port}")
+    config_service._snapshot = None
+    try:
+        yield
+    finally:
+        await livekit_clients.aclose()
+        await runner.cleanup()
+
+
+class Counting:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self) -> list[RoomListing]:
+        self.calls += 1
+        return await fetch_active_rooms()
+
+
+def test_cold_cache_returns_empty_at_once_and_fills_in_background(monkeypatch):
+    async def scenario():
+        async with fake_livekit(monkeypatch, {"standup": 12, "design": 3}):
+            fetch = Counting()
+            directory = RoomDirectory(fetch)
+            assert directory.rooms() == []
+            assert directory.refreshing
+            assert directory.rooms() == []
+            assert await directory.wait_refreshed() == [
+                RoomListing("standup", 12),
+                RoomListing("design", 3),
+            ]
+            assert directory.rooms() == [RoomListing("standup", 12), RoomListing("design", 3)]
+            assert fetch.calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_stale_listing_is_served_while_refreshing(monkeypatch):
+    rooms = {"standup": 12}
+
+    async def scenario():
+        async with fake_livekit(monkeypatch, rooms):
+            fetch = Counting()
+            directory = RoomDirectory(fetch, ttl=0.05, stale_ttl=60.0)
+            directory.rooms()
+            await directory.wait_refreshed()
+            rooms["design"] = 3
+            await asyncio.sleep(0.06)
+
+            assert directory.rooms() == [RoomListing("standup", 12)]
+            assert directory.refreshing
+            assert await directory.wait_refreshed() == [
+                RoomListing("standup", 12),
+                RoomListing("design", 3),
+            ]
+            assert fetch.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_listing_past_stale_ttl_reads_empty(monkeypatch):
+    async def scenario():
+        async with fake_livekit(monkeypatch, {"standup": 12}):
+            directory = RoomDirectory(ttl=0.01, stale_ttl=0.02)
+            directory.rooms()
+            await directory.wait_refreshed()
+            await asyncio.sleep(0.03)
+
+            assert directory.rooms() == []
+            assert await directory.wait_refreshed() == [RoomListing("standup", 12)]
+
+    asyncio.run(scenario())
+
+
+def test_failed_refresh_keeps_listing_and_backs_off(monkeypatch):
+    async def scenario():
+        async with fake_livekit(monkeypatch, {"standup": 12}):
+            fetch = Counting()
+            directory = RoomDirectory(fetch, ttl=0.05)
+            directory.rooms()
+            await directory.wait_refreshed()
+            await asyncio.sleep(0.06)
+            monkeypatch.setenv("LIVEKIT_API_SECRET", "wrong-secret-wrong-secret-wrong-secret")
+            config_service._snapshot = None
+            await livekit_clients.aclose()
+
+            assert directory.rooms() == [RoomListing("standup", 12)]
+            await directory.wait_refreshed()
+            assert directory.rooms() == [RoomListing("standup", 12)]
+            assert not directory.refreshing
+            assert fetch.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_lifespan_keeps_listing_fresh_without_reads(monkeypatch):
+    rooms = {"standup": 12}
+
+    async def until(condition) -> None:
+        for _ in range(200):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError("timed out")
+
+    async def scenario():
+        async with fake_livekit(monkeypatch, rooms):
+            fetch = Counting()
+            directory = RoomDirectory(fetch, ttl=60.0, refresh_interval=0.02)
+            async with directory.lifespan():
+                await until(lambda: fetch.calls >= 1 and not directory.refreshing)
+                assert directory.rooms() == [RoomListing("standup", 12)]
+                rooms["design"] = 3
+                await until(lambda: len(directory.rooms()) == 2)
+            calls = fetch.calls
+            await asyncio.sleep(0.05)
+            assert fetch.calls == calls
+
+    asyncio.run(scenario())
@@ -0,0 +1,44 @@
+from conftest import drive
+from reflex_livekit_audio_chat.livekit_bridge import LiveKitConnectionState, LiveKitSessionState
+from reflex_livekit_audio_chat.services.audio_profiles import audio_profile_registry
+
+
+def join(bridge, client_token: str, username: str, room: str, audio_profile: str):
+    tab = bridge(client_token)
+    form = {"username": username, "room_name": room, "audio_profile": audio_profile}
+    events = [str(event) for event in drive(LiveKitSessionState.join_room.fn(tab.session, form)) if event]
+    return tab, events
+
+
+def test_later_joiners_publish_with_the_rooms_profile(bridge):
+    host, _ = join(bridge, "profile-tab-1", "alice", "profile-room", "music")
+    guest, events = join(bridge, "profile-tab-2", "bob", "profile-room", "speech")
+
+    assert host.session.audio_profile == "music"
+    assert guest.session.audio_profile == "music"
+    assert guest.connection.active_audio_profile == "music"
+    assert any("'bob', 'music'" in event for event in events)
+
+    drive(LiveKitSessionState.leave_room.fn(host.session))
+    drive(LiveKitSessionState.leave_room.fn(guest.session))
+    assert audio_profile_registry.get("profile-room") is None
+
+
+def test_room_closes_with_its_last_session_and_the_next_opener_picks_again(bridge):
+    first, _ = join(bridge, "profile-tab-1", "alice", "profile-reopen", "music")
+    drive(LiveKitSessionState.leave_room.fn(first.session))
+
+    again, _ = join(bridge, "profile-tab-2", "bob", "profile-reopen", "low_bandwidth")
+    assert again.session.audio_profile == "low_bandwidth"
+    drive(LiveKitSessionState.leave_room.fn(again.session))
+
+
+def test_lobby_prewarm_opens_the_mic_with_the_rooms_profile(bridge):
+    host, _ = join(bridge, "profile-tab-1", "alice", "profile-prewarm", "music")
+    lobby = bridge("profile-tab-2")
+    form = {"username": "bob", "room_name": "profile-prewarm", "audio_profile": "speech"}
+
+    script = str(LiveKitConnectionState.prewarm_microphone.fn(lobby.connection, form))
+
+    assert "warmMicrophone('music')" in script
+    drive(LiveKitSessionState.leave_room.fn(host.session))
@@ -0,0 +1,97 @@
+import datetime
+import json
+
+from livekit import api
+
+from conftest import drive
+from reflex_livekit_audio_chat.livekit_bridge import LiveKitSessionState
+from reflex_livekit_audio_chat.services.config_service import config_service
+from reflex_livekit_audio_chat.services.room_roster import room_roster
+from reflex_livekit_audio_chat.services.token_service import sign_token
+
+
+def scripts(events: list) -> list[str]:
+    return [str(event) for event in events if event is not None]
+
+
+def join(bridge, client_token: str, username: str, room: str):
+    tab = bridge(client_token)
+    drive(LiveKitSessionState.join_room.fn(tab.session, {"username": username, "room_name": room}))
+    assert tab.connection.is_connected
+    return tab
+
+
+def reload(bridge, client_token: str, saved: str):
+    """A fresh page load in a tab whose session storage holds ``saved``."""
+    tab = bridge(client_token)
+    tab.session.resume_context = saved
+    return tab, scripts(drive(LiveKitSessionState.resume_session.fn(tab.session)))
+
+
+def test_resume_context_is_kept_per_tab():
+    field = LiveKitSessionState.get_fields()["resume_context"]
+    assert type(field.default).__name__ == "SessionStorage"
+
+
+def test_reload_in_the_same_tab_resumes_with_the_saved_token(bridge):
+    first = join(bridge, "resume-tab-1", "alice", "resume-reload")
+    saved, token = first.session.resume_context, first.session.token
+
+    tab, events = reload(bridge, "resume-tab-1", saved)
+
+    assert any("livekitClient.resume(" in event for event in events)
+    assert tab.session.token == token
+    assert tab.connection.is_connected
+    assert json.loads(tab.session.resume_context)["tab"] == "resume-tab-1"
+
+
+def test_duplicated_tab_asks_before_taking_over_a_live_call(bridge):
+    first = join(bridge, "resume-tab-1", "alice", "resume-two-tabs")
+    saved = first.session.resume_context
+
+    # A duplicated tab starts with a copy of the first tab's session storage.
+    second, events = reload(bridge, "resume-tab-2", saved)
+
+    assert events == []
+    assert not second.connection.is_connected
+    assert second.session.resume_context == ""
+    assert second.session.room_name == "resume-two-tabs"
+    assert second.session.username == "alice"
+    assert "another tab" in second.session.error_message
+    assert room_roster.sessions("resume-two-tabs") == {"resume-tab-1"}
+
+
+def test_copied_record_resumes_once_the_first_tab_has_left(bridge):
+    first = join(bridge, "resume-tab-1", "alice", "resume-after-leave")
+    saved = first.session.resume_context
+    drive(LiveKitSessionState.leave_room.fn(first.session))
+
+    second, events = reload(bridge, "resume-tab-2", saved)
+
+    assert any("livekitClient.resume(" in event for event in events)
+    assert second.connection.is_connected
+    assert room_roster.sessions("resume-after-leave") == {"resume-tab-2"}
+
+
+def saved_call(room: str, ttl: datetime.timedelta) -> str:
+    grants = api.VideoGrants(room_join=True, room=room, can_publish=True, can_subscribe=True)
+    token = sign_token(config_service.snapshot.livekit, "alice", grants, ttl)
+    return json.dumps({"room_name": room, "username": "alice", "token": token, "tab": "resume-tab-1"})
+
+
+def test_expired_token_shows_the_prefilled_lobby(bridge):
+    tab, events = reload(bridge, "resume-tab-1", saved_call("resume-expired", -datetime.timedelta(hours=1)))
+
+    assert events == []
+    assert not tab.connection.is_connected
+    assert tab.session.resume_context == ""
+    assert (tab.session.room_name, tab.session.username) == ("resume-expired", "alice")
+    assert not room_roster.sessions("resume-expired")
+
+
+def test_token_about_to_expire_is_not_reused(bridge):
+    tab, events = reload(bridge, "resume-tab-1", saved_call("resume-expiring", datetime.timedelta(minutes=1)))
+
+    assert events == []
+    assert tab.session.resume_context == ""
+    assert not room_roster.sessions("resume-expiring")
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from reflex_livekit_audio_chat.services.room_audio import FRAME_SAMPLES, RoomAudioTap
+from reflex_livekit_audio_chat.services.speaker_detection import (
+    SpeakerDetector,
+    VadConfig,
+    synthetic_frames,
+)
+
+_FULL_SCALE = 32768.0
+
+
+def tone(frames: int, level_db: float, *, noise_db: float = -65.0, seed: int = 0) -> np.ndarray:
+    """One track of a steady 200 Hz tone at ``level_db`` dBFS RMS over a noise floor."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames * FRAME_SAMPLES, dtype=np.float32) / 48000
+    pcm = np.sin(2 * np.pi * 200 * t) * (_FULL_SCALE * np.sqrt(2) * 10 ** (level_db / 20))
+    pcm += rng.standard_normal(pcm.shape, dtype=np.float32) * (_FULL_SCALE * 10 ** (noise_db / 20))
+    return np.clip(pcm, -_FULL_SCALE, _FULL_SCALE - 1).astype(np.int16).reshape(1, frames, FRAME_SAMPLES)
+
+
+def per_frame(detector: SpeakerDetector, key: str, pcm: np.ndarray) -> list[bool]:
+    """Speaking decision after each 10 ms frame of one track."""
+    return [bool(detector.process([key], pcm[:, f : f + 1]).speaking[0]) for f in range(pcm.shape[1])]
+
+
+def test_speech_needs_attack_frames_and_holds_for_the_hangover():
+    config = VadConfig(attack_frames=3, hangover_frames=30)
+    detector = SpeakerDetector(config)
+    silence, speech = tone(50, -120.0), tone(20, -25.0, seed=1)
+    pcm = np.concatenate([silence, speech, tone(60, -120.0, seed=2)], axis=1)
+
+    decisions = per_frame(detector, "alice", pcm)
+
+    assert not any(decisions[:50])
+    # Frames 50 and 51 are voiced but the run is too short; the third one starts speech.
+    assert decisions[50:52] == [False, False]
+    assert all(decisions[52:70])
+    # Quiet after frame 69: speech is held for hangover_frames - 1 more frames, then drops.
+    assert all(decisions[70:99])
+    assert not any(decisions[99:])
+
+
+def test_short_clicks_never_start_speech():
+    detector = SpeakerDetector(VadConfig(attack_frames=3))
+    quiet = tone(40, -120.0)
+    click = tone(2, -20.0, seed=3)
+    pcm = np.concatenate([quiet, click, quiet, click, quiet], axis=1)
+    assert not any(per_frame(detector, "alice", pcm))
+
+
+def test_level_must_clear_the_floor_margin_and_the_minimum_level():
+    # A quiet room (floor near -90 dBFS), then a soft voice: far above the floor.
+    pcm = np.concatenate([tone(20, -120.0, noise_db=-90.0), tone(40, -55.0, noise_db=-90.0)], axis=1)
+    assert not any(per_frame(SpeakerDetector(VadConfig(min_level_db=-50.0)), "alice", pcm))
+    assert any(per_frame(SpeakerDetector(VadConfig(min_level_db=-60.0)), "alice", pcm))
+
+    # Loud enough, but within margin_db of a noisy room's floor (about -40 dBFS).
+    pcm = tone(40, -35.0, noise_db=-40.0)
+    noisy_room = VadConfig(initial_floor_db=-40.0, margin_db=9.0)
+    assert not any(per_frame(SpeakerDetector(noisy_room), "alice", pcm))
+    assert any(per_frame(SpeakerDetector(VadConfig(initial_floor_db=-40.0, margin_db=3.0)), "alice", pcm))
+
+
+def test_decisions_agree_with_synthetic_ground_truth():
+    rng = np.random.default_rng(7)
+    pcm, talking = synthetic_frames(rng, tracks=16, frames=3000)
+    keys = [f"track-{i}" for i in range(16)]
+    detector = SpeakerDetector(capacity=4)
+
+    # 250 ms ticks, compared with the truth at the end of each tick, as RoomSpeakerMonitor publishes.
+    decisions = np.stack(
+        [detector.process(keys, pcm[:, f : f + 25]).speaking for f in range(0, 3000, 25)], axis=1
+    )
+    truth = talking[:, 24::25]
+
+    assert len(detector) == 16
+    assert truth.any() and (~truth).any()
+    assert (decisions == truth).mean() > 0.9
+    # Misses come from the attack delay and extra frames from the hangover; neither is large.
+    assert (decisions & ~truth).mean() < 0.05
+    assert (~decisions & truth).mean() < 0.05
+
+
+def test_removed_tracks_start_from_scratch():
+    detector = SpeakerDetector(VadConfig(attack_frames=1))
+    speech = tone(5, -25.0)
+    assert detector.process(["alice"], speech).speaking[0]
+    detector.remove_track("alice")
+    assert detector.process(["bob"], tone(5, -120.0)).speaking.tolist() == [False]
+    assert not detector.process(["alice"], tone(1, -120.0)).speaking[0]
+
+
+def test_room_audio_taps_must_implement_on_tick():
+    class Silent(RoomAudioTap):
+        pass
+
+    with pytest.raises(TypeError):
+        Silent("room", identity="tap", interval=0.25)
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from starlette.testclient import TestClient
+
+from conftest import FAKE_ENV
+from reflex_livekit_audio_chat import api_routes
+from reflex_livekit_audio_chat.api_routes import backend_api
+from reflex_livekit_audio_chat.services import token_provisioning
+from reflex_livekit_audio_chat.services.config_service import LiveKitCredentials
+from reflex_livekit_audio_chat.services.token_provisioning import TokenProvisioner, TokenRequest
+
+ADMIN = {"Authorization": f"Bearer {FAKE_ENV['ADMIN_PASSCODE']}"}
+CREDENTIALS = LiveKitCredentials(
+    api_key=FAKE_ENV["LIVEKIT_API_KEY"],
+    api_secret=FAKE_ENV["LIVEKIT_API_SECRET"],
+    url=FAKE_ENV["LIVEKIT_URL"],
+)
+
+
+@pytest.fixture
+def client():
+    return TestClient(backend_api)
+
+
+def provision(client, entries: list) -> tuple[int, list[dict]]:
+    response = client.post("/livekit/tokens", json={"entries": entries}, headers=ADMIN)
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    return response.status_code, sorted(lines, key=lambda line: line["index"])
+
+
+@pytest.mark.parametrize("ttl", ["1e400", "-1e400", "NaN", "1e308", "-3600", "0", "59", "86401", str(10**400)])
+def test_out_of_range_ttls_are_per_entry_errors(client, ttl):
+    # Raw JSON, so non-finite and huge numbers reach the parser as sent.
+    body = (
+        '{"entries": [{"identity": "alice", "room": "standup", "ttl": %s},'
+        ' {"identity": "bob", "room": "standup", "ttl": 3600}]}' % ttl
+    )
+    response = client.post(
+        "/livekit/tokens", content=body, headers={**ADMIN, "Content-Type": "application/json"}
+    )
+    lines = sorted((json.loads(line) for line in response.text.splitlines()), key=lambda l: l["index"])
+
+    assert response.status_code == 200
+    assert lines[0] == {"index": 0, "error": "ttl must be between 60 and 86400 seconds"}
+    assert lines[1]["identity"] == "bob" and lines[1]["token"]
+
+
+def test_a_failing_chunk_becomes_error_lines_and_the_stream_goes_on(client, monkeypatch):
+    real = token_provisioning.sign_chunk
+
+    def flaky(credentials, requests):
+        if requests[0].identity == "bad":
+            raise RuntimeError("boom")
+        return real(credentials, requests)
+
+    monkeypatch.setattr(token_provisioning, "sign_chunk", flaky)
+    # Threads instead of processes, so the patched sign_chunk is the one that runs.
+    entries = [{"identity": name, "room": "standup"} for name in ("a", "b", "bad", "c", "d", "e")]
+    with ThreadPoolExecutor(1) as pool:
+        provisioner = TokenProvisioner(workers=1, chunk_size=2, executor=pool)
+        monkeypatch.setattr(api_routes, "token_provisioner", provisioner)
+        status, lines = provision(client, entries)
+
+    assert status == 200
+    assert [line.get("error") for line in lines] == [
+        None, None, "signing failed: RuntimeError", "signing failed: RuntimeError", None, None
+    ]
+    assert all(line["token"] for line in lines if "error" not in line)
+
+
+def _signed(provisioner: TokenProvisioner, count: int) -> list:
+    async def run() -> list:
+        requests = [TokenRequest(identity=f"user-{i}", room="standup") for i in range(count)]
+        return [chunk async for chunk in provisioner.sign(requests)]
+
+    return asyncio.run(run())
+
+
+def test_pool_is_replaced_after_a_worker_dies():
+    provisioner = TokenProvisioner(CREDENTIALS, workers=1, chunk_size=2)
+    try:
+        assert not any(chunk.error for chunk in _signed(provisioner, 4))
+        pool = provisioner._executor
+        for pid in list(pool._processes):
+            os.kill(pid, signal.SIGKILL)
+        deadline = time.monotonic() + 10
+        while not pool._broken and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert pool._broken
+
+        chunks = _signed(provisioner, 4)
+
+        assert not any(chunk.error for chunk in chunks)
+        assert sum(len(chunk.tokens) for chunk in chunks) == 4
+        assert provisioner._executor is not pool
+    finally:
+        provisioner.shutdown()
@@ -0,0 +1,116 @@
+import asyncio
+import datetime
+import threading
+
+import pytest
+from livekit import api
+
+from reflex_livekit_audio_chat.services import token_service as token_module
+from reflex_livekit_audio_chat.services.config_service import LiveKitCredentials
+from reflex_livekit_audio_chat.services.token_service import TokenService, verify_token
+
+CREDENTIALS = LiveKitCredentials("key", "secret-secret-secret-secret-secret", "ws://x")
+GRANTS = api.VideoGrants(room_join=True, room="room")
+
+
+@pytest.fixture
+def signed(monkeypatch):
+    """Count sign_token calls; each call waits on ``release`` so tests can overlap them."""
+    calls = []
+    release = threading.Event()
+    release.set()
+    sign = token_module.sign_token
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        release.wait(5)
+        return sign(*args, **kwargs)
+
+    monkeypatch.setattr(token_module, "sign_token", counting)
+    return calls, release
+
+
+def test_cached_token_is_reused(signed):
+    calls, _ = signed
+    service = TokenService(CREDENTIALS)
+
+    async def run():
+        return [await service.get_token("alice", "room", GRANTS) for _ in range(3)]
+
+    tokens = asyncio.run(run())
+    assert len(set(tokens)) == 1
+    assert len(calls) == 1
+    assert (service.stats.hits, service.stats.misses) == (2, 1)
+
+
+def test_ttl_is_part_of_the_cache_key(signed):
+    calls, _ = signed
+    service = TokenService(CREDENTIALS)
+    short = datetime.timedelta(minutes=10)
+
+    async def run():
+        long_token = await service.get_token("alice", "room", GRANTS)
+        short_token = await service.get_token("alice", "room", GRANTS, ttl=short)
+        again = await service.get_token("alice", "room", GRANTS, ttl=short)
+        return long_token, short_token, again
+
+    long_token, short_token, again = asyncio.run(run())
+    assert long_token != short_token
+    # A 10-minute token stays reusable although it is shorter than min_remaining.
+    assert again == short_token
+    assert len(calls) == 2
+    _, expires_at = verify_token(CREDENTIALS, short_token)
+    _, long_expires_at = verify_token(CREDENTIALS, long_token)
+    assert long_expires_at - expires_at > datetime.timedelta(hours=5).total_seconds()
+
+
+def test_concurrent_misses_share_one_signing(signed):
+    calls, release = signed
+    release.clear()
+    service = TokenService(CREDENTIALS)
+
+    async def run():
+        waiters = [
+            asyncio.create_task(service.get_token("alice", "room", GRANTS)) for _ in range(5)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*waiters)
+
+    tokens = asyncio.run(run())
+    assert len(set(tokens)) == 1
+    assert len(calls) == 1
+    assert (service.stats.misses, service.stats.coalesced) == (1, 4)
+
+
+def test_cancelled_caller_does_not_cancel_shared_signing(signed):
+    calls, release = signed
+    release.clear()
+    service = TokenService(CREDENTIALS)
+
+    async def run():
+        first = asyncio.create_task(service.get_token("alice", "room", GRANTS))
+        second = asyncio.create_task(service.get_token("alice", "room", GRANTS))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        release.set()
+        return await second
+
+    assert asyncio.run(run())
+    assert len(calls) == 1
+
+
+def test_signing_across_a_credential_change_is_not_cached(signed):
+    calls, release = signed
+    release.clear()
+    service = TokenService(CREDENTIALS)
+
+    async def run():
+        waiter = asyncio.create_task(service.get_token("alice", "room", GRANTS))
+        await asyncio.sleep(0.05)
+        service.set_credentials(LiveKitCredentials("key2", "other-secret-other-secret-other", "ws://x"))
+        release.set()
+        await waiter
+        return len(service)
+
+    assert asyncio.run(run()) == 0
@@ -0,0 +1,118 @@
+import base64
+import hashlib
+import time
+
+import pytest
+from google.protobuf.json_format import MessageToJson
+from livekit import api
+from starlette.testclient import TestClient
+
+from conftest import FAKE_ENV, drive
+from reflex_livekit_audio_chat.api_routes import backend_api
+from reflex_livekit_audio_chat.livekit_bridge import LiveKitRosterState, LiveKitSessionState
+from reflex_livekit_audio_chat.services.audio_profiles import audio_profile_registry
+from reflex_livekit_audio_chat.services.audio_subscriptions import DEFAULT_LAST_N, last_n_registry
+from reflex_livekit_audio_chat.services.room_roster import room_roster
+from reflex_livekit_audio_chat.services.stage import stage_registry
+
+
+def webhook(event: str, room: str, identity: str = "", secret: str = FAKE_ENV["LIVEKIT_API_SECRET"]):
+    """(body, Authorization header), signed the way the LiveKit server signs webhooks."""
+    message = api.WebhookEvent(event=event, created_at=int(time.time()))
+    message.room.name = room
+    if identity:
+        message.participant.identity = identity
+        message.participant.name = identity
+    body = MessageToJson(message)
+    digest = base64.b64encode(hashlib.sha256(body.encode()).digest()).decode()
+    auth = api.AccessToken(FAKE_ENV["LIVEKIT_API_KEY"], secret).with_sha256(digest).to_jwt()
+    return body, auth
+
+
+@pytest.fixture
+def post():
+    client = TestClient(backend_api)
+
+    def send(event: str, room: str, identity: str = "", **kwargs) -> int:
+        body, auth = webhook(event, room, identity, **kwargs)
+        response = client.post(
+            "/livekit/webhook",
+            content=body,
+            headers={"Authorization": auth, "Content-Type": "application/webhook+json"},
+        )
+        return response.status_code
+
+    return send
+
+
+def test_signed_webhooks_maintain_the_index(post):
+    assert post("participant_joined", "wh-index", "alice") == 200
+    assert post("participant_joined", "wh-index", "bob") == 200
+    assert post("participant_joined", "wh-index", "alice") == 200
+    assert room_roster.roster("wh-index") == ["alice", "bob"]
+
+    assert post("participant_left", "wh-index", "alice") == 200
+    assert room_roster.roster("wh-index") == ["bob"]
+
+    assert post("room_finished", "wh-index") == 200
+    assert room_roster.roster("wh-index") == []
+    assert not room_roster.tracks("wh-index")
+
+
+def test_room_finished_drops_the_room_settings(post):
+    stage_registry.open("wh-finished", host="alice")
+    last_n_registry.open("wh-finished", 3)
+    audio_profile_registry.open("wh-finished", "music")
+
+    assert post("room_finished", "wh-finished") == 200
+
+    assert stage_registry.get("wh-finished") is None
+    assert last_n_registry.get("wh-finished") == DEFAULT_LAST_N
+    assert audio_profile_registry.get("wh-finished") is None
+
+
+def test_webhook_with_a_foreign_signature_is_rejected(post):
+    status = post("participant_joined", "wh-forged", "mallory", secret="not-the-api-secret-not-the-secret")
+    assert status == 401
+    assert not room_roster.tracks("wh-forged")
+
+
+def test_server_roster_is_authoritative_in_tracked_rooms(post, bridge):
+    post("participant_joined", "wh-state", "alice")
+    post("participant_joined", "wh-state", "bob")
+    tab = bridge("wh-tab")
+    drive(LiveKitSessionState.join_room.fn(tab.session, {"username": "carol", "room_name": "wh-state"}))
+    # Seeded from the webhook roster on join, before the browser reports anything.
+    assert list(tab.roster._roster_index) == ["alice", "bob", "carol"]
+
+    # A stale client sync (bob missing, a ghost present) doesn't override the server.
+    stale = [{"identity": "carol", "is_local": True}, {"identity": "alice"}, {"identity": "ghost"}]
+    drive(LiveKitRosterState.handle_bridge_event.fn(tab.roster, {"roster": stale, "speaking": ["alice"]}))
+    assert tab.roster._roster_index == {"alice": False, "bob": False, "carol": True}
+    assert tab.roster.speaking_identities == ["alice"]
+
+    # Client joins and leaves are ignored; speaking patches still apply.
+    patches = [
+        {"op": "leave", "identity": "bob"},
+        {"op": "join", "identity": "ghost"},
+        {"op": "speaking", "identity": "bob", "is_speaking": True},
+    ]
+    drive(LiveKitRosterState.handle_bridge_event.fn(tab.roster, {"patches": patches}))
+    assert list(tab.roster._roster_index) == ["alice", "bob", "carol"]
+    assert tab.roster.speaking_identities == ["alice", "bob"]
+
+    # Server-side patches (what the webhook fan-out applies) do change membership.
+    tab.roster._apply_roster_patches([{"op": "leave", "identity": "bob"}], from_server=True)
+    assert list(tab.roster._roster_index) == ["alice", "carol"]
+    assert tab.roster.speaking_identities == ["alice"]
+    drive(LiveKitSessionState.leave_room.fn(tab.session))
+
+
+def test_client_roster_is_used_when_no_webhooks_arrive(bridge):
+    tab = bridge("no-wh-tab")
+    drive(LiveKitSessionState.join_room.fn(tab.session, {"username": "dave", "room_name": "wh-none"}))
+    roster = [{"identity": "dave", "is_local": True}, {"identity": "erin"}]
+    drive(LiveKitRosterState.handle_bridge_event.fn(tab.roster, {"roster": roster, "speaking": []}))
+    drive(LiveKitRosterState.handle_bridge_event.fn(tab.roster, {"patches": [{"op": "join", "identity": "frank"}]}))
+    assert list(tab.roster._roster_index) == ["dave", "erin", "frank"]
+    drive(LiveKitSessionState.leave_room.fn(tab.session))